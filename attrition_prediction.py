@@ -1,770 +1,1144 @@
-"""
-Talent Analytics: Employee Attrition Prediction Model
------------------------------------------------------
-This module creates a machine learning model to predict employee attrition
-and identify key factors driving turnover, serving as the foundation for
-strategic workforce planning.
-"""
-
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score, StratifiedKFold
-from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve, precision_recall_curve
-from sklearn.feature_selection import SelectKBest, f_classif
-import shap
-import pickle
-import warnings
-warnings.filterwarnings('ignore')
-
-# Set styling for plots
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette('viridis')
-
-def load_and_explore_data(file_path='PROJECT AND DATASET IN HERE/WA_Fn-UseC_-HR-Employee-Attrition.csv'):
-    """
-    Load the HR attrition dataset and perform initial exploration
-    
-    Parameters:
-    -----------
-    file_path : str
-        Path to the HR attrition dataset
-        
-    Returns:
-    --------
-    pd.DataFrame
-        The loaded and initially processed dataframe
-    """
-    print(f"Loading data from {file_path}...")
-    df = pd.read_csv(file_path)
-    
-    print(f"Dataset shape: {df.shape}")
-    print(f"Number of employees: {df.shape[0]}")
-    print(f"Number of features: {df.shape[1]}")
-    
-    # Summary of attrition
-    attrition_counts = df['Attrition'].value_counts()
-    attrition_pct = df['Attrition'].value_counts(normalize=True) * 100
-    
-    print("\nAttrition Summary:")
-    print(f"Employees who stayed: {attrition_counts['No']} ({attrition_pct['No']:.2f}%)")
-    print(f"Employees who left: {attrition_counts['Yes']} ({attrition_pct['Yes']:.2f}%)")
-    
-    # Check for missing values
-    missing_values = df.isnull().sum()
-    if missing_values.sum() > 0:
-        print("\nMissing values detected:")
-        print(missing_values[missing_values > 0])
-    else:
-        print("\nNo missing values detected.")
-    
-    # Check data types
-    print("\nData Types:")
-    print(df.dtypes.value_counts())
-    
-    # Convert target to binary
-    df['AttritionBinary'] = df['Attrition'].map({'Yes': 1, 'No': 0})
-    
-    return df
-
-def perform_eda(df):
-    """
-    Perform exploratory data analysis on the HR dataset
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        The HR dataset
-        
-    Returns:
-    --------
-    pd.DataFrame
-        The dataframe with any EDA transformations
-    """
-    print("\nPerforming Exploratory Data Analysis...")
-    
-    # 1. Age distribution by attrition
-    plt.figure(figsize=(10, 6))
-    sns.histplot(data=df, x='Age', hue='Attrition', bins=20, multiple='dodge')
-    plt.title('Age Distribution by Attrition Status')
-    plt.xlabel('Age')
-    plt.ylabel('Count')
-    plt.savefig('age_distribution.png')
-    plt.close()
-    
-    # 2. Attrition by Department
-    dept_attrition = df.groupby('Department')['AttritionBinary'].mean() * 100
-    plt.figure(figsize=(8, 5))
-    sns.barplot(x=dept_attrition.index, y=dept_attrition.values)
-    plt.title('Attrition Rate by Department')
-    plt.xlabel('Department')
-    plt.ylabel('Attrition Rate (%)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('dept_attrition.png')
-    plt.close()
-    
-    # 3. Attrition by Job Role
-    role_attrition = df.groupby('JobRole')['AttritionBinary'].mean() * 100
-    plt.figure(figsize=(12, 6))
-    sns.barplot(x=role_attrition.index, y=role_attrition.values)
-    plt.title('Attrition Rate by Job Role')
-    plt.xlabel('Job Role')
-    plt.ylabel('Attrition Rate (%)')
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig('role_attrition.png')
-    plt.close()
-    
-    # 4. Monthly Income vs Attrition
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(x='Attrition', y='MonthlyIncome', data=df)
-    plt.title('Monthly Income by Attrition Status')
-    plt.savefig('income_attrition.png')
-    plt.close()
-    
-    # 5. Correlation analysis for numerical features
-    numeric_df = df.select_dtypes(include=['int64', 'float64'])
-    
-    # Add AttritionBinary for correlation
-    if 'AttritionBinary' not in numeric_df.columns:
-        numeric_df['AttritionBinary'] = df['AttritionBinary']
-    
-    # Calculate correlation matrix
-    corr_matrix = numeric_df.corr()
-    
-    # Plot correlation heatmap
-    plt.figure(figsize=(16, 14))
-    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-    sns.heatmap(corr_matrix, mask=mask, annot=True, fmt=".2f", cmap='coolwarm', 
-                linewidths=0.5, cbar_kws={"shrink": .8})
-    plt.title('Feature Correlation Matrix')
-    plt.tight_layout()
-    plt.savefig('correlation_matrix.png')
-    plt.close()
-    
-    # 6. Key variable exploration: OverTime
-    overtime_attrition = pd.crosstab(df['OverTime'], df['Attrition'], normalize='index') * 100
-    plt.figure(figsize=(8, 5))
-    overtime_attrition['Yes'].plot(kind='bar', color='coral')
-    plt.title('Attrition Rate by Overtime Status')
-    plt.xlabel('Works Overtime')
-    plt.ylabel('Attrition Rate (%)')
-    plt.xticks(rotation=0)
-    plt.savefig('overtime_attrition.png')
-    plt.close()
-    
-    # 7. Work-Life Balance vs Attrition
-    wlb_attrition = pd.crosstab(df['WorkLifeBalance'], df['Attrition'], normalize='index') * 100
-    plt.figure(figsize=(8, 5))
-    wlb_attrition['Yes'].plot(kind='bar', color='teal')
-    plt.title('Attrition Rate by Work-Life Balance')
-    plt.xlabel('Work-Life Balance (1=Bad, 4=Best)')
-    plt.ylabel('Attrition Rate (%)')
-    plt.xticks(rotation=0)
-    plt.savefig('wlb_attrition.png')
-    plt.close()
-    
-    # Print key insights
-    print("\nKey EDA Insights:")
-    print(f"- Overall attrition rate: {df['AttritionBinary'].mean() * 100:.2f}%")
-    print(f"- Department with highest attrition: {dept_attrition.idxmax()} ({dept_attrition.max():.2f}%)")
-    print(f"- Department with lowest attrition: {dept_attrition.idxmin()} ({dept_attrition.min():.2f}%)")
-    print(f"- Job role with highest attrition: {role_attrition.idxmax()} ({role_attrition.max():.2f}%)")
-    print(f"- Overtime attrition rate: {overtime_attrition.loc['Yes', 'Yes']:.2f}%")
-    print(f"- Non-overtime attrition rate: {overtime_attrition.loc['No', 'Yes']:.2f}%")
-    
-    # Return the dataframe in case any transformations were made
-    return df
-
-def engineer_features(df):
-    """
-    Create new features to improve model performance
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        The HR dataset
-        
-    Returns:
-    --------
-    pd.DataFrame
-        The dataframe with engineered features
-    """
-    print("\nEngineering additional features...")
-    
-    # 1. Salary to Job Level Ratio (detects underpaid employees)
-    df['SalaryToJobLevelRatio'] = df['MonthlyIncome'] / df['JobLevel']
-    
-    # 2. Years Without Promotion Risk
-    df['PromotionRisk'] = df['YearsSinceLastPromotion'] / (df['YearsAtCompany'] + 1)
-    
-    # 3. Commute Difficulty (distance vs salary)
-    df['CommuteDifficulty'] = df['DistanceFromHome'] / np.log1p(df['MonthlyIncome'])
-    
-    # 4. Compensation Satisfaction Proxy
-    # Compare employee's salary to average salary for their job level
-    job_level_avg_salary = df.groupby('JobLevel')['MonthlyIncome'].transform('mean')
-    df['RelativeCompensation'] = df['MonthlyIncome'] / job_level_avg_salary
-    
-    # 5. Work-Life Imbalance
-    df['WorkLifeImbalance'] = ((df['WorkLifeBalance'] < 3).astype(int) + 
-                               (df['OverTime'] == 'Yes').astype(int))
-    
-    # 6. Growth Opportunity Index
-    df['GrowthOpportunityIndex'] = (df['TrainingTimesLastYear'] + 1) / (df['YearsSinceLastPromotion'] + 1)
-    
-    # 7. Job Role Engagement
-    # Combine Job Involvement and Job Satisfaction
-    df['JobEngagement'] = df['JobInvolvement'] * df['JobSatisfaction']
-    
-    # 8. Satisfaction Composite
-    satisfaction_cols = ['JobSatisfaction', 'EnvironmentSatisfaction', 
-                         'RelationshipSatisfaction', 'WorkLifeBalance']
-    df['SatisfactionComposite'] = df[satisfaction_cols].mean(axis=1)
-    
-    # 9. Career Advancement Ratio
-    df['CareerAdvancementRatio'] = df['JobLevel'] / (df['TotalWorkingYears'] + 1)
-    
-    # 10. OverTime and Distance Combined Risk
-    df['OvertimeDistanceRisk'] = ((df['OverTime'] == 'Yes').astype(int) * 
-                                 (1 + (df['DistanceFromHome'] / 10)))
-    
-    # Print statistics on new features
-    print("\nEngineered Features Summary:")
-    for feature in ['SalaryToJobLevelRatio', 'PromotionRisk', 'CommuteDifficulty', 
-                    'RelativeCompensation', 'WorkLifeImbalance', 'GrowthOpportunityIndex',
-                    'JobEngagement', 'SatisfactionComposite', 'OvertimeDistanceRisk']:
-        if feature in df.columns:
-            print(f"{feature} - Mean: {df[feature].mean():.2f}, Std: {df[feature].std():.2f}")
-    
-    # Check correlation of new features with attrition
-    engineered_features = ['SalaryToJobLevelRatio', 'PromotionRisk', 'CommuteDifficulty', 
-                          'RelativeCompensation', 'WorkLifeImbalance', 'GrowthOpportunityIndex',
-                          'JobEngagement', 'SatisfactionComposite', 'OvertimeDistanceRisk']
-    
-    correlations = df[engineered_features + ['AttritionBinary']].corr()['AttritionBinary'].sort_values()
-    
-    print("\nCorrelation with Attrition:")
-    print(correlations[:-1])  # Exclude correlation with itself
-    
-    return df
-
-def prepare_data_for_modeling(df):
-    """
-    Prepare the data for model training
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        The HR dataset with engineered features
-        
-    Returns:
-    --------
-    tuple
-        X_train, X_test, y_train, y_test, preprocessor
-    """
-    print("\nPreparing data for modeling...")
-    
-    # Remove unnecessary columns
-    cols_to_drop = ['Attrition', 'EmployeeCount', 'EmployeeNumber', 'StandardHours', 'Over18']
-    X = df.drop(['AttritionBinary'] + cols_to_drop, axis=1)
-    y = df['AttritionBinary']
-    
-    # Identify categorical and numerical columns
-    cat_cols = X.select_dtypes(include=['object']).columns.tolist()
-    num_cols = X.select_dtypes(include=['int64', 'float64']).columns.tolist()
-    
-    print(f"Categorical features: {len(cat_cols)}")
-    print(f"Numerical features: {len(num_cols)}")
-    print(f"Total features: {len(cat_cols) + len(num_cols)}")
-    
-    # Create preprocessing pipeline
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), num_cols),
-            ('cat', OneHotEncoder(drop='first', handle_unknown='ignore'), cat_cols)
-        ],
-        remainder='drop'
-    )
-    
-    # Split the data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y)
-    
-    print(f"Training set size: {X_train.shape[0]} samples")
-    print(f"Testing set size: {X_test.shape[0]} samples")
-    
-    return X_train, X_test, y_train, y_test, preprocessor
-
-def build_and_evaluate_models(X_train, X_test, y_train, y_test, preprocessor):
-    """
-    Build and evaluate multiple machine learning models
-    
-    Parameters:
-    -----------
-    X_train, X_test, y_train, y_test : pd.DataFrame, pd.Series
-        Training and testing data
-    preprocessor : ColumnTransformer
-        The preprocessing pipeline
-        
-    Returns:
-    --------
-    dict
-        Dictionary of trained models
-    """
-    print("\nBuilding and evaluating machine learning models...")
-    
-    # Create model pipelines
-    models = {
-        'Logistic Regression': Pipeline([
-            ('preprocessor', preprocessor),
-            ('classifier', LogisticRegression(random_state=42, max_iter=1000))
-        ]),
-        
-        'Random Forest': Pipeline([
-            ('preprocessor', preprocessor),
-            ('classifier', RandomForestClassifier(random_state=42))
-        ]),
-        
-        'Gradient Boosting': Pipeline([
-            ('preprocessor', preprocessor),
-            ('classifier', GradientBoostingClassifier(random_state=42))
-        ])
-    }
-    
-    # Train and evaluate each model
-    results = {}
-    best_auc = 0
-    best_model_name = None
-    
-    for name, model in models.items():
-        print(f"\nTraining {name}...")
-        model.fit(X_train, y_train)
-        
-        # Predict on test set
-        y_pred = model.predict(X_test)
-        y_prob = model.predict_proba(X_test)[:, 1]
-        
-        # Calculate metrics
-        auc = roc_auc_score(y_test, y_prob)
-        
-        print(f"{name} Results:")
-        print(classification_report(y_test, y_pred))
-        print(f"ROC AUC: {auc:.4f}")
-        
-        # Store results
-        results[name] = {
-            'model': model,
-            'auc': auc,
-            'predictions': y_pred,
-            'probabilities': y_prob
-        }
-        
-        # Track best model
-        if auc > best_auc:
-            best_auc = auc
-            best_model_name = name
-    
-    # Perform cross-validation on the best model
-    if best_model_name:
-        print(f"\nPerforming cross-validation on {best_model_name}...")
-        best_model = models[best_model_name]
-        cv_scores = cross_val_score(best_model, X_train, y_train, 
-                                    cv=StratifiedKFold(5, shuffle=True, random_state=42),
-                                    scoring='roc_auc')
-        
-        print(f"Cross-validation ROC AUC scores: {cv_scores}")
-        print(f"Mean CV ROC AUC: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
-    
-    # Tune hyperparameters for the best model
-    if best_model_name == 'Random Forest':
-        print("\nTuning Random Forest hyperparameters...")
-        param_grid = {
-            'classifier__n_estimators': [100, 200],
-            'classifier__max_depth': [None, 10, 20],
-            'classifier__min_samples_split': [2, 5, 10]
-        }
-        
-        grid_search = GridSearchCV(models['Random Forest'], param_grid, cv=5, 
-                                   scoring='roc_auc', n_jobs=-1)
-        grid_search.fit(X_train, y_train)
-        
-        print(f"Best parameters: {grid_search.best_params_}")
-        print(f"Best CV ROC AUC: {grid_search.best_score_:.4f}")
-        
-        # Update the model with tuned hyperparameters
-        models['Random Forest'] = grid_search.best_estimator_
-        
-        # Re-evaluate the tuned model
-        y_pred = models['Random Forest'].predict(X_test)
-        y_prob = models['Random Forest'].predict_proba(X_test)[:, 1]
-        
-        auc = roc_auc_score(y_test, y_prob)
-        
-        print("\nTuned Random Forest Results:")
-        print(classification_report(y_test, y_pred))
-        print(f"ROC AUC: {auc:.4f}")
-        
-        results['Random Forest (Tuned)'] = {
-            'model': models['Random Forest'],
-            'auc': auc,
-            'predictions': y_pred,
-            'probabilities': y_prob
-        }
-        
-    elif best_model_name == 'Gradient Boosting':
-        print("\nTuning Gradient Boosting hyperparameters...")
-        param_grid = {
-            'classifier__n_estimators': [100, 200],
-            'classifier__learning_rate': [0.05, 0.1],
-            'classifier__max_depth': [3, 5, 7]
-        }
-        
-        grid_search = GridSearchCV(models['Gradient Boosting'], param_grid, cv=5, 
-                                   scoring='roc_auc', n_jobs=-1)
-        grid_search.fit(X_train, y_train)
-        
-        print(f"Best parameters: {grid_search.best_params_}")
-        print(f"Best CV ROC AUC: {grid_search.best_score_:.4f}")
-        
-        # Update the model with tuned hyperparameters
-        models['Gradient Boosting'] = grid_search.best_estimator_
-        
-        # Re-evaluate the tuned model
-        y_pred = models['Gradient Boosting'].predict(X_test)
-        y_prob = models['Gradient Boosting'].predict_proba(X_test)[:, 1]
-        
-        auc = roc_auc_score(y_test, y_prob)
-        
-        print("\nTuned Gradient Boosting Results:")
-        print(classification_report(y_test, y_pred))
-        print(f"ROC AUC: {auc:.4f}")
-        
-        results['Gradient Boosting (Tuned)'] = {
-            'model': models['Gradient Boosting'],
-            'auc': auc,
-            'predictions': y_pred,
-            'probabilities': y_prob
-        }
-    
-    # Compare ROC curves
-    plt.figure(figsize=(10, 8))
-    
-    for name, result in results.items():
-        fpr, tpr, _ = roc_curve(y_test, result['probabilities'])
-        plt.plot(fpr, tpr, label=f"{name} (AUC = {result['auc']:.4f})")
-    
-    plt.plot([0, 1], [0, 1], 'k--')
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title('ROC Curves for Attrition Prediction Models')
-    plt.legend(loc='lower right')
-    plt.savefig('roc_curves_comparison.png')
-    plt.close()
-    
-    # Find the best final model
-    best_final_model_name = max(results, key=lambda x: results[x]['auc'])
-    best_final_model = results[best_final_model_name]['model']
-    
-    print(f"\nBest model: {best_final_model_name} with ROC AUC = {results[best_final_model_name]['auc']:.4f}")
-    
-    # Save the best model
-    with open('attrition_prediction_model.pkl', 'wb') as f:
-        pickle.dump(best_final_model, f)
-    
-    print("Best model saved as 'attrition_prediction_model.pkl'")
-    
-    return results, best_final_model
-
-def analyze_model_features(model, X_train, X_test, y_test, preprocessor, feature_names=None):
-    """
-    Analyze feature importance and generate SHAP explanations
-    
-    Parameters:
-    -----------
-    model : Pipeline
-        The trained machine learning model
-    X_train, X_test : pd.DataFrame
-        Training and testing data
-    y_test : pd.Series
-        Test labels
-    preprocessor : ColumnTransformer
-        The preprocessing pipeline
-    feature_names : list, optional
-        List of feature names
-        
-    Returns:
-    --------
-    None
-    """
-    print("\nAnalyzing model features and generating explanations...")
-    
-    # Extract the classifier from the pipeline
-    classifier = model.named_steps['classifier']
-    
-    # Get feature names after preprocessing
-    if feature_names is None:
-        feature_names = []
-        for name, transformer, cols in preprocessor.transformers_:
-            if name == 'num':
-                feature_names.extend(cols)
-            elif name == 'cat':
-                # For categorical features, get one-hot encoded column names
-                for i, col in enumerate(cols):
-                    categories = transformer.categories_[i][1:]  # Skip first category (dropped)
-                    feature_names.extend([f"{col}_{cat}" for cat in categories])
-    
-    # Get feature importances if available
-    if hasattr(classifier, 'feature_importances_'):
-        importances = classifier.feature_importances_
-        indices = np.argsort(importances)[::-1]
-        
-        # Plot feature importances
-        plt.figure(figsize=(12, 8))
-        plt.title('Feature Importances for Attrition Prediction')
-        plt.barh(range(min(20, len(indices))), 
-                importances[indices[:20]],
-                align='center')
-        plt.yticks(range(min(20, len(indices))), 
-                  [feature_names[i] if i < len(feature_names) else f"Feature {i}" 
-                   for i in indices[:20]])
-        plt.xlabel('Relative Importance')
-        plt.tight_layout()
-        plt.savefig('feature_importances.png')
-        plt.close()
-        
-        # Print top features
-        print("\nTop 10 features by importance:")
-        for i in range(min(10, len(indices))):
-            if indices[i] < len(feature_names):
-                print(f"{i+1}. {feature_names[indices[i]]}: {importances[indices[i]]:.4f}")
-            else:
-                print(f"{i+1}. Feature {indices[i]}: {importances[indices[i]]:.4f}")
-    
-    # Generate SHAP explanations
-    # Use a sample of test data for efficiency
-    try:
-        sample_size = min(100, X_test.shape[0])
-        X_sample = X_test.sample(sample_size, random_state=42)
-        y_sample = y_test.loc[X_sample.index]
-        
-        # Transform the sample data
-        X_sample_transformed = preprocessor.transform(X_sample)
-        
-        # Create a SHAP explainer
-        if hasattr(classifier, 'feature_importances_'):
-            explainer = shap.TreeExplainer(classifier)
-            shap_values = explainer.shap_values(X_sample_transformed)
-            
-            # Summary plot
-            plt.figure(figsize=(12, 8))
-            shap.summary_plot(shap_values[1] if isinstance(shap_values, list) else shap_values, 
-                             X_sample_transformed, 
-                             feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None,
-                             show=False)
-            plt.tight_layout()
-            plt.savefig('shap_summary.png')
-            plt.close()
-            
-            # Dependence plots for top features
-            if isinstance(shap_values, list):
-                shap_values = shap_values[1]  # For binary classification, use positive class
-                
-            # Get the top feature indices by mean absolute SHAP value
-            top_indices = np.argsort(-np.abs(shap_values).mean(0))[:3]
-            
-            for i, idx in enumerate(top_indices):
-                if idx < len(feature_names):
-                    plt.figure(figsize=(10, 6))
-                    shap.dependence_plot(idx, shap_values, X_sample_transformed, 
-                                        feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None,
-                                        show=False)
-                    plt.title(f"SHAP Dependence Plot: {feature_names[idx] if idx < len(feature_names) else f'Feature {idx}'}")
-                    plt.tight_layout()
-                    plt.savefig(f'shap_dependence_{i+1}.png')
-                    plt.close()
-            
-            # Individual explanation for a high-attrition-risk employee
-            y_prob = model.predict_proba(X_sample)[:, 1]
-            high_risk_idx = np.argmax(y_prob)
-            
-            plt.figure(figsize=(16, 6))
-            shap.force_plot(explainer.expected_value[1] if hasattr(explainer, 'expected_value') and isinstance(explainer.expected_value, list) else explainer.expected_value, 
-                           shap_values[high_risk_idx, :], 
-                           X_sample_transformed[high_risk_idx, :],
-                           feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None,
-                           matplotlib=True, show=False)
-            plt.title("SHAP Explanation for High Attrition Risk Employee")
-            plt.tight_layout()
-            plt.savefig('high_risk_explanation.png')
-            plt.close()
-            
-            print("\nSHAP analysis completed. Visualizations saved to PNG files.")
-    except Exception as e:
-        print(f"Error generating SHAP explanations: {e}")
-        pass
-
-def create_attrition_risk_profiles(df, model, preprocessor):
-    """
-    Create attrition risk profiles based on model predictions
-    
-    Parameters:
-    -----------
-    df : pd.DataFrame
-        The HR dataset
-    model : Pipeline
-        The trained attrition prediction model
-    preprocessor : ColumnTransformer
-        The preprocessing pipeline
-        
-    Returns:
-    --------
-    pd.DataFrame
-        Dataframe with risk profiles
-    """
-    print("\nCreating attrition risk profiles...")
-    
-    # Remove unnecessary columns for prediction
-    X = df.drop(['Attrition', 'AttritionBinary', 'EmployeeCount', 
-                'EmployeeNumber', 'StandardHours', 'Over18'], axis=1)
-    
-    # Generate predictions
-    df_risk = df.copy()
-    df_risk['AttritionProbability'] = model.predict_proba(X)[:, 1]
-    
-    # Create risk categories
-    bins = [0, 0.3, 0.6, 1.0]
-    labels = ['Low Risk', 'Medium Risk', 'High Risk']
-    df_risk['RiskCategory'] = pd.cut(df_risk['AttritionProbability'], bins=bins, labels=labels)
-    
-    # Summarize risk categories
-    risk_summary = df_risk['RiskCategory'].value_counts().sort_index()
-    risk_percentages = df_risk['RiskCategory'].value_counts(normalize=True).sort_index() * 100
-    
-    print("\nRisk Category Distribution:")
-    for category, count, percentage in zip(risk_summary.index, risk_summary.values, risk_percentages.values):
-        print(f"{category}: {count} employees ({percentage:.1f}%)")
-    
-    # Department risk analysis
-    dept_risk = df_risk.groupby('Department')['AttritionProbability'].agg(['mean', 'count'])
-    dept_risk.columns = ['Average Risk', 'Employee Count']
-    dept_risk = dept_risk.sort_values('Average Risk', ascending=False)
-    
-    print("\nDepartment Risk Analysis:")
-    print(dept_risk)
-    
-    # Job role risk analysis
-    role_risk = df_risk.groupby('JobRole')['AttritionProbability'].agg(['mean', 'count'])
-    role_risk.columns = ['Average Risk', 'Employee Count']
-    role_risk = role_risk.sort_values('Average Risk', ascending=False)
-    
-    print("\nJob Role Risk Analysis:")
-    print(role_risk.head())
-    
-    # Identify top factors driving high risk
-    high_risk_employees = df_risk[df_risk['RiskCategory'] == 'High Risk']
-    
-    # Compare high risk vs overall for key metrics
-    risk_comparisons = []
-    for col in ['MonthlyIncome', 'JobSatisfaction', 'WorkLifeBalance', 
-               'YearsSinceLastPromotion', 'DistanceFromHome', 'OverTime']:
-        if col == 'OverTime':
-            # Handle categorical variable
-            overall_value = (df[col] == 'Yes').mean() * 100
-            high_risk_value = (high_risk_employees[col] == 'Yes').mean() * 100
-            unit = '%'
-        else:
-            overall_value = df[col].mean()
-            high_risk_value = high_risk_employees[col].mean()
-            unit = ''
-        
-        comparison = {
-            'Factor': col,
-            'Overall Average': f"{overall_value:.2f}{unit}",
-            'High Risk Average': f"{high_risk_value:.2f}{unit}",
-            'Difference': f"{((high_risk_value - overall_value) / overall_value * 100):.1f}%"
-        }
-        risk_comparisons.append(comparison)
-    
-    print("\nHigh Risk vs Overall Comparisons:")
-    for comp in risk_comparisons:
-        print(f"{comp['Factor']}: Overall {comp['Overall Average']} vs High Risk {comp['High Risk Average']} ({comp['Difference']} difference)")
-    
-    # Export risk data for dashboard
-    df_risk.to_csv('attrition_risk_profiles.csv', index=False)
-    print("\nRisk profiles exported to 'attrition_risk_profiles.csv'")
-    
-    return df_risk
-
-def main():
-    """Main function to run the attrition prediction pipeline"""
-    print("=" * 80)
-    print("TALENT ANALYTICS: EMPLOYEE ATTRITION PREDICTION")
-    print("=" * 80)
-    
-    # Load and explore data
-    df = load_and_explore_data()
-    
-    # Perform exploratory data analysis
-    df = perform_eda(df)
-    
-    # Engineer features
-    df = engineer_features(df)
-    
-    # Prepare data for modeling
-    X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(df)
-    
-    # Build and evaluate models
-    results, best_model = build_and_evaluate_models(X_train, X_test, y_train, y_test, preprocessor)
-    
-    # Analyze model features
-    analyze_model_features(best_model, X_train, X_test, y_test, preprocessor)
-    
-    # Create attrition risk profiles
-    risk_profiles = create_attrition_risk_profiles(df, best_model, preprocessor)
-    
-    print("\nAttrition prediction model development completed.")
-    print("Results and visualizations have been saved as PNG files.")
-    print("The model has been saved as 'attrition_prediction_model.pkl'")
-    
-    # Example of how to use the model for prediction
-    print("\nExample of using the model for prediction:")
-    print("""
-    import pickle
-    import pandas as pd
-    
-    # Load the model
-    with open('attrition_prediction_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    
-    # Prepare new employee data
-    new_employees = pd.DataFrame({
-        'Age': [35, 42, 29],
-        'BusinessTravel': ['Travel_Rarely', 'Travel_Frequently', 'Travel_Rarely'],
-        'DailyRate': [1102, 857, 1200],
-        'Department': ['Sales', 'Research & Development', 'Human Resources'],
-        'DistanceFromHome': [15, 3, 25],
-        # Add all required features...
-    })
-    
-    # Make predictions
-    probabilities = model.predict_proba(new_employees)[:, 1]
-    
-    # Create risk categories
-    risk_categories = ['Low Risk' if p < 0.3 else 'Medium Risk' if p < 0.6 else 'High Risk' 
-                      for p in probabilities]
-    
-    # Display results
-    for i, (prob, risk) in enumerate(zip(probabilities, risk_categories)):
-        print(f"Employee {i+1}: {prob:.2%} probability of attrition - {risk}")
-    """)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+"""
+Talent Analytics: Employee Attrition Prediction Model
+-----------------------------------------------------
+This module creates a machine learning model to predict employee attrition
+and identify key factors driving turnover, serving as the foundation for
+strategic workforce planning.
+"""
+
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve, precision_recall_curve
+from sklearn.feature_selection import SelectKBest, f_classif
+import pickle
+import argparse
+import time
+from joblib import Parallel, delayed, effective_n_jobs
+from hr_data import (DEFAULT_DATA_PATH, DEFAULT_CHUNK_SIZE, MODEL_COLUMNS, load_hr_data,
+                     apply_schema, memory_report)
+from hr_features import AttritionFeatureTransformer, add_attrition_features, job_level_average_income
+from hr_feature_store import FeatureStore, preprocessing_memory
+from hr_cv import FoldManager
+from hr_online import OnlineAttritionModel
+from hr_encoders import CATEGORICAL_ENCODERS, categorical_encoder
+from hr_models import (SEARCH_MODES, HALVING_RESOURCES, BOOSTING_BACKENDS, MATRIX_FORMATS, boosting_steps,
+                       boosting_param_grid, hyperparameter_search, sparse_threshold)
+from hr_plots import FigureBook, PLOT_MODES, MAX_HEATMAP_FEATURES, histogram_by_group, box_stats
+from hr_stats import grouped_stats, group_table, correlation_stats
+from hr_incremental import (EMPLOYEE_KEY, diff_snapshots, load_stats, save_stats,
+                            stats_drifted, patch_export)
+import warnings
+warnings.filterwarnings('ignore')
+
+def load_and_explore_data(file_path=DEFAULT_DATA_PATH, chunksize=DEFAULT_CHUNK_SIZE, use_cache=True):
+    """
+    Load the HR attrition dataset and perform initial exploration
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the HR attrition dataset
+    chunksize : int
+        Number of rows read per chunk while streaming the CSV
+    use_cache : bool
+        Whether to serve the data from the Parquet cache of the CSV
+        
+    Returns:
+    --------
+    pd.DataFrame
+        The loaded and initially processed dataframe
+    """
+    print(f"Loading data from {file_path}...")
+    df, summary = load_hr_data(file_path, chunksize=chunksize, columns=MODEL_COLUMNS,
+                               use_cache=use_cache)
+    
+    print(f"Dataset shape: {df.shape}")
+    print(f"Number of employees: {df.shape[0]}")
+    print(f"Number of features: {df.shape[1]}")
+    
+    # Summary of attrition, accumulated while the chunks were read
+    attrition_counts = summary.attrition_counts
+    attrition_pct = summary.attrition_pct
+    
+    print("\nAttrition Summary:")
+    print(f"Employees who stayed: {attrition_counts['No']} ({attrition_pct['No']:.2f}%)")
+    print(f"Employees who left: {attrition_counts['Yes']} ({attrition_pct['Yes']:.2f}%)")
+    
+    # Check for missing values
+    missing_values = summary.missing_values
+    if missing_values.sum() > 0:
+        print("\nMissing values detected:")
+        print(missing_values[missing_values > 0])
+    else:
+        print("\nNo missing values detected.")
+    
+    # Check data types
+    print("\nData Types:")
+    print(df.dtypes.astype(str).value_counts())
+    
+    # Convert target to binary
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    
+    return apply_schema(df)
+
+def perform_eda(df, figures=None, export_path='attrition_eda_stats.csv'):
+    """
+    Perform exploratory data analysis on the HR dataset
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    figures : FigureBook, optional
+        Receives the EDA figures; rendered right away when not given
+    export_path : str
+        CSV file the group statistics are exported to
+        
+    Returns:
+    --------
+    pd.DataFrame
+        The dataframe with any EDA transformations
+    """
+    print("\nPerforming Exploratory Data Analysis...")
+    
+    if figures is None:
+        figures = FigureBook()
+    
+    # Attrition rates by department, job role, overtime and work-life balance,
+    # accumulated in a single pass
+    group_stats = grouped_stats(df, ['Department', 'JobRole', 'OverTime', 'WorkLifeBalance'],
+                                ['AttritionBinary'])
+    eda_table = group_stats.table()
+    
+    # 1. Age distribution by attrition
+    if figures.enabled:
+        figures.add('histogram', 'age_distribution.png',
+                    **histogram_by_group(df['Age'], df['Attrition'], bins=20), hue='Attrition',
+                    title='Age Distribution by Attrition Status', xlabel='Age', ylabel='Count')
+    
+    # 2. Attrition by Department
+    dept_attrition = group_table(eda_table, 'Department')['AttritionBinary'] * 100
+    figures.add('bar', 'dept_attrition.png', x=dept_attrition.index, y=dept_attrition.values,
+                figsize=(8, 5), title='Attrition Rate by Department', xlabel='Department',
+                ylabel='Attrition Rate (%)', rotation=45, tight=True)
+    
+    # 3. Attrition by Job Role
+    role_attrition = group_table(eda_table, 'JobRole')['AttritionBinary'] * 100
+    figures.add('bar', 'role_attrition.png', x=role_attrition.index, y=role_attrition.values,
+                figsize=(12, 6), title='Attrition Rate by Job Role', xlabel='Job Role',
+                ylabel='Attrition Rate (%)', rotation=90, tight=True)
+    
+    # 4. Monthly Income vs Attrition
+    if figures.enabled:
+        figures.add('boxplot', 'income_attrition.png',
+                    stats=box_stats(df['MonthlyIncome'], df['Attrition']),
+                    title='Monthly Income by Attrition Status', xlabel='Attrition', ylabel='MonthlyIncome')
+    
+    # 5. Correlation analysis for numerical features
+    if figures.enabled:
+        numeric_columns = list(df.select_dtypes(include='number').columns)
+        
+        # Calculate correlation matrix, streaming over the rows
+        corr_stats = correlation_stats(df, numeric_columns)
+        corr_matrix = corr_stats.correlation()
+        
+        # Wide datasets only show the features most correlated with attrition
+        if len(numeric_columns) > MAX_HEATMAP_FEATURES:
+            top_features = corr_stats.top_correlated('AttritionBinary', k=MAX_HEATMAP_FEATURES - 1)
+            print(f"\nTop {len(top_features)} features correlated with attrition:")
+            print(top_features)
+            shown = list(top_features.index) + ['AttritionBinary']
+            corr_matrix = corr_matrix.loc[shown, shown]
+        
+        # Plot correlation heatmap
+        figures.add('heatmap', 'correlation_matrix.png', matrix=corr_matrix,
+                    title='Feature Correlation Matrix', tight=True)
+    
+    # 6. Key variable exploration: OverTime
+    overtime_attrition = group_table(eda_table, 'OverTime')['AttritionBinary'] * 100
+    figures.add('series_bar', 'overtime_attrition.png', series=overtime_attrition, color='coral',
+                title='Attrition Rate by Overtime Status', xlabel='Works Overtime',
+                ylabel='Attrition Rate (%)', rotation=0)
+    
+    # 7. Work-Life Balance vs Attrition
+    wlb_attrition = group_table(eda_table, 'WorkLifeBalance')['AttritionBinary'] * 100
+    figures.add('series_bar', 'wlb_attrition.png', series=wlb_attrition, color='teal',
+                title='Attrition Rate by Work-Life Balance', xlabel='Work-Life Balance (1=Bad, 4=Best)',
+                ylabel='Attrition Rate (%)', rotation=0)
+    
+    # Print key insights
+    print("\nKey EDA Insights:")
+    print(f"- Overall attrition rate: {group_table(eda_table, 'All')['AttritionBinary'].iloc[0] * 100:.2f}%")
+    print(f"- Department with highest attrition: {dept_attrition.idxmax()} ({dept_attrition.max():.2f}%)")
+    print(f"- Department with lowest attrition: {dept_attrition.idxmin()} ({dept_attrition.min():.2f}%)")
+    print(f"- Job role with highest attrition: {role_attrition.idxmax()} ({role_attrition.max():.2f}%)")
+    print(f"- Overtime attrition rate: {overtime_attrition['Yes']:.2f}%")
+    print(f"- Non-overtime attrition rate: {overtime_attrition['No']:.2f}%")
+    
+    # Export the group statistics behind the figures and insights
+    eda_table.to_csv(export_path, index=False)
+    print(f"\nGroup statistics exported to '{export_path}'")
+    
+    # Return the dataframe in case any transformations were made
+    return df
+
+def engineer_features(df, store=None):
+    """
+    Create new features to improve model performance
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    store : FeatureStore, optional
+        On-disk cache of feature columns from earlier runs on the same data
+        
+    Returns:
+    --------
+    pd.DataFrame
+        The dataframe with engineered features
+    """
+    print("\nEngineering additional features...")
+    
+    df = add_attrition_features(df, store=store)
+    if store is not None:
+        print(f"Feature store: {store.hits} cached, {store.misses} computed")
+    
+    # Print statistics on new features
+    print("\nEngineered Features Summary:")
+    for feature in ['SalaryToJobLevelRatio', 'PromotionRisk', 'CommuteDifficulty', 
+                    'RelativeCompensation', 'WorkLifeImbalance', 'GrowthOpportunityIndex',
+                    'JobEngagement', 'SatisfactionComposite', 'OvertimeDistanceRisk']:
+        if feature in df.columns:
+            print(f"{feature} - Mean: {df[feature].mean():.2f}, Std: {df[feature].std():.2f}")
+    
+    # Check correlation of new features with attrition
+    engineered_features = ['SalaryToJobLevelRatio', 'PromotionRisk', 'CommuteDifficulty', 
+                          'RelativeCompensation', 'WorkLifeImbalance', 'GrowthOpportunityIndex',
+                          'JobEngagement', 'SatisfactionComposite', 'OvertimeDistanceRisk']
+    
+    corr_stats = correlation_stats(df, engineered_features + ['AttritionBinary'])
+    correlations = corr_stats.correlation()['AttritionBinary'].sort_values()
+    
+    print("\nCorrelation with Attrition:")
+    print(correlations[:-1])  # Exclude correlation with itself
+    
+    return df
+
+def prepare_data_for_modeling(df, matrix_format='auto', encoder='onehot'):
+    """
+    Prepare the data for model training
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset with engineered features
+    matrix_format : str
+        Output of the preprocessor: 'auto', or 'sparse' to keep the one-hot
+        columns in CSR matrices all the way to the classifier, which bounds
+        memory by the non-zero entries when categorical columns have
+        thousands of values, or 'dense' (see hr_models.MATRIX_FORMATS)
+    encoder : str
+        Encoder of the categorical columns: 'onehot', or 'hashing', 'target'
+        or 'frequency' to keep the matrix width bounded however many
+        categories there are (see hr_encoders)
+        
+    Returns:
+    --------
+    tuple
+        X_train, X_test, y_train, y_test, preprocessor
+    """
+    print("\nPreparing data for modeling...")
+    
+    # Remove unnecessary columns
+    cols_to_drop = ['Attrition', 'EmployeeCount', 'EmployeeNumber', 'StandardHours', 'Over18']
+    X = df.drop(['AttritionBinary'] + cols_to_drop, axis=1, errors='ignore')
+    y = df['AttritionBinary']
+    
+    # Identify categorical and numerical columns
+    cat_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
+    num_cols = X.select_dtypes(include='number').columns.tolist()
+    
+    print(f"Categorical features: {len(cat_cols)}")
+    print(f"Numerical features: {len(num_cols)}")
+    print(f"Total features: {len(cat_cols) + len(num_cols)}")
+    
+    # Create preprocessing pipeline
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), num_cols),
+            ('cat', categorical_encoder(encoder), cat_cols)
+        ],
+        remainder='drop',
+        sparse_threshold=sparse_threshold(matrix_format)
+    )
+    
+    # Split the data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y)
+    
+    print(f"Training set size: {X_train.shape[0]} samples")
+    print(f"Testing set size: {X_test.shape[0]} samples")
+    
+    return X_train, X_test, y_train, y_test, preprocessor
+
+# Hyperparameters tuned when a tree ensemble is the best candidate model
+PARAM_GRIDS = {
+    'Random Forest': {
+        'classifier__n_estimators': [100, 200],
+        'classifier__max_depth': [None, 10, 20],
+        'classifier__min_samples_split': [2, 5, 10]
+    },
+    'Gradient Boosting': {
+        'classifier__n_estimators': [100, 200],
+        'classifier__learning_rate': [0.05, 0.1],
+        'classifier__max_depth': [3, 5, 7]
+    }
+}
+
+def candidate_models(preprocessor, memory=None, tree_jobs=None, backend='gradient_boosting'):
+    """
+    Model pipelines compared by build_and_evaluate_models
+    
+    The feature step recomputes the engineered features with statistics
+    learned from the training data only. With a memory, the feature and
+    preprocessor steps are fitted once per training set and reused by every
+    model, cross-validation fold and hyperparameter setting.
+    
+    Parameters:
+    -----------
+    preprocessor : ColumnTransformer
+        The preprocessing pipeline
+    memory : joblib.Memory, optional
+        Cache of the fitted feature and preprocessor steps
+    tree_jobs : int, optional
+        Cores the Random Forest grows its trees on
+    backend : str
+        Gradient boosting backend (see hr_models.boosting_steps); each
+        backend gets its own preprocessor over the same columns, with the
+        categorical encoder of `preprocessor` and, for the one-hot backend,
+        its matrix format
+        
+    Returns:
+    --------
+    dict
+        Dictionary of unfitted model pipelines
+    """
+    columns = {name: cols for name, _, cols in preprocessor.transformers}
+    encoders = {name: transformer for name, transformer, _ in preprocessor.transformers}
+    boosting_preprocessor, boosting_classifier = boosting_steps(columns['num'], columns['cat'], backend,
+                                                                encoder=encoders['cat'])
+    if backend == 'gradient_boosting':
+        boosting_preprocessor.set_params(sparse_threshold=preprocessor.sparse_threshold)
+    
+    return {
+        'Logistic Regression': Pipeline([
+            ('features', AttritionFeatureTransformer()),
+            ('preprocessor', preprocessor),
+            ('classifier', LogisticRegression(random_state=42, max_iter=1000))
+        ], memory=memory),
+        
+        'Random Forest': Pipeline([
+            ('features', AttritionFeatureTransformer()),
+            ('preprocessor', preprocessor),
+            ('classifier', RandomForestClassifier(random_state=42, n_jobs=tree_jobs))
+        ], memory=memory),
+        
+        'Gradient Boosting': Pipeline([
+            ('features', AttritionFeatureTransformer()),
+            ('preprocessor', boosting_preprocessor),
+            ('classifier', boosting_classifier)
+        ], memory=memory)
+    }
+
+def fit_candidate(model, X_train, y_train, X_test, y_test):
+    """
+    Train one candidate model and score it on the test set
+    
+    Runs in a worker process of build_and_evaluate_models, so the
+    classification report is returned as text for the parent to print.
+    
+    Returns:
+    --------
+    dict
+        The fitted model, its ROC AUC, test predictions and probabilities,
+        classification report and training time
+    """
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    
+    # Predict on test set
+    y_pred = model.predict(X_test)
+    y_prob = model.predict_proba(X_test)[:, 1]
+    
+    return {
+        'model': model,
+        'auc': roc_auc_score(y_test, y_prob),
+        'predictions': y_pred,
+        'probabilities': y_prob,
+        'report': classification_report(y_test, y_pred),
+        'time': time.perf_counter() - start
+    }
+
+def build_and_evaluate_models(X_train, X_test, y_train, y_test, preprocessor, figures=None, memory=None,
+                              n_jobs=-1, search='grid', search_resource='n_samples', backend='gradient_boosting',
+                              cv_cache=True):
+    """
+    Build and evaluate multiple machine learning models
+    
+    Parameters:
+    -----------
+    X_train, X_test, y_train, y_test : pd.DataFrame, pd.Series
+        Training and testing data
+    preprocessor : ColumnTransformer
+        The preprocessing pipeline
+    figures : FigureBook, optional
+        Receives the ROC curve comparison; rendered right away when not given
+    memory : joblib.Memory, optional
+        Cache of the fitted feature and preprocessor steps, shared by the
+        candidate models, the cross-validation folds and the grid search
+    n_jobs : int
+        Core budget; the candidate models train concurrently in worker
+        processes, and cores left over grow the Random Forest's trees in
+        parallel. -1 uses every core
+    search : str
+        Hyperparameter search for the best tree ensemble: 'grid', 'halving'
+        or 'warm_start' (see hr_models.hyperparameter_search)
+    search_resource : str
+        Budget grown by the halving search: 'n_samples' or 'n_estimators'
+    backend : str
+        Gradient boosting backend: 'gradient_boosting' or
+        'hist_gradient_boosting' (see hr_models.boosting_steps)
+    cv_cache : bool
+        Keep the out-of-fold predictions on disk (see hr_cv.FoldManager);
+        the cross-validation and the search always share one set of folds
+        
+    Returns:
+    --------
+    dict
+        Dictionary of trained models
+    """
+    print("\nBuilding and evaluating machine learning models...")
+    
+    if figures is None:
+        figures = FigureBook()
+    
+    # Split the core budget between concurrent candidate models and the
+    # Random Forest's trees
+    n_jobs = effective_n_jobs(n_jobs)
+    n_workers = min(n_jobs, 3)
+    
+    # Create model pipelines
+    models = candidate_models(preprocessor, memory, tree_jobs=max(1, n_jobs // n_workers), backend=backend)
+    
+    # Train and evaluate each model, concurrently when the budget allows
+    results = {}
+    best_auc = 0
+    best_model_name = None
+    timings = []
+    
+    start = time.perf_counter()
+    fitted = Parallel(n_jobs=n_workers)(
+        delayed(fit_candidate)(model, X_train, y_train, X_test, y_test) for model in models.values())
+    elapsed = time.perf_counter() - start
+    
+    for name, result in zip(models, fitted):
+        print(f"\nTraining {name}...")
+        print(f"{name} Results:")
+        print(result.pop('report'))
+        print(f"ROC AUC: {result['auc']:.4f}")
+        
+        # Store results
+        models[name] = result['model']
+        timings.append({'Stage': name, 'Time (s)': result.pop('time')})
+        results[name] = result
+        
+        # Track best model
+        if result['auc'] > best_auc:
+            best_auc = result['auc']
+            best_model_name = name
+    timings.insert(0, {'Stage': f'candidate models ({n_workers} worker(s))', 'Time (s)': elapsed})
+    
+    # Cross-validation and tuning share the folds and their out-of-fold
+    # predictions, so the untuned model is not refitted by the grid search
+    folds = FoldManager(X_train, y_train, store=None if cv_cache else False)
+    
+    # Perform cross-validation on the best model
+    start = time.perf_counter()
+    if best_model_name:
+        print(f"\nPerforming cross-validation on {best_model_name}...")
+        best_model = models[best_model_name]
+        cv_scores = folds.fold_scores(best_model, n_jobs=n_jobs)
+        
+        print(f"Cross-validation ROC AUC scores: {cv_scores}")
+        print(f"Mean CV ROC AUC: {cv_scores.mean():.4f} ± {cv_scores.std():.4f}")
+    timings.append({'Stage': 'cross-validation', 'Time (s)': time.perf_counter() - start})
+    
+    # Tune hyperparameters for the best model
+    start = time.perf_counter()
+    if best_model_name == 'Random Forest':
+        print("\nTuning Random Forest hyperparameters...")
+        param_grid = PARAM_GRIDS['Random Forest']
+        
+        # The search spends the core budget on parallel fits instead
+        grid_search = hyperparameter_search(models['Random Forest'].set_params(classifier__n_jobs=1),
+                                            param_grid, search, search_resource, n_jobs=n_jobs, folds=folds)
+        grid_search.fit(X_train, y_train)
+        
+        print(f"Best parameters: {grid_search.best_params_}")
+        print(f"Best CV ROC AUC: {grid_search.best_score_:.4f}")
+        
+        # Update the model with tuned hyperparameters
+        models['Random Forest'] = grid_search.best_estimator_
+        
+        # Re-evaluate the tuned model
+        y_pred = models['Random Forest'].predict(X_test)
+        y_prob = models['Random Forest'].predict_proba(X_test)[:, 1]
+        
+        auc = roc_auc_score(y_test, y_prob)
+        
+        print("\nTuned Random Forest Results:")
+        print(classification_report(y_test, y_pred))
+        print(f"ROC AUC: {auc:.4f}")
+        
+        results['Random Forest (Tuned)'] = {
+            'model': models['Random Forest'],
+            'auc': auc,
+            'predictions': y_pred,
+            'probabilities': y_prob
+        }
+        
+    elif best_model_name == 'Gradient Boosting':
+        print("\nTuning Gradient Boosting hyperparameters...")
+        param_grid = boosting_param_grid(PARAM_GRIDS['Gradient Boosting'], backend)
+        
+        grid_search = hyperparameter_search(models['Gradient Boosting'], param_grid, search, search_resource,
+                                            n_jobs=n_jobs, folds=folds)
+        grid_search.fit(X_train, y_train)
+        
+        print(f"Best parameters: {grid_search.best_params_}")
+        print(f"Best CV ROC AUC: {grid_search.best_score_:.4f}")
+        
+        # Update the model with tuned hyperparameters
+        models['Gradient Boosting'] = grid_search.best_estimator_
+        
+        # Re-evaluate the tuned model
+        y_pred = models['Gradient Boosting'].predict(X_test)
+        y_prob = models['Gradient Boosting'].predict_proba(X_test)[:, 1]
+        
+        auc = roc_auc_score(y_test, y_prob)
+        
+        print("\nTuned Gradient Boosting Results:")
+        print(classification_report(y_test, y_pred))
+        print(f"ROC AUC: {auc:.4f}")
+        
+        results['Gradient Boosting (Tuned)'] = {
+            'model': models['Gradient Boosting'],
+            'auc': auc,
+            'predictions': y_pred,
+            'probabilities': y_prob
+        }
+    
+    if best_model_name in ('Random Forest', 'Gradient Boosting'):
+        timings.append({'Stage': f"{search.replace('_', ' ')} search", 'Time (s)': time.perf_counter() - start})
+    
+    print(f"\nModel Building Times ({'cached' if memory is not None else 'uncached'} preprocessing):")
+    print(pd.DataFrame(timings).to_string(index=False, float_format='{:.2f}'.format))
+    print(f"Cross-validation folds: {folds.fits} fitted, {folds.reused} reused from the fold cache")
+    
+    # The fitted models no longer need the cache
+    for result in results.values():
+        result['model'].set_params(memory=None)
+    
+    # Compare ROC curves
+    if figures.enabled:
+        curves = []
+        for name, result in results.items():
+            fpr, tpr, _ = roc_curve(y_test, result['probabilities'])
+            curves.append((f"{name} (AUC = {result['auc']:.4f})", fpr, tpr))
+        
+        figures.add('curves', 'roc_curves_comparison.png', curves=curves, figsize=(10, 8),
+                    legend_loc='lower right', xlabel='False Positive Rate', ylabel='True Positive Rate',
+                    title='ROC Curves for Attrition Prediction Models')
+    
+    # Find the best final model
+    best_final_model_name = max(results, key=lambda x: results[x]['auc'])
+    best_final_model = results[best_final_model_name]['model']
+    
+    print(f"\nBest model: {best_final_model_name} with ROC AUC = {results[best_final_model_name]['auc']:.4f}")
+    
+    # Save the best model
+    with open('attrition_prediction_model.pkl', 'wb') as f:
+        pickle.dump(best_final_model, f)
+    
+    print("Best model saved as 'attrition_prediction_model.pkl'")
+    
+    return results, best_final_model
+
+def build_online_model(X_train, X_test, y_train, y_test, preprocessor,
+                       model_path='attrition_online_model.pkl'):
+    """
+    Train the online attrition model on mini-batches of the training data
+    
+    The model learns the same columns as the batch pipelines with a logistic
+    regression fitted by stochastic gradient descent, and is saved for later
+    updates with update_online_model.
+    
+    Parameters:
+    -----------
+    X_train, X_test, y_train, y_test : pd.DataFrame, pd.Series
+        Training and testing data
+    preprocessor : ColumnTransformer
+        The preprocessing pipeline whose columns the model uses
+    model_path : str
+        Where the model is saved
+        
+    Returns:
+    --------
+    OnlineAttritionModel
+        The trained model
+    """
+    print("\nTraining online attrition model on mini-batches...")
+    
+    columns = {name: cols for name, _, cols in preprocessor.transformers}
+    start = time.perf_counter()
+    model = OnlineAttritionModel(columns['num'], columns['cat']).fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+    
+    auc = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+    print(f"Online model: {model.n_batches_} mini-batches in {elapsed:.2f}s, ROC AUC: {auc:.4f}")
+    
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    print(f"Online model saved as '{model_path}'")
+    
+    return model
+
+def update_online_model(batch_path, model_path='attrition_online_model.pkl'):
+    """
+    Update the saved online attrition model with a batch of HRIS records
+    
+    Parameters:
+    -----------
+    batch_path : str
+        CSV of employee records with their Attrition outcome, for example
+        the day's new leavers and changed records
+    model_path : str
+        Online model saved by build_online_model; updated in place
+        
+    Returns:
+    --------
+    OnlineAttritionModel
+        The updated model
+    """
+    print("\nUpdating online attrition model...")
+    
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    
+    batch, _ = load_hr_data(batch_path, columns=MODEL_COLUMNS, use_cache=False)
+    start = time.perf_counter()
+    model.update(batch)
+    elapsed = time.perf_counter() - start
+    print(f"Learned from {len(batch)} employees in {elapsed:.2f}s "
+          f"({model.n_employees_} employee records over {model.n_batches_} mini-batches so far)")
+    
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    print(f"Online model saved as '{model_path}'")
+    
+    return model
+
+def analyze_model_features(model, X_train, X_test, y_test, preprocessor, feature_names=None, figures=None):
+    """
+    Analyze feature importance and generate SHAP explanations
+    
+    Parameters:
+    -----------
+    model : Pipeline
+        The trained machine learning model
+    X_train, X_test : pd.DataFrame
+        Training and testing data
+    y_test : pd.Series
+        Test labels
+    preprocessor : ColumnTransformer
+        The preprocessing pipeline
+    feature_names : list, optional
+        List of feature names
+    figures : FigureBook, optional
+        Receives the importance and SHAP figures; rendered right away when not given
+        
+    Returns:
+    --------
+    None
+    """
+    print("\nAnalyzing model features and generating explanations...")
+    
+    if figures is None:
+        figures = FigureBook()
+    
+    # Extract the classifier from the pipeline
+    classifier = model.named_steps['classifier']
+    
+    # Get feature names after preprocessing
+    if feature_names is None:
+        feature_names = []
+        for name, transformer, cols in preprocessor.transformers_:
+            if name == 'num':
+                feature_names.extend(cols)
+            elif name == 'cat' and not isinstance(transformer, OneHotEncoder):
+                feature_names.extend(transformer.get_feature_names_out(cols))
+            elif name == 'cat':
+                # For categorical features, get one-hot encoded column names
+                for i, col in enumerate(cols):
+                    categories = transformer.categories_[i][1:]  # Skip first category (dropped)
+                    feature_names.extend([f"{col}_{cat}" for cat in categories])
+    
+    # Get feature importances if available
+    if hasattr(classifier, 'feature_importances_'):
+        importances = classifier.feature_importances_
+        indices = np.argsort(importances)[::-1]
+        
+        # Plot feature importances
+        figures.add('importances', 'feature_importances.png',
+                    names=[feature_names[i] if i < len(feature_names) else f"Feature {i}"
+                           for i in indices[:20]],
+                    importances=importances[indices[:20]],
+                    title='Feature Importances for Attrition Prediction', xlabel='Relative Importance')
+        
+        # Print top features
+        print("\nTop 10 features by importance:")
+        for i in range(min(10, len(indices))):
+            if indices[i] < len(feature_names):
+                print(f"{i+1}. {feature_names[indices[i]]}: {importances[indices[i]]:.4f}")
+            else:
+                print(f"{i+1}. Feature {indices[i]}: {importances[indices[i]]:.4f}")
+    
+    # Generate SHAP explanations; they only feed figures
+    if not figures.enabled:
+        return
+    
+    # Use a sample of test data for efficiency
+    try:
+        sample_size = min(100, X_test.shape[0])
+        X_sample = X_test.sample(sample_size, random_state=42)
+        y_sample = y_test.loc[X_sample.index]
+        
+        # Transform the sample data through every step before the classifier;
+        # SHAP and the plots need a dense matrix, which is only built for the sample
+        X_sample_transformed = model[:-1].transform(X_sample)
+        if sparse.issparse(X_sample_transformed):
+            X_sample_transformed = X_sample_transformed.toarray()
+        
+        # Create a SHAP explainer
+        if hasattr(classifier, 'feature_importances_'):
+            import shap
+            explainer = shap.TreeExplainer(classifier)
+            shap_values = explainer.shap_values(X_sample_transformed)
+            
+            # Summary plot
+            figures.add('shap_summary', 'shap_summary.png',
+                        shap_values=shap_values[1] if isinstance(shap_values, list) else shap_values,
+                        features=X_sample_transformed,
+                        feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None)
+            
+            # Dependence plots for top features
+            if isinstance(shap_values, list):
+                shap_values = shap_values[1]  # For binary classification, use positive class
+                
+            # Get the top feature indices by mean absolute SHAP value
+            top_indices = np.argsort(-np.abs(shap_values).mean(0))[:3]
+            
+            for i, idx in enumerate(top_indices):
+                if idx < len(feature_names):
+                    figures.add('shap_dependence', f'shap_dependence_{i+1}.png', index=idx,
+                                shap_values=shap_values, features=X_sample_transformed,
+                                feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None,
+                                title=f"SHAP Dependence Plot: {feature_names[idx] if idx < len(feature_names) else f'Feature {idx}'}")
+            
+            # Individual explanation for a high-attrition-risk employee
+            y_prob = model.predict_proba(X_sample)[:, 1]
+            high_risk_idx = np.argmax(y_prob)
+            
+            figures.add('shap_force', 'high_risk_explanation.png',
+                        expected_value=explainer.expected_value[1] if hasattr(explainer, 'expected_value') and isinstance(explainer.expected_value, list) else explainer.expected_value,
+                        shap_values=shap_values[high_risk_idx, :],
+                        features=X_sample_transformed[high_risk_idx, :],
+                        feature_names=feature_names if len(feature_names) == X_sample_transformed.shape[1] else None,
+                        title="SHAP Explanation for High Attrition Risk Employee")
+            
+            print("\nSHAP analysis completed. Visualizations saved to PNG files.")
+    except Exception as e:
+        print(f"Error generating SHAP explanations: {e}")
+        pass
+
+def score_attrition_risk(df, model):
+    """
+    Predict attrition probabilities and risk categories for employees
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset with engineered features
+    model : Pipeline
+        The trained attrition prediction model
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Copy of the dataframe with AttritionProbability and RiskCategory
+    """
+    # Remove unnecessary columns for prediction
+    X = df.drop(['Attrition', 'AttritionBinary', 'EmployeeCount', 
+                'EmployeeNumber', 'StandardHours', 'Over18'], axis=1, errors='ignore')
+    
+    # Generate predictions
+    df_risk = df.copy()
+    df_risk['AttritionProbability'] = model.predict_proba(X)[:, 1]
+    
+    # Create risk categories
+    bins = [0, 0.3, 0.6, 1.0]
+    labels = ['Low Risk', 'Medium Risk', 'High Risk']
+    df_risk['RiskCategory'] = pd.cut(df_risk['AttritionProbability'], bins=bins, labels=labels)
+    
+    return df_risk
+
+def create_attrition_risk_profiles(df, model, preprocessor, export_path='attrition_risk_profiles.csv'):
+    """
+    Create attrition risk profiles based on model predictions
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    model : Pipeline
+        The trained attrition prediction model
+    preprocessor : ColumnTransformer
+        The preprocessing pipeline
+    export_path : str
+        CSV file the risk profiles are exported to
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with risk profiles
+    """
+    print("\nCreating attrition risk profiles...")
+    
+    # Generate predictions and risk categories
+    df_risk = score_attrition_risk(df, model)
+    
+    # Risk category counts, department and job role risk, and the key metrics
+    # of high risk employees, accumulated in a single pass
+    comparison_factors = ['MonthlyIncome', 'JobSatisfaction', 'WorkLifeBalance',
+                          'YearsSinceLastPromotion', 'DistanceFromHome', 'OverTime']
+    values = {col: col for col in ['AttritionProbability'] + comparison_factors}
+    values['OverTime'] = lambda chunk: chunk['OverTime'] == 'Yes'
+    risk_table = grouped_stats(df_risk, ['RiskCategory', 'Department', 'JobRole'], values).table()
+    category_risk = group_table(risk_table, 'RiskCategory')
+    
+    # Summarize risk categories
+    risk_summary = category_risk['Count']
+    risk_percentages = risk_summary / risk_summary.sum() * 100
+    
+    print("\nRisk Category Distribution:")
+    for category, count, percentage in zip(risk_summary.index, risk_summary.values, risk_percentages.values):
+        print(f"{category}: {count} employees ({percentage:.1f}%)")
+    
+    # Department risk analysis
+    dept_risk = group_table(risk_table, 'Department')[['AttritionProbability', 'Count']].set_axis(
+        ['Average Risk', 'Employee Count'], axis=1)
+    dept_risk = dept_risk.sort_values('Average Risk', ascending=False)
+    
+    print("\nDepartment Risk Analysis:")
+    print(dept_risk)
+    
+    # Job role risk analysis
+    role_risk = group_table(risk_table, 'JobRole')[['AttritionProbability', 'Count']].set_axis(
+        ['Average Risk', 'Employee Count'], axis=1)
+    role_risk = role_risk.sort_values('Average Risk', ascending=False)
+    
+    print("\nJob Role Risk Analysis:")
+    print(role_risk.head())
+    
+    # Compare high risk vs overall for key metrics
+    risk_comparisons = []
+    for col in comparison_factors:
+        overall_value = group_table(risk_table, 'All')[col].iloc[0]
+        high_risk_value = category_risk[col].get('High Risk', np.nan)
+        unit = ''
+        if col == 'OverTime':
+            # Share of employees working overtime
+            overall_value, high_risk_value, unit = overall_value * 100, high_risk_value * 100, '%'
+        
+        comparison = {
+            'Factor': col,
+            'Overall Average': f"{overall_value:.2f}{unit}",
+            'High Risk Average': f"{high_risk_value:.2f}{unit}",
+            'Difference': f"{((high_risk_value - overall_value) / overall_value * 100):.1f}%"
+        }
+        risk_comparisons.append(comparison)
+    
+    print("\nHigh Risk vs Overall Comparisons:")
+    for comp in risk_comparisons:
+        print(f"{comp['Factor']}: Overall {comp['Overall Average']} vs High Risk {comp['High Risk Average']} ({comp['Difference']} difference)")
+    
+    # Export risk data for dashboard, with the statistics used to score it so
+    # that later snapshots can be scored incrementally
+    df_risk.to_csv(export_path, index=False)
+    save_stats(attrition_population_stats(df), export_path)
+    print(f"\nRisk profiles exported to '{export_path}'")
+    
+    return df_risk
+
+def attrition_population_stats(df):
+    """Population statistics that feed the engineered features, in JSON form"""
+    return {'job_level_income': {str(level): float(income)
+                                 for level, income in job_level_average_income(df).items()}}
+
+def update_attrition_risk_profiles(file_path, previous_path, model,
+                                   export_path='attrition_risk_profiles.csv', tolerance=0.01):
+    """
+    Incrementally rescore a new HRIS snapshot against the previous one
+    
+    Employees are matched by EmployeeNumber and a hash of their record; only
+    new and changed employees are re-engineered and rescored, and the exported
+    risk profiles are patched in place. The job-level income averages behind
+    RelativeCompensation are recomputed only when the delta can move them, and
+    everyone is rescored if they drift by more than `tolerance`.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the new snapshot
+    previous_path : str
+        Path to the snapshot the current export was scored from
+    model : Pipeline
+        The trained attrition prediction model
+    export_path : str
+        Risk profile CSV written by create_attrition_risk_profiles
+    tolerance : float
+        Relative change in the population statistics that forces a full rescore
+        
+    Returns:
+    --------
+    pd.DataFrame
+        Risk profiles of the rescored employees
+    """
+    print("\nUpdating attrition risk profiles incrementally...")
+    
+    current, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    previous, _ = load_hr_data(previous_path, columns=MODEL_COLUMNS)
+    delta = diff_snapshots(previous, current)
+    print(f"Snapshot delta: {delta}")
+    
+    current['AttritionBinary'] = (current['Attrition'] == 'Yes').astype('int8')
+    current = apply_schema(current)
+    
+    # Reuse the statistics the export was scored with unless the delta moves them
+    stats = load_stats(export_path)
+    full_rescore = stats is None
+    if full_rescore:
+        print("No previous export to patch, scoring every employee")
+        stats = attrition_population_stats(current)
+    elif delta.touches(['MonthlyIncome', 'JobLevel']):
+        new_stats = attrition_population_stats(current)
+        if stats_drifted(stats, new_stats, tolerance):
+            print("Job-level income averages drifted, rescoring every employee")
+            stats, full_rescore = new_stats, True
+    
+    job_level_income = pd.Series({int(level): income
+                                  for level, income in stats['job_level_income'].items()})
+    
+    if full_rescore:
+        to_score = current
+    else:
+        to_score = current[current[EMPLOYEE_KEY].isin(delta.rescore_ids)]
+    
+    df_risk = score_attrition_risk(add_attrition_features(to_score.copy(), job_level_income), model)
+    
+    if full_rescore:
+        df_risk.to_csv(export_path, index=False)
+        save_stats(stats, export_path)
+    else:
+        patch_export(export_path, df_risk, delta.removed_ids, current[EMPLOYEE_KEY])
+    
+    print(f"Rescored {len(df_risk)} of {len(current)} employees; "
+          f"risk profiles updated in '{export_path}'")
+    
+    return df_risk
+
+def main(file_path=DEFAULT_DATA_PATH, previous_path=None, model_path='attrition_prediction_model.pkl',
+         use_feature_store=True, plots='render', plot_data_path='attrition_plot_data.pkl',
+         plot_jobs=-1, use_preprocessing_cache=True, model_jobs=-1, search='grid',
+         search_resource='n_samples', boosting_backend='gradient_boosting', use_cv_cache=True,
+         online=False, online_update_path=None, online_model_path='attrition_online_model.pkl',
+         matrix_format='auto', encoder='onehot'):
+    """Main function to run the attrition prediction pipeline"""
+    print("=" * 80)
+    print("TALENT ANALYTICS: EMPLOYEE ATTRITION PREDICTION")
+    print("=" * 80)
+    
+    # Incremental mode: rescore only what changed since the previous snapshot
+    if previous_path:
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        update_attrition_risk_profiles(file_path, previous_path, model)
+        return
+    
+    # Online update: learn from a batch of records without retraining
+    if online_update_path:
+        update_online_model(online_update_path, online_model_path)
+        return
+    
+    # Track the memory footprint of the employee dataframe per stage
+    memory_log = []
+    
+    # Figures are rendered at the end of the run in plot_jobs worker processes,
+    # deferred to plot_data_path or skipped
+    figures = FigureBook(plots, n_jobs=plot_jobs)
+    
+    # Load and explore data
+    df = load_and_explore_data(file_path)
+    memory_report(df, 'load', memory_log)
+    
+    # Perform exploratory data analysis
+    df = perform_eda(df, figures)
+    
+    # Engineer features
+    df = engineer_features(df, FeatureStore() if use_feature_store else None)
+    memory_report(df, 'engineer_features', memory_log)
+    
+    # Prepare data for modeling
+    X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(df, matrix_format, encoder)
+    
+    # Build and evaluate models
+    memory = preprocessing_memory() if use_preprocessing_cache else None
+    results, best_model = build_and_evaluate_models(X_train, X_test, y_train, y_test, preprocessor,
+                                                    figures, memory, n_jobs=model_jobs, search=search,
+                                                    search_resource=search_resource, backend=boosting_backend,
+                                                    cv_cache=use_cv_cache)
+    
+    # Train the online model next to the batch models
+    if online:
+        build_online_model(X_train, X_test, y_train, y_test, preprocessor, online_model_path)
+    
+    # Analyze model features with the preprocessor fitted inside the best model
+    preprocessor = best_model.named_steps['preprocessor']
+    analyze_model_features(best_model, X_train, X_test, y_test, preprocessor, figures=figures)
+    
+    # Create attrition risk profiles
+    risk_profiles = create_attrition_risk_profiles(df, best_model, preprocessor)
+    memory_report(risk_profiles, 'risk_profiles', memory_log)
+    
+    print("\nMemory Report:")
+    print(pd.DataFrame(memory_log).to_string(index=False, float_format='{:.2f}'.format))
+    
+    if plots == 'defer':
+        figures.save(plot_data_path)
+    else:
+        figures.close()
+    
+    print("\nAttrition prediction model development completed.")
+    if plots == 'render':
+        print("Results and visualizations have been saved as PNG files.")
+    elif plots == 'defer':
+        print(f"Render the visualizations with: python hr_plots.py {plot_data_path}")
+    print("The model has been saved as 'attrition_prediction_model.pkl'")
+    
+    # Example of how to use the model for prediction
+    print("\nExample of using the model for prediction:")
+    print("""
+    import pickle
+    import pandas as pd
+    
+    # Load the model
+    with open('attrition_prediction_model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    
+    # Prepare new employee data
+    new_employees = pd.DataFrame({
+        'Age': [35, 42, 29],
+        'BusinessTravel': ['Travel_Rarely', 'Travel_Frequently', 'Travel_Rarely'],
+        'DailyRate': [1102, 857, 1200],
+        'Department': ['Sales', 'Research & Development', 'Human Resources'],
+        'DistanceFromHome': [15, 3, 25],
+        # Add all required features...
+    })
+    
+    # Make predictions
+    probabilities = model.predict_proba(new_employees)[:, 1]
+    
+    # Create risk categories
+    risk_categories = ['Low Risk' if p < 0.3 else 'Medium Risk' if p < 0.6 else 'High Risk' 
+                      for p in probabilities]
+    
+    # Display results
+    for i, (prob, risk) in enumerate(zip(probabilities, risk_categories)):
+        print(f"Employee {i+1}: {prob:.2%} probability of attrition - {risk}")
+    """)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Employee attrition prediction pipeline")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to train on or score")
+    parser.add_argument('--previous',
+                        help="previous snapshot; rescore only new and changed employees "
+                             "with the saved model and patch the exported risk profiles")
+    parser.add_argument('--model', default='attrition_prediction_model.pkl',
+                        help="saved model used in incremental mode")
+    parser.add_argument('--no-feature-store', action='store_true',
+                        help="recompute every engineered feature instead of reusing cached columns")
+    parser.add_argument('--plots', choices=PLOT_MODES, default='render',
+                        help="render figures as they are produced, defer them to --plot-data "
+                             "for a later 'python hr_plots.py' run, or skip them")
+    parser.add_argument('--plot-data', default='attrition_plot_data.pkl',
+                        help="plot data file written with --plots defer")
+    parser.add_argument('--plot-jobs', type=int, default=-1,
+                        help="worker processes rendering the figures; -1 uses every core")
+    parser.add_argument('--no-preprocessing-cache', action='store_true',
+                        help="refit the feature and preprocessor steps for every model, fold "
+                             "and hyperparameter setting")
+    parser.add_argument('--model-jobs', type=int, default=-1,
+                        help="cores for training the candidate models and the grid search; "
+                             "-1 uses every core")
+    parser.add_argument('--search', choices=SEARCH_MODES, default='grid',
+                        help="tune the best tree ensemble with an exhaustive grid search, successive "
+                             "halving, or a grid search growing each ensemble with warm start")
+    parser.add_argument('--search-resource', choices=HALVING_RESOURCES, default='n_samples',
+                        help="budget grown by successive halving: training rows or trees")
+    parser.add_argument('--boosting-backend', choices=BOOSTING_BACKENDS, default='gradient_boosting',
+                        help="gradient boosting candidate: GradientBoostingClassifier on one-hot columns, or "
+                             "HistGradientBoostingClassifier with native categoricals and early stopping")
+    parser.add_argument('--no-cv-cache', action='store_true',
+                        help="refit every cross-validation fold instead of reusing the out-of-fold "
+                             "predictions stored by earlier runs")
+    parser.add_argument('--online', action='store_true',
+                        help="also train the online SGD model on mini-batches and save it to --online-model")
+    parser.add_argument('--online-update', metavar='BATCH',
+                        help="update the saved online model with a CSV batch of employee records "
+                             "and their outcomes, without retraining")
+    parser.add_argument('--online-model', default='attrition_online_model.pkl',
+                        help="online model trained with --online and updated with --online-update")
+    parser.add_argument('--matrix-format', choices=MATRIX_FORMATS, default='auto',
+                        help="keep the one-hot encoded matrix sparse through training ('sparse'), densify "
+                             "it ('dense'), or let the preprocessor decide by density ('auto')")
+    parser.add_argument('--encoder', choices=CATEGORICAL_ENCODERS, default='onehot',
+                        help="encoding of the categorical columns: one column per category, or a fixed "
+                             "width with feature hashing, cross-fitted target encoding or frequency encoding")
+    args = parser.parse_args()
+    
+    main(args.data, previous_path=args.previous, model_path=args.model,
+         use_feature_store=not args.no_feature_store, plots=args.plots, plot_data_path=args.plot_data,
+         plot_jobs=args.plot_jobs, use_preprocessing_cache=not args.no_preprocessing_cache,
+         model_jobs=args.model_jobs, search=args.search, search_resource=args.search_resource,
+         boosting_backend=args.boosting_backend, use_cv_cache=not args.no_cv_cache, online=args.online,
+         online_update_path=args.online_update, online_model_path=args.online_model,
+         matrix_format=args.matrix_format, encoder=args.encoder)
\ No newline at end of file
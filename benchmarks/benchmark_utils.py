@@ -0,0 +1,28 @@
+"""
+Benchmark Utilities
+-------------------
+Helpers shared by the benchmark scripts, which import this module from their
+own directory.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def resample(df, n_rows, seed=42):
+    """Draw `n_rows` employees with replacement, keeping the compact dtypes"""
+    idx = np.random.default_rng(seed).integers(0, len(df), n_rows)
+    return pd.DataFrame({col: df[col].take(idx).reset_index(drop=True) for col in df.columns})
+
+
+# Synthetic high-cardinality attributes added by add_high_cardinality_columns
+HIGH_CARDINALITY_COLUMNS = ['Location', 'Manager']
+
+
+def add_high_cardinality_columns(df, cardinality, seed=42):
+    """Random Location and Manager attributes with `cardinality` values each"""
+    rng = np.random.default_rng(seed)
+    for col in HIGH_CARDINALITY_COLUMNS:
+        codes = rng.integers(0, cardinality, len(df))
+        df[col] = pd.Categorical.from_codes(codes, [f'{col}{i:06d}' for i in range(cardinality)])
+    return df
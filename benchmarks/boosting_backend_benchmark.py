@@ -0,0 +1,113 @@
+"""
+Benchmark: Gradient Boosting Backends
+-------------------------------------
+Compares the gradient boosting backends of hr_models.boosting_steps in the
+attrition or retention pipeline: fit time, predict latency for a batch and
+for a single employee, and test AUC, at 1k, 100k and 1M training rows.
+Training sets are resampled from the IBM training split; the test AUC is
+measured on the held-out IBM employees. Resampled training sets repeat each
+employee many times, so the validation split used for early stopping holds
+copies of training rows and the histogram backend tends to run to its
+iteration limit; fit times are the figure of merit at the larger sizes.
+
+Run from the repository root:
+
+    python benchmarks/boosting_backend_benchmark.py [--pipeline retention] [--rows 1000 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import resample  # noqa: E402
+from attrition_prediction import candidate_models, prepare_data_for_modeling  # noqa: E402
+from hr_data import DEFAULT_DATA_PATH, MODEL_COLUMNS, load_hr_data  # noqa: E402
+from hr_features import add_attrition_features  # noqa: E402
+from hr_models import BOOSTING_BACKENDS  # noqa: E402
+import retention_decision  # noqa: E402
+
+# Employees scored per batch when timing predictions
+BATCH_ROWS = 10_000
+
+
+def pipeline_data(df, pipeline_name):
+    """Training and test split, and a function building the pipeline for a backend"""
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    with contextlib.redirect_stdout(io.StringIO()):
+        if pipeline_name == 'attrition':
+            X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(add_attrition_features(df))
+            return X_train, X_test, y_train, y_test, \
+                lambda backend: candidate_models(preprocessor, backend=backend)['Gradient Boosting']
+
+        df = retention_decision.create_decision_labels(retention_decision.engineer_features(df))
+    X = df.drop(retention_decision.NON_FEATURE_COLUMNS, axis=1, errors='ignore')
+    y = df['RetentionDecision']
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+    return X_train, X_test, y_train, y_test, lambda backend: retention_decision.retention_pipeline(X, backend=backend)
+
+
+def main(pipeline_name, rows, file_path=DEFAULT_DATA_PATH):
+    df, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    X_train, X_test, y_train, y_test, make_pipeline = pipeline_data(df, pipeline_name)
+    batch = resample(X_test, BATCH_ROWS)
+    single = X_test.iloc[:1]
+
+    results = []
+    for n_rows in rows:
+        train = resample(X_train.assign(**{y_train.name: y_train}), n_rows)
+        X, y = train.drop(columns=y_train.name), train[y_train.name]
+
+        for backend in BOOSTING_BACKENDS:
+            model = make_pipeline(backend)
+            start = time.perf_counter()
+            model.fit(X, y)
+            fit_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            model.predict_proba(batch)
+            batch_time = time.perf_counter() - start
+
+            single_times = []
+            for _ in range(20):
+                start = time.perf_counter()
+                model.predict_proba(single)
+                single_times.append(time.perf_counter() - start)
+
+            classifier = model.named_steps['classifier']
+            results.append({
+                'Training rows': n_rows,
+                'Backend': backend,
+                'Iterations': getattr(classifier, 'n_iter_', None) or classifier.n_estimators_,
+                'Fit (s)': fit_time,
+                'Predict (ms / 1k rows)': batch_time * 1000 / (BATCH_ROWS / 1000),
+                'Predict 1 employee (ms)': np.median(single_times) * 1000,
+                'Test AUC': roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+            })
+            print(f"{n_rows} rows, {backend}: fit {fit_time:.1f} s", flush=True)
+            del model
+        del train, X, y
+
+    print()
+    print(pd.DataFrame(results).to_string(index=False, float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the gradient boosting backends")
+    parser.add_argument('--pipeline', choices=['attrition', 'retention'], default='attrition',
+                        help="pipeline whose gradient boosting model is benchmarked")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000],
+                        help="training set sizes to benchmark")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to resample")
+    args = parser.parse_args()
+
+    main(args.pipeline, args.rows, args.data)
@@ -0,0 +1,89 @@
+"""
+Benchmark: Categorical Encoders
+-------------------------------
+Compares the categorical encoders of the attrition preprocessor
+(prepare_data_for_modeling(df, encoder=...)) when the workforce has
+high-cardinality attributes: synthetic Location and Manager columns with the
+given number of distinct values are added to the IBM training split,
+resampled to the given size. For each encoder and model the benchmark
+reports the width of the feature matrix, the fit time, the size of the
+pickled model and the test AUC on the held-out IBM employees.
+
+Run from the repository root:
+
+    python benchmarks/categorical_encoder_benchmark.py [--rows 20000] [--cardinality 1000 10000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import pickle
+import sys
+import time
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import add_high_cardinality_columns, resample  # noqa: E402
+from attrition_prediction import candidate_models, prepare_data_for_modeling  # noqa: E402
+from hr_data import DEFAULT_DATA_PATH, MODEL_COLUMNS, load_hr_data  # noqa: E402
+from hr_encoders import CATEGORICAL_ENCODERS  # noqa: E402
+from hr_features import add_attrition_features  # noqa: E402
+
+
+def main(rows, cardinalities, model_names, file_path=DEFAULT_DATA_PATH):
+    df, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    df = add_attrition_features(df)
+
+    results = []
+    for cardinality in cardinalities:
+        for encoder in CATEGORICAL_ENCODERS:
+            with contextlib.redirect_stdout(io.StringIO()):
+                X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(
+                    add_high_cardinality_columns(df.copy(), cardinality), encoder=encoder)
+            # The resampled training employees get attributes drawn from
+            # every category, not only from those of the IBM employees
+            train = resample(X_train.assign(AttritionBinary=y_train), rows)
+            train = add_high_cardinality_columns(train, cardinality, seed=7)
+            X, y = train.drop(columns='AttritionBinary'), train['AttritionBinary']
+            models = candidate_models(preprocessor)
+
+            for name in model_names:
+                model = models[name]
+                start = time.perf_counter()
+                model.fit(X, y)
+                fit_time = time.perf_counter() - start
+                results.append({
+                    'Categories per column': cardinality,
+                    'Encoder': encoder,
+                    'Model': name,
+                    'Matrix width': model[:-1].transform(X_test.iloc[:1]).shape[1],
+                    'Fit (s)': fit_time,
+                    'Model size (MB)': len(pickle.dumps(model)) / 1024 ** 2,
+                    'Test AUC': roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+                })
+                print(f"{cardinality} categories, {encoder}, {name}: {fit_time:.1f} s", flush=True)
+                del model
+            del models, train, X, y
+
+    print()
+    print(pd.DataFrame(results).to_string(index=False, float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the categorical encoders")
+    parser.add_argument('--rows', type=int, default=20_000,
+                        help="training employees resampled from the IBM training split")
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[1_000, 10_000],
+                        help="distinct values of each synthetic Location and Manager column")
+    parser.add_argument('--models', nargs='+', default=['Logistic Regression', 'Gradient Boosting'],
+                        choices=['Logistic Regression', 'Random Forest', 'Gradient Boosting'],
+                        help="candidate models to fit")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to resample")
+    args = parser.parse_args()
+
+    main(args.rows, args.cardinality, args.models, args.data)
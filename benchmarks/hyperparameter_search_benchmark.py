@@ -0,0 +1,110 @@
+"""
+Benchmark: Hyperparameter Search
+--------------------------------
+Times the hyperparameter searches of the attrition pipeline (Random Forest
+and Gradient Boosting grids) and of the retention pipeline, run as the
+exhaustive grid search, as successive halving over training rows and over
+trees or boosting stages, and as the warm start search, and reports the number of fits, the best
+cross-validated AUC and the test AUC of the selected model. Larger
+workforces are simulated by resampling the training split of the IBM
+dataset; the test AUC is always measured on the held-out IBM employees.
+
+Run from the repository root:
+
+    python benchmarks/hyperparameter_search_benchmark.py [--rows 10000 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import resample  # noqa: E402
+from attrition_prediction import PARAM_GRIDS, candidate_models, prepare_data_for_modeling  # noqa: E402
+from hr_data import DEFAULT_DATA_PATH, MODEL_COLUMNS, load_hr_data  # noqa: E402
+from hr_features import add_attrition_features  # noqa: E402
+from hr_models import hyperparameter_search  # noqa: E402
+import retention_decision  # noqa: E402
+
+SEARCHES = [('grid', 'n_samples'), ('halving', 'n_samples'), ('halving', 'n_estimators'),
+            ('warm_start', 'n_samples')]
+
+
+def attrition_data(df):
+    """Training and test split and the tuned pipelines of the attrition model"""
+    df = add_attrition_features(df.copy())
+    X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(df)
+    models = candidate_models(preprocessor)
+    return [(f'attrition {name}', models[name], PARAM_GRIDS[name], X_train, X_test, y_train, y_test)
+            for name in PARAM_GRIDS]
+
+
+def retention_data(df):
+    """Training and test split and the tuned pipeline of the retention model"""
+    df = retention_decision.create_decision_labels(retention_decision.engineer_features(df.copy()))
+    X = df.drop(retention_decision.NON_FEATURE_COLUMNS, axis=1, errors='ignore')
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, df['RetentionDecision'], test_size=0.25, random_state=42, stratify=df['RetentionDecision'])
+    return [('retention Gradient Boosting', retention_decision.retention_pipeline(X),
+             retention_decision.PARAM_GRID, X_train, X_test, y_train, y_test)]
+
+
+def main(rows, n_jobs, file_path=DEFAULT_DATA_PATH):
+    df, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    with contextlib.redirect_stdout(io.StringIO()):
+        tasks = attrition_data(df) + retention_data(df)
+
+    results = []
+    for size in rows or [None]:
+        for model_name, pipeline, param_grid, X_train, X_test, y_train, y_test in tasks:
+            if size is not None:
+                train = resample(X_train.assign(**{y_train.name: y_train}), size)
+                X_train, y_train = train.drop(columns=y_train.name), train[y_train.name]
+            n_rows = len(X_train)
+
+            for search, resource in SEARCHES:
+                searcher = hyperparameter_search(pipeline, param_grid, search, resource, n_jobs=n_jobs)
+                start = time.perf_counter()
+                searcher.fit(X_train, y_train)
+                elapsed = time.perf_counter() - start
+
+                y_prob = searcher.best_estimator_.predict_proba(X_test)[:, 1]
+                results.append({
+                    'Training rows': n_rows,
+                    'Model': model_name,
+                    'Search': f'halving ({resource})' if search == 'halving' else search,
+                    'Fits': len(searcher.cv_results_['params']) * searcher.n_splits_,
+                    'Time (s)': elapsed,
+                    'Best CV AUC': searcher.best_score_,
+                    'Test AUC': roc_auc_score(y_test, y_prob),
+                    'Best parameters': {key.replace('classifier__', ''): value
+                                        for key, value in searcher.best_params_.items()}
+                })
+                print(f"{n_rows} rows, {model_name}, {results[-1]['Search']}: {elapsed:.1f} s", flush=True)
+
+    table = pd.DataFrame(results)
+    print()
+    print(table.drop(columns='Best parameters').to_string(index=False, float_format='{:.4f}'.format))
+    print("\nSelected hyperparameters:")
+    print(table[['Training rows', 'Model', 'Search', 'Best parameters']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark grid search against successive halving")
+    parser.add_argument('--rows', type=int, nargs='+',
+                        help="training set sizes to benchmark; by default the IBM training split itself")
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="cores the candidate fits run on; -1 uses every core")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to resample")
+    args = parser.parse_args()
+
+    main(args.rows, args.jobs, args.data)
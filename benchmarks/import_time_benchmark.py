@@ -0,0 +1,102 @@
+"""
+Benchmark: Import Time
+----------------------
+Measures the cold start of the pipeline modules with `python -X importtime`,
+each scenario in a fresh interpreter, and reports which heavy plotting and
+explanation libraries were loaded. The scoring scenarios import a pipeline
+module and unpickle its saved model, as an incremental scoring job does.
+
+Run from the repository root:
+
+    python benchmarks/import_time_benchmark.py [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries only needed to draw figures or explain predictions
+HEAVY_LIBRARIES = ['matplotlib', 'seaborn', 'shap']
+
+SCENARIOS = {
+    'import hr_features': "import hr_features",
+    'import attrition_prediction': "import attrition_prediction",
+    'import retention_decision': "import retention_decision",
+    'score with attrition_prediction_model.pkl': (
+        "import pickle, attrition_prediction\n"
+        "with open('attrition_prediction_model.pkl', 'rb') as f:\n"
+        "    pickle.load(f)"),
+    'score with retention_decision_model.pkl': (
+        "import pickle, retention_decision\n"
+        "with open('retention_decision_model.pkl', 'rb') as f:\n"
+        "    pickle.load(f)")
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into one row per imported module
+
+    Returns:
+    --------
+    pd.DataFrame
+        Module name and its own import time in seconds
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        rows.append({'module': name.strip(), 'self': int(self_us) / 1e6})
+    return pd.DataFrame(rows)
+
+
+def run_scenario(code):
+    """Run `code` in a fresh interpreter and return its parsed import times"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def main(repeat, top):
+    results = []
+    for scenario, code in SCENARIOS.items():
+        try:
+            runs = [run_scenario(code) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"Skipping '{scenario}': {e}")
+            continue
+
+        # The fastest run is the least disturbed by the rest of the machine
+        fastest = min(runs, key=lambda run: run['self'].sum())
+        loaded = set(fastest['module'].str.split('.').str[0])
+        results.append({
+            'Scenario': scenario,
+            'Import time (s)': fastest['self'].sum(),
+            'Modules': len(fastest),
+            'Heavy libraries loaded': ', '.join(lib for lib in HEAVY_LIBRARIES if lib in loaded) or '-'
+        })
+
+        print(f"\n{scenario}: slowest packages")
+        packages = fastest.groupby(fastest['module'].str.split('.').str[0])['self'].sum()
+        print(packages.nlargest(top).to_string(float_format='{:.3f}'.format))
+
+    print(f"\nCold start per scenario (best of {repeat} runs):")
+    print(pd.DataFrame(results).to_string(index=False, float_format='{:.3f}'.format))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the pipeline modules")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="fresh interpreters per scenario; the fastest run is reported")
+    parser.add_argument('--top', type=int, default=5,
+                        help="slowest packages listed per scenario")
+    args = parser.parse_args()
+
+    main(args.repeat, args.top)
@@ -0,0 +1,85 @@
+"""
+Benchmark: Online Model Updates
+-------------------------------
+Compares keeping the attrition model current by retraining the batch
+Logistic Regression pipeline on the full history against updating the
+online SGD model (hr_online.OnlineAttritionModel) with a daily batch of
+records. Histories are resampled from the IBM training split; the test AUC
+is measured on the held-out IBM employees after the update.
+
+Run from the repository root:
+
+    python benchmarks/online_update_benchmark.py [--rows 100000 1000000] [--batch 1000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_utils import resample  # noqa: E402
+from attrition_prediction import candidate_models, prepare_data_for_modeling  # noqa: E402
+from hr_data import DEFAULT_DATA_PATH, MODEL_COLUMNS, load_hr_data  # noqa: E402
+from hr_features import add_attrition_features  # noqa: E402
+from hr_online import OnlineAttritionModel  # noqa: E402
+
+
+def main(rows, batch_rows, file_path=DEFAULT_DATA_PATH):
+    df, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    with contextlib.redirect_stdout(io.StringIO()):
+        X_train, X_test, y_train, y_test, preprocessor = prepare_data_for_modeling(add_attrition_features(df))
+    columns = {name: cols for name, _, cols in preprocessor.transformers}
+    labelled = X_train.assign(AttritionBinary=y_train)
+    batch = resample(labelled, batch_rows, seed=7)
+
+    results = []
+    for size in rows:
+        history = resample(labelled, size)
+        X, y = history.drop(columns='AttritionBinary'), history['AttritionBinary']
+
+        # Batch: a full retrain on the history and the day's batch
+        retrain = pd.concat([history, batch], ignore_index=True)
+        model = candidate_models(preprocessor)['Logistic Regression']
+        start = time.perf_counter()
+        model.fit(retrain.drop(columns='AttritionBinary'), retrain['AttritionBinary'])
+        results.append({'History rows': size, 'Model': 'batch Logistic Regression',
+                        'Update': 'full retrain', 'Time (s)': time.perf_counter() - start,
+                        'Test AUC': roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])})
+        del retrain, model
+
+        # Online: trained once on the history, then updated with the batch
+        online = OnlineAttritionModel(columns['num'], columns['cat'])
+        start = time.perf_counter()
+        online.fit(X, y, epochs=1)
+        fit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        online.update(batch)
+        results.append({'History rows': size, 'Model': 'online SGD',
+                        'Update': f'{batch_rows}-row batch (initial fit {fit_time:.1f} s)',
+                        'Time (s)': time.perf_counter() - start,
+                        'Test AUC': roc_auc_score(y_test, online.predict_proba(X_test)[:, 1])})
+        print(f"{size} rows done", flush=True)
+        del history, X, y, online
+
+    print()
+    print(pd.DataFrame(results).to_string(index=False, float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark online updates against full retraining")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000],
+                        help="history sizes to benchmark")
+    parser.add_argument('--batch', type=int, default=1_000,
+                        help="employee records in the daily update")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to resample")
+    args = parser.parse_args()
+
+    main(args.rows, args.batch, args.data)
@@ -0,0 +1,228 @@
+"""
+Talent Analytics: Cross-Validation Folds
+----------------------------------------
+This module provides the cross-validation folds shared by the model
+evaluation and hyperparameter search stages. FoldManager defines the
+stratified splits of a training set once, and keeps the out-of-fold
+predicted probabilities of every (model, parameters, fold) it has evaluated
+in an on-disk store. The store is keyed on the training data, the split
+definition, the model parameters and the feature code, so cross-validating a
+model, tuning it over a grid containing its current parameters, stacking its
+out-of-fold predictions or reporting on them fits each fold once, within a
+run and across runs.
+
+Each prediction is stored as soon as its fold fit finishes, so a tuning run
+that is interrupted keeps every completed (setting, fold) fit: restarted on
+the same data, it resumes with the fits that were still missing.
+"""
+
+import hashlib
+import os
+import numpy as np
+from joblib import Parallel, delayed, hash as joblib_hash
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from hr_data import DEFAULT_CACHE_DIR
+from hr_features import column_hash, registry_fingerprint
+from hr_feature_store import FeatureStore
+
+DEFAULT_CV_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'cv')
+DEFAULT_CV_CACHE_BYTES = 256 * 1024 ** 2
+
+DEFAULT_N_SPLITS = 5
+
+
+def data_hash(X, y):
+    """Hash of the column names and values of a training set and its labels"""
+    digest = hashlib.sha256()
+    for col in X.columns:
+        digest.update(str(col).encode())
+        digest.update(column_hash(X[col]).encode())
+    digest.update(column_hash(y).encode())
+    return digest.hexdigest()
+
+
+def model_key(pipeline, params=None):
+    """
+    Hash of an unfitted model pipeline with `params` applied
+
+    Settings that do not change the predictions (the preprocessing cache and
+    the core counts) are left out, so the same model run sequentially, in
+    parallel or with a cache has one key.
+    """
+    model = clone(pipeline).set_params(**(params or {}))
+    model.set_params(**{name: None for name in model.get_params()
+                        if name == 'memory' or name.endswith('n_jobs')})
+    return joblib_hash(model)
+
+
+def as_completed(function, tasks, n_jobs=1):
+    """
+    Run `function` over tasks in parallel, yielding results as they finish
+
+    Parameters:
+    -----------
+    function : callable
+        Function run once per task
+    tasks : iterable
+        (task id, argument tuple) pairs
+    n_jobs : int
+        Cores the tasks run on; -1 uses every core
+
+    Returns:
+    --------
+    generator
+        (task id, result) pairs in order of completion
+    """
+    return Parallel(n_jobs=n_jobs, return_as='generator_unordered')(
+        delayed(_tagged)(function, task, args) for task, args in tasks)
+
+
+def _tagged(function, task, args):
+    return task, function(*args)
+
+
+def fit_fold(pipeline, params, X, y, train, test):
+    """Fit a pipeline on the training rows of a fold and predict the test rows"""
+    model = clone(pipeline).set_params(**params)
+    model.fit(X.iloc[train], y.iloc[train])
+    return model.predict_proba(X.iloc[test])[:, 1]
+
+
+class FoldManager:
+    """
+    Stratified cross-validation folds of a training set, with cached
+    out-of-fold predictions
+
+    Parameters:
+    -----------
+    X, y : pd.DataFrame, pd.Series
+        Training data
+    n_splits : int
+        Number of folds
+    random_state : int
+        Seed of the shuffle before splitting
+    store : FeatureStore, optional
+        Store of the out-of-fold predictions; a FeatureStore under
+        DEFAULT_CV_CACHE_DIR by default; False keeps the predictions in
+        memory only
+
+    Attributes:
+    -----------
+    splits : list
+        (train, test) row positions per fold; usable as the cv argument of
+        scikit-learn searches
+    data_key : str
+        Hash of the training data and of the split definition
+    fits, reused : int
+        Fold fits run, and fold predictions reused, since creation
+    """
+
+    def __init__(self, X, y, n_splits=DEFAULT_N_SPLITS, random_state=42, store=None):
+        self.X = X
+        self.y = y
+        self.splits = list(StratifiedKFold(n_splits, shuffle=True, random_state=random_state).split(X, y))
+        self.data_key = hashlib.sha256(
+            f"{data_hash(X, y)}-{n_splits}-{random_state}".encode()).hexdigest()
+        if store is None:
+            store = FeatureStore(DEFAULT_CV_CACHE_DIR, DEFAULT_CV_CACHE_BYTES)
+        self.store = store or None
+        self.fits = 0
+        self.reused = 0
+        self._cache = {}
+
+    @property
+    def n_splits(self):
+        return len(self.splits)
+
+    def key(self, pipeline, params=None):
+        """Store key of the out-of-fold predictions of a model on these folds"""
+        return hashlib.sha256(
+            f"{self.data_key}-{registry_fingerprint()}-{model_key(pipeline, params)}".encode()).hexdigest()
+
+    def get(self, key, fold):
+        """Stored test-row probabilities of a model on a fold, or None"""
+        proba = self._cache.get((key, fold))
+        if proba is None and self.store is not None:
+            proba = self.store.get(f'fold{fold}', key)
+            if proba is not None and len(proba) != len(self.splits[fold][1]):
+                proba = None
+        if proba is not None:
+            self._cache[key, fold] = proba
+            self.reused += 1
+        return proba
+
+    def put(self, key, fold, proba):
+        """Store the test-row probabilities of a model on a fold"""
+        self._cache[key, fold] = proba
+        if self.store is not None:
+            self.store.put(f'fold{fold}', key, proba)
+
+    def fold_predictions(self, pipeline, param_sets=None, n_jobs=1):
+        """
+        Out-of-fold predicted probabilities for one or more parameter settings
+
+        Parameters:
+        -----------
+        pipeline : Pipeline
+            Model pipeline; fitted or not, only its parameters are used
+        param_sets : list of dict, optional
+            Parameter settings applied to the pipeline; by default the
+            pipeline as it is
+        n_jobs : int
+            Cores the missing fold fits run on; -1 uses every core
+
+        Returns:
+        --------
+        list
+            Per parameter setting, the list of test-row probabilities per fold
+        """
+        param_sets = param_sets or [{}]
+        keys = [self.key(pipeline, params) for params in param_sets]
+        predictions = [[self.get(key, fold) for fold in range(self.n_splits)] for key in keys]
+
+        missing = [(i, fold) for i, folds in enumerate(predictions)
+                   for fold, proba in enumerate(folds) if proba is None]
+        tasks = [((i, fold), (pipeline, param_sets[i], self.X, self.y, *self.splits[fold]))
+                 for i, fold in missing]
+        for (i, fold), proba in as_completed(fit_fold, tasks, n_jobs):
+            self.put(keys[i], fold, proba)
+            predictions[i][fold] = proba
+            self.fits += 1
+        return predictions
+
+    def fold_scores(self, pipeline, param_sets=None, n_jobs=1):
+        """
+        ROC AUC per fold for one or more parameter settings
+
+        Returns:
+        --------
+        np.ndarray
+            Scores of shape (parameter setting, fold), or (fold,) when
+            `param_sets` is not given
+        """
+        scores = np.array([[self.score(proba, fold) for fold, proba in enumerate(folds)]
+                           for folds in self.fold_predictions(pipeline, param_sets, n_jobs)])
+        return scores if param_sets else scores[0]
+
+    def score(self, proba, fold):
+        """ROC AUC of test-row probabilities on a fold"""
+        return roc_auc_score(self.y.iloc[self.splits[fold][1]], proba)
+
+    def oof_predictions(self, pipeline, params=None, n_jobs=1):
+        """
+        Out-of-fold predicted probability of every training row, for stacking
+        or reporting
+
+        Returns:
+        --------
+        np.ndarray
+            Probability of each row of X, predicted by the model fitted on the
+            folds not containing it
+        """
+        oof = np.empty(len(self.y))
+        folds = self.fold_predictions(pipeline, [params or {}], n_jobs)[0]
+        for (_, test), proba in zip(self.splits, folds):
+            oof[test] = proba
+        return oof
@@ -0,0 +1,387 @@
+"""
+Talent Analytics: HR Data Layer
+-------------------------------
+This module provides the shared loading utilities for the IBM HR attrition
+dataset used by the attrition prediction and retention decision models.
+Exports are read in chunks with a compact dtype schema so that large HRIS
+extracts load within a fixed memory budget, and the parsed result is cached
+as Parquet so later runs skip CSV parsing altogether.
+"""
+
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow  # noqa: F401 - Parquet engine for the columnar cache
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+DEFAULT_DATA_PATH = 'PROJECT AND DATASET IN HERE/WA_Fn-UseC_-HR-Employee-Attrition.csv'
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_CACHE_DIR = '.hr_cache'
+
+# Bump whenever HR_DTYPES or their parsing changes so that stale Parquet
+# caches are not reused
+SCHEMA_VERSION = 2
+
+# Compact dtypes for the IBM attrition schema: small integers for the ordinal
+# survey scores and year counts, categoricals for the text attributes. The
+# integer dtypes are the narrowest a column is stored in: columns whose values
+# do not fit are widened, and columns with blanks become float (see
+# downcast_column).
+HR_DTYPES = {
+    'Age': 'int8',
+    'Attrition': 'category',
+    'BusinessTravel': 'category',
+    'DailyRate': 'int16',
+    'Department': 'category',
+    'DistanceFromHome': 'int8',
+    'Education': 'int8',
+    'EducationField': 'category',
+    'EmployeeCount': 'int8',
+    'EmployeeNumber': 'int32',
+    'EnvironmentSatisfaction': 'int8',
+    'Gender': 'category',
+    'HourlyRate': 'int16',
+    'JobInvolvement': 'int8',
+    'JobLevel': 'int8',
+    'JobRole': 'category',
+    'JobSatisfaction': 'int8',
+    'MaritalStatus': 'category',
+    'MonthlyIncome': 'int32',
+    'MonthlyRate': 'int32',
+    'NumCompaniesWorked': 'int8',
+    'Over18': 'category',
+    'OverTime': 'category',
+    'PercentSalaryHike': 'int8',
+    'PerformanceRating': 'int8',
+    'RelationshipSatisfaction': 'int8',
+    'StandardHours': 'int8',
+    'StockOptionLevel': 'int8',
+    'TotalWorkingYears': 'int8',
+    'TrainingTimesLastYear': 'int8',
+    'WorkLifeBalance': 'int8',
+    'YearsAtCompany': 'int8',
+    'YearsInCurrentRole': 'int8',
+    'YearsSinceLastPromotion': 'int8',
+    'YearsWithCurrManager': 'int8'
+}
+
+# Compact dtypes for the target and the engineered features of both
+# pipelines: float32 for ratios and scores, int8 for flags and small counts.
+# CTC stays float64 because it is summed into company-wide cost totals.
+FEATURE_DTYPES = {
+    'AttritionBinary': 'int8',
+    'SalaryToJobLevelRatio': 'float32',
+    'PromotionRisk': 'float32',
+    'CommuteDifficulty': 'float32',
+    'RelativeCompensation': 'float32',
+    'WorkLifeImbalance': 'int8',
+    'GrowthOpportunityIndex': 'float32',
+    'JobEngagement': 'int8',
+    'SatisfactionComposite': 'float32',
+    'CareerAdvancementRatio': 'float32',
+    'OvertimeDistanceRisk': 'float32',
+    'CTC': 'float64',
+    'PerformanceRisk': 'float32',
+    'RetentionPriorityScore': 'float32',
+    'CriticalRole': 'int8',
+    'EngagementScore': 'float32',
+    'CareerGrowthPotential': 'float32',
+    'ProductivityCostRatio': 'float32',
+    'RetentionDecision': 'int8'
+}
+
+# Columns that hold the same value for every employee in the IBM export and
+# are never used by either model
+CONSTANT_COLUMNS = ['EmployeeCount', 'StandardHours', 'Over18']
+
+# Columns read by the attrition and retention pipelines
+MODEL_COLUMNS = [col for col in HR_DTYPES if col not in CONSTANT_COLUMNS]
+
+
+class DataSummary:
+    """
+    Running summary of an HR dataset, accumulated one chunk at a time
+
+    Attributes:
+    -----------
+    n_rows : int
+        Number of employees seen so far
+    columns : list
+        Column names of the dataset
+    attrition_counts : pd.Series
+        Employee counts per Attrition value
+    missing_values : pd.Series
+        Missing value counts per column
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.columns = []
+        self.attrition_counts = pd.Series(dtype='int64')
+        self.missing_values = pd.Series(dtype='int64')
+
+    def update(self, chunk):
+        """Add the statistics of one chunk to the summary"""
+        if not self.columns:
+            self.columns = chunk.columns.tolist()
+
+        self.n_rows += len(chunk)
+
+        if 'Attrition' in chunk.columns:
+            counts = chunk['Attrition'].value_counts()
+            self.attrition_counts = self.attrition_counts.add(counts, fill_value=0).astype('int64')
+
+        self.missing_values = self.missing_values.add(chunk.isnull().sum(), fill_value=0).astype('int64')
+        return self
+
+    @property
+    def attrition_pct(self):
+        """Share of employees per Attrition value, in percent"""
+        return self.attrition_counts / max(self.n_rows, 1) * 100
+
+
+def downcast_column(values, dtype):
+    """
+    Cast a column to its declared dtype without losing values
+
+    Integer dtypes are checked against the range of the values first: a
+    column that does not fit is stored in the narrowest integer dtype that
+    holds it, and a column with missing or fractional values becomes float,
+    where the blanks stay NaN. Text in a numeric column raises a ValueError.
+
+    Parameters:
+    -----------
+    values : pd.Series
+        The parsed column
+    dtype : str
+        Its declared dtype
+
+    Returns:
+    --------
+    pd.Series
+        The column in the declared dtype, or in the dtype that holds it
+    """
+    if dtype == 'category' or not np.issubdtype(np.dtype(dtype), np.integer):
+        return values.astype(dtype)
+
+    try:
+        values = pd.to_numeric(values)
+    except ValueError as error:
+        raise ValueError(f"Column {values.name!r} is declared {dtype} but holds text: {error}") from error
+    if values.isna().any() or not (values == values.round()).all():
+        return pd.to_numeric(values, downcast='float')
+
+    limits = np.iinfo(dtype)
+    if len(values) == 0 or (limits.min <= values.min() and values.max() <= limits.max):
+        return values.astype(dtype)
+    return pd.to_numeric(values, downcast='integer')
+
+
+def apply_schema(df):
+    """
+    Cast the known columns of a dataframe to their declared compact dtypes
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        HR data, raw or with engineered features
+
+    Returns:
+    --------
+    pd.DataFrame
+        The same dataframe with HR_DTYPES and FEATURE_DTYPES applied
+    """
+    schema = {**HR_DTYPES, **FEATURE_DTYPES}
+    for col in df.columns:
+        dtype = schema.get(col)
+        # 'category' never equals a concrete CategoricalDtype, so skip those
+        # explicitly to keep the categories that are already there
+        if dtype is None or (dtype == 'category' and isinstance(df[col].dtype, pd.CategoricalDtype)):
+            continue
+        if df[col].dtype != dtype:
+            df[col] = downcast_column(df[col], dtype)
+    return df
+
+
+def memory_report(df, stage, report=None):
+    """
+    Print and record the deep memory footprint of a dataframe at a pipeline stage
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The dataframe to measure
+    stage : str
+        Name of the pipeline stage
+    report : list, optional
+        List the measurement is appended to, for a summary at the end of a run
+
+    Returns:
+    --------
+    dict
+        The stage, shape and memory usage of the dataframe
+    """
+    total_bytes = int(df.memory_usage(deep=True).sum())
+    entry = {
+        'Stage': stage,
+        'Employees': df.shape[0],
+        'Columns': df.shape[1],
+        'Memory (MB)': total_bytes / 1024 ** 2,
+        'Bytes per Employee': total_bytes / max(df.shape[0], 1)
+    }
+
+    print(f"Memory after {stage}: {entry['Memory (MB)']:.2f} MB "
+          f"({entry['Bytes per Employee']:.0f} bytes per employee)")
+
+    if report is not None:
+        report.append(entry)
+    return entry
+
+
+def iter_hr_chunks(file_path=DEFAULT_DATA_PATH, chunksize=DEFAULT_CHUNK_SIZE, columns=None):
+    """
+    Stream the HR dataset from CSV in chunks with the compact dtype schema
+
+    Numeric columns are parsed at full width and then downcast chunk by chunk
+    with downcast_column, so out-of-range values and blanks are kept instead
+    of overflowing or failing the read.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the HR attrition dataset
+    chunksize : int
+        Number of rows per chunk
+    columns : list, optional
+        Subset of columns to read
+
+    Yields:
+    -------
+    pd.DataFrame
+        Chunks of at most `chunksize` employees
+    """
+    dtypes = {col: dtype for col, dtype in HR_DTYPES.items()
+              if columns is None or col in columns}
+    categorical = {col: dtype for col, dtype in dtypes.items() if dtype == 'category'}
+
+    with pd.read_csv(file_path, usecols=columns, dtype=categorical, chunksize=chunksize) as reader:
+        for chunk in reader:
+            for col, dtype in dtypes.items():
+                if dtype != 'category' and col in chunk:
+                    chunk[col] = downcast_column(chunk[col], dtype)
+            yield chunk
+
+
+def concat_chunks(chunks):
+    """
+    Concatenate chunks into one frame, keeping categorical columns categorical
+
+    Parameters:
+    -----------
+    chunks : list of pd.DataFrame
+        Chunks produced by iter_hr_chunks
+
+    Returns:
+    --------
+    pd.DataFrame
+        The combined dataframe with a fresh RangeIndex
+    """
+    if not chunks:
+        return pd.DataFrame()
+
+    if len(chunks) > 1:
+        # Each chunk only knows the categories it has seen, so align them on the
+        # union first; otherwise pd.concat falls back to object dtype
+        for col, dtype in chunks[0].dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                categories = union_categoricals([chunk[col] for chunk in chunks],
+                                                sort_categories=True).categories
+                for chunk in chunks:
+                    chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def file_hash(file_path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(file_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Location of the Parquet copy of a CSV export
+
+    The name is derived from the CSV's content hash and SCHEMA_VERSION, so an
+    edited export or a schema change never hits a stale cache entry.
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{file_hash(file_path)[:16]}-v{SCHEMA_VERSION}.parquet")
+
+
+def load_hr_data(file_path=DEFAULT_DATA_PATH, chunksize=DEFAULT_CHUNK_SIZE, columns=None,
+                 use_cache=True, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Load the HR dataset chunk by chunk and summarize it along the way
+
+    When Parquet support is available the parsed dataset is cached under
+    `cache_dir` on first load, and later loads read only the requested
+    columns from that cache instead of parsing the CSV again.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the HR attrition dataset
+    chunksize : int
+        Number of rows per chunk
+    columns : list, optional
+        Subset of columns to read
+    use_cache : bool
+        Whether to read from and populate the Parquet cache
+    cache_dir : str
+        Directory holding the Parquet cache
+
+    Returns:
+    --------
+    tuple
+        The loaded dataframe and its DataSummary
+    """
+    parquet_path = cache_path(file_path, cache_dir) if use_cache and HAS_PARQUET else None
+
+    if parquet_path and os.path.exists(parquet_path):
+        df = pd.read_parquet(parquet_path, columns=columns)
+        print(f"Loaded cached dataset from {parquet_path}")
+        return df, DataSummary().update(df)
+
+    summary = DataSummary()
+    chunks = []
+
+    # Populating the cache needs every column so it can serve any projection
+    read_columns = None if parquet_path else columns
+    for chunk in iter_hr_chunks(file_path, chunksize=chunksize, columns=read_columns):
+        summary.update(chunk)
+        chunks.append(chunk)
+
+    df = concat_chunks(chunks)
+
+    if parquet_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = parquet_path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        print(f"Cached parsed dataset to {parquet_path}")
+
+        if columns is not None:
+            df = df[columns]
+            summary = DataSummary().update(df)
+
+    return df, summary
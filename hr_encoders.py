@@ -0,0 +1,125 @@
+"""
+Talent Analytics: Categorical Encoders
+--------------------------------------
+This module provides the encoders the model preprocessors can apply to the
+categorical HR columns. One-hot encoding adds a column per category, so the
+width of the feature matrix, the fit time and the size of the saved model
+grow with the number of cost centers, locations or managers. The other
+encoders keep the width fixed whatever the number of categories:
+
+- 'hashing' hashes every column=value pair into a fixed number of columns
+- 'target' replaces each category by its smoothed attrition rate, cross-fitted
+  on the training data so no employee's own outcome leaks into its encoding
+- 'frequency' replaces each category by its share of the training employees
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import OneHotEncoder, TargetEncoder
+from sklearn.utils.validation import check_is_fitted
+
+CATEGORICAL_ENCODERS = ('onehot', 'hashing', 'target', 'frequency')
+
+# Columns the hashing encoder maps every category into
+DEFAULT_HASH_FEATURES = 1024
+
+
+class HashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Feature hashing of categorical columns into a fixed number of columns
+
+    Each employee's column=value pairs are hashed into `n_features` sparse
+    indicator columns; categories never seen in training are hashed like
+    any other, and colliding categories share a column.
+
+    Parameters:
+    -----------
+    n_features : int
+        Width of the encoded matrix
+    """
+
+    def __init__(self, n_features=DEFAULT_HASH_FEATURES):
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, 'n_features_in_')
+        X = pd.DataFrame(X)
+        tokens = [(str(col) + '=' + X[col].astype(str)).to_numpy() for col in X.columns]
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string', alternate_sign=False)
+        return hasher.transform(zip(*tokens))
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array([f'hash_{i}' for i in range(self.n_features)], dtype=object)
+
+
+class FrequencyEncoder(BaseEstimator, TransformerMixin):
+    """
+    Share of the training employees in each category of each column
+
+    Categories unseen in training, and missing values, are encoded as 0.
+
+    Attributes:
+    -----------
+    frequencies_ : dict
+        Category share per category, per column
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+        self.frequencies_ = {col: X[col].astype(object).value_counts(normalize=True).to_dict()
+                             for col in X.columns}
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, 'frequencies_')
+        X = pd.DataFrame(X)
+        return np.column_stack([X[col].astype(object).map(self.frequencies_[col]).astype(float).fillna(0.0)
+                                for col in self.feature_names_in_])
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array([f'{col}_frequency' for col in self.feature_names_in_], dtype=object)
+
+
+def categorical_encoder(encoder='onehot', n_features=DEFAULT_HASH_FEATURES, random_state=42):
+    """
+    Unfitted encoder for the categorical columns of a preprocessor
+
+    Parameters:
+    -----------
+    encoder : str or transformer
+        A name from CATEGORICAL_ENCODERS, or an unfitted encoder, which is
+        cloned
+    n_features : int
+        Width of the hashing encoder
+    random_state : int
+        Seed of the cross-fitting folds of the target encoder
+
+    Returns:
+    --------
+    transformer
+        The encoder
+    """
+    if not isinstance(encoder, str):
+        return clone(encoder)
+    if encoder not in CATEGORICAL_ENCODERS:
+        raise ValueError(f"Unknown categorical encoder {encoder!r}; expected one of {CATEGORICAL_ENCODERS}")
+
+    if encoder == 'onehot':
+        return OneHotEncoder(drop='first', handle_unknown='ignore')
+    if encoder == 'hashing':
+        return HashingEncoder(n_features)
+    if encoder == 'target':
+        # fit_transform encodes each training employee with statistics from
+        # the other folds; transform uses the whole training data
+        return TargetEncoder(target_type='binary', random_state=random_state)
+    return FrequencyEncoder()
@@ -0,0 +1,148 @@
+"""
+Talent Analytics: Feature Store
+-------------------------------
+This module provides an on-disk store for engineered feature columns. Each
+column is saved as a .npy file under a key derived from the data it was
+computed from and from the definition of the feature (see
+hr_features.feature_cache_key), so a column is only reused while neither has
+changed. The store is bounded in size and evicts the least recently used
+columns first.
+
+Model pipelines cache their fitted preprocessing steps the same way, through
+the joblib.Memory returned by preprocessing_memory.
+"""
+
+import glob
+import os
+import shutil
+import numpy as np
+from joblib import Memory
+from hr_data import DEFAULT_CACHE_DIR
+from hr_features import registry_fingerprint
+
+DEFAULT_FEATURE_STORE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'features')
+DEFAULT_FEATURE_STORE_BYTES = 512 * 1024 ** 2
+
+DEFAULT_PREPROCESSING_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'preprocessing')
+DEFAULT_PREPROCESSING_CACHE_BYTES = 512 * 1024 ** 2
+
+
+class FeatureStore:
+    """
+    Size-bounded, least recently used on-disk cache of feature columns
+
+    Parameters:
+    -----------
+    store_dir : str
+        Directory holding the cached columns
+    max_bytes : int
+        Total size the store is trimmed to after every write
+
+    Attributes:
+    -----------
+    hits, misses : int
+        Lookups served from and missing in the store since creation
+    """
+
+    def __init__(self, store_dir=DEFAULT_FEATURE_STORE_DIR, max_bytes=DEFAULT_FEATURE_STORE_BYTES):
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name, key):
+        """Location of a cached feature column"""
+        return os.path.join(self.store_dir, f"{name}-{key[:32]}.npy")
+
+    def get(self, name, key):
+        """Load a cached feature column, or None if it is not in the store"""
+        path = self.path(name, key)
+        try:
+            values = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # The modification time doubles as the last access time for eviction
+        os.utime(path)
+        self.hits += 1
+        return values
+
+    def put(self, name, key, values):
+        """Save a feature column and trim the store to `max_bytes`"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self.path(name, key)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(values), allow_pickle=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def entries(self):
+        """Cached columns as (last access time, size, path), least recently used first"""
+        entries = []
+        for path in glob.glob(os.path.join(self.store_dir, '*.npy')):
+            try:
+                entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+            except OSError:
+                continue
+        return sorted(entries)
+
+    def size(self):
+        """Total size of the cached columns in bytes"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used columns until the store fits in `max_bytes`"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Remove every cached column"""
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+def preprocessing_memory(cache_dir=DEFAULT_PREPROCESSING_CACHE_DIR,
+                         max_bytes=DEFAULT_PREPROCESSING_CACHE_BYTES):
+    """
+    Cache of fitted preprocessing steps for Pipeline(memory=...)
+
+    A pipeline given this memory fits its feature and preprocessor steps once
+    per training set: candidate models sharing the steps, and every grid
+    search setting on the same cross-validation fold, reuse the fitted steps
+    and their transformed matrix. joblib keys the entries on the step
+    parameters and the data but not on the feature code, so the cache lives
+    under the fingerprint of the feature registry and caches left by earlier
+    feature definitions are removed.
+
+    Parameters:
+    -----------
+    cache_dir : str
+        Directory holding the cache
+    max_bytes : int
+        Size the cache is trimmed to, least recently used entries first
+
+    Returns:
+    --------
+    joblib.Memory
+        The pipeline memory
+    """
+    fingerprint = registry_fingerprint()[:16]
+    for path in glob.glob(os.path.join(cache_dir, '*')):
+        if os.path.basename(path) != fingerprint:
+            shutil.rmtree(path, ignore_errors=True)
+
+    memory = Memory(os.path.join(cache_dir, fingerprint), verbose=0)
+    memory.reduce_size(bytes_limit=max_bytes)
+    return memory
@@ -0,0 +1,911 @@
+"""
+Talent Analytics: Engineered HR Features
+----------------------------------------
+This module holds the registry of engineered features shared by the attrition
+prediction and retention decision models. Each feature declares the raw
+columns it reads and the features it builds on, so callers can request any
+subset and only what it needs is computed, with shared intermediates computed
+once. The features are also packaged as sklearn transformers that learn their
+population statistics (job-level income averages, the median cost-to-company)
+at fit time, so a pickled model pipeline scores a single employee without the
+rest of the workforce.
+"""
+
+import hashlib
+import inspect
+import json
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+from hr_data import FEATURE_DTYPES, apply_schema
+
+# Role-specific multipliers used in the cost-to-company estimate
+ROLE_MULTIPLIERS = {
+    'Manager': 1.2,
+    'Research Director': 1.3,
+    'Healthcare Representative': 1.15,
+    'Manufacturing Director': 1.25,
+    'Sales Executive': 1.18,
+    'Research Scientist': 1.15,
+    'Laboratory Technician': 1.12,
+    'Human Resources': 1.1,
+    'Sales Representative': 1.15
+}
+DEFAULT_ROLE_MULTIPLIER = 1.1
+
+# Roles that are always considered critical to retain
+CRITICAL_ROLES = ['Research Director', 'Manager', 'Manufacturing Director', 'Healthcare Representative']
+
+# Rows processed per block by the fused feature kernel, small enough for the
+# float64 scratch buffers to stay in cache
+FUSED_BLOCK_SIZE = 65_536
+
+
+def job_level_average_income(df):
+    """
+    Average monthly income per job level, the population statistic
+    behind RelativeCompensation
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+
+    Returns:
+    --------
+    pd.Series
+        Mean MonthlyIncome indexed by JobLevel
+    """
+    return df.groupby('JobLevel', observed=True)['MonthlyIncome'].mean()
+
+
+def calculate_ctc(df, role_multipliers=None, default_role_multiplier=DEFAULT_ROLE_MULTIPLIER):
+    """
+    Calculate annual cost to company including benefits for every employee
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    role_multipliers : dict, optional
+        Multiplier per JobRole; ROLE_MULTIPLIERS when not given
+    default_role_multiplier : float
+        Multiplier for roles missing from the table
+
+    Returns:
+    --------
+    pd.Series
+        Annual CTC per employee
+    """
+    if role_multipliers is None:
+        role_multipliers = ROLE_MULTIPLIERS
+
+    base_annual = df['MonthlyIncome'].to_numpy(dtype=float) * 12
+
+    # Add benefits percentage based on job level
+    benefits_multiplier = 1.0 + (df['JobLevel'].to_numpy(dtype=float) * 0.05)
+
+    # Role-specific multipliers, looked up once per distinct role and broadcast
+    # through the categorical codes (code -1 for a missing role picks the default)
+    roles = df['JobRole'].astype('category')
+    role_lookup = np.array([role_multipliers.get(role, default_role_multiplier)
+                            for role in roles.cat.categories] + [default_role_multiplier])
+    role_multiplier = role_lookup[roles.cat.codes.to_numpy()]
+
+    return pd.Series(base_annual * benefits_multiplier * role_multiplier, index=df.index)
+
+
+class Feature:
+    """
+    An engineered feature in the registry
+
+    Attributes:
+    -----------
+    name : str
+        Column name of the feature
+    func : callable
+        func(df, values, stats) returning the feature values, where `values`
+        holds the already computed dependencies and `stats` the population
+        statistics and settings
+    inputs : tuple
+        Raw HR columns the feature reads
+    depends : tuple
+        Other registered features or intermediates the feature is built from
+    stats : tuple
+        Population statistics the feature needs (see POPULATION_STATS)
+    settings : tuple
+        Feature settings the feature reads from `stats`, such as role_multipliers
+    intermediate : bool
+        Whether the feature is a shared helper that is never added to the frame
+    """
+
+    def __init__(self, name, func, inputs=(), depends=(), stats=(), settings=(), intermediate=False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.depends = tuple(depends)
+        self.stats = tuple(stats)
+        self.settings = tuple(settings)
+        self.intermediate = intermediate
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, inputs={self.inputs}, depends={self.depends})"
+
+
+FEATURE_REGISTRY = {}
+
+
+def register_feature(name, inputs=(), depends=(), stats=(), settings=(), intermediate=False):
+    """Decorator adding a feature function to FEATURE_REGISTRY under `name`"""
+    def decorator(func):
+        FEATURE_REGISTRY[name] = Feature(name, func, inputs, depends, stats, settings, intermediate)
+        return func
+    return decorator
+
+
+# Population statistics, computed from the data the features are fitted on
+POPULATION_STATS = {
+    'job_level_income': lambda df, settings: job_level_average_income(df),
+    'ctc_median': lambda df, settings: float(calculate_ctc(
+        df, settings.get('role_multipliers'),
+        settings.get('default_role_multiplier', DEFAULT_ROLE_MULTIPLIER)).median())
+}
+
+
+# Shared intermediates
+
+@register_feature('_OverTime', inputs=['OverTime'], intermediate=True)
+def _overtime(df, values, stats):
+    return df['OverTime'] == 'Yes'
+
+
+@register_feature('_LogIncome', inputs=['MonthlyIncome'], intermediate=True)
+def _log_income(df, values, stats):
+    return np.log1p(df['MonthlyIncome'])
+
+
+# Attrition prediction features
+
+@register_feature('SalaryToJobLevelRatio', inputs=['MonthlyIncome', 'JobLevel'])
+def salary_to_job_level_ratio(df, values, stats):
+    """Salary to Job Level Ratio (detects underpaid employees)"""
+    return df['MonthlyIncome'] / df['JobLevel']
+
+
+@register_feature('PromotionRisk', inputs=['YearsSinceLastPromotion', 'YearsAtCompany'])
+def promotion_risk(df, values, stats):
+    """Years Without Promotion Risk"""
+    return df['YearsSinceLastPromotion'] / (df['YearsAtCompany'] + 1)
+
+
+@register_feature('CommuteDifficulty', inputs=['DistanceFromHome'], depends=['_LogIncome'])
+def commute_difficulty(df, values, stats):
+    """Commute Difficulty (distance vs salary)"""
+    return df['DistanceFromHome'] / values['_LogIncome']
+
+
+@register_feature('RelativeCompensation', inputs=['MonthlyIncome', 'JobLevel'], stats=['job_level_income'])
+def relative_compensation(df, values, stats):
+    """
+    Compensation Satisfaction Proxy: salary compared to the average salary for
+    the job level. Job levels missing from the statistics fall back to the
+    average over all levels.
+    """
+    job_level_income = stats['job_level_income']
+    job_level_avg_salary = df['JobLevel'].map(job_level_income).astype(float)
+    return df['MonthlyIncome'] / job_level_avg_salary.fillna(job_level_income.mean())
+
+
+@register_feature('WorkLifeImbalance', inputs=['WorkLifeBalance'], depends=['_OverTime'])
+def work_life_imbalance(df, values, stats):
+    """Work-Life Imbalance"""
+    return (df['WorkLifeBalance'] < 3).astype(int) + values['_OverTime'].astype(int)
+
+
+@register_feature('GrowthOpportunityIndex', inputs=['TrainingTimesLastYear', 'YearsSinceLastPromotion'])
+def growth_opportunity_index(df, values, stats):
+    """Growth Opportunity Index"""
+    return (df['TrainingTimesLastYear'] + 1) / (df['YearsSinceLastPromotion'] + 1)
+
+
+@register_feature('JobEngagement', inputs=['JobInvolvement', 'JobSatisfaction'])
+def job_engagement(df, values, stats):
+    """Job Role Engagement: Job Involvement combined with Job Satisfaction"""
+    return df['JobInvolvement'] * df['JobSatisfaction']
+
+
+@register_feature('SatisfactionComposite', inputs=['JobSatisfaction', 'EnvironmentSatisfaction',
+                                                   'RelationshipSatisfaction', 'WorkLifeBalance'])
+def satisfaction_composite(df, values, stats):
+    """Satisfaction Composite Score"""
+    satisfaction_cols = ['JobSatisfaction', 'EnvironmentSatisfaction',
+                         'RelationshipSatisfaction', 'WorkLifeBalance']
+    return df[satisfaction_cols].mean(axis=1)
+
+
+@register_feature('CareerAdvancementRatio', inputs=['JobLevel', 'TotalWorkingYears'])
+def career_advancement_ratio(df, values, stats):
+    """Career Advancement Ratio"""
+    return df['JobLevel'] / (df['TotalWorkingYears'] + 1)
+
+
+@register_feature('OvertimeDistanceRisk', inputs=['DistanceFromHome'], depends=['_OverTime'])
+def overtime_distance_risk(df, values, stats):
+    """OverTime and Distance Combined Risk"""
+    return values['_OverTime'].astype(int) * (1 + (df['DistanceFromHome'] / 10))
+
+
+# Retention decision features
+
+@register_feature('CTC', inputs=['MonthlyIncome', 'JobLevel', 'JobRole'],
+                  settings=['role_multipliers', 'default_role_multiplier'])
+def cost_to_company(df, values, stats):
+    """Cost-to-Company (CTC) Estimation"""
+    return calculate_ctc(df, stats.get('role_multipliers'),
+                         stats.get('default_role_multiplier', DEFAULT_ROLE_MULTIPLIER))
+
+
+@register_feature('PerformanceRisk', inputs=['PerformanceRating', 'YearsSinceLastPromotion', 'WorkLifeBalance'],
+                  depends=['_OverTime'])
+def performance_risk(df, values, stats):
+    """Performance Risk Score (higher = more risky)"""
+    return (5 - df['PerformanceRating']) + \
+           values['_OverTime'] * 2 + \
+           (df['YearsSinceLastPromotion'] > 2) * 1.5 + \
+           (4 - df['WorkLifeBalance']) * 1.5
+
+
+@register_feature('RetentionPriorityScore', inputs=['JobLevel', 'PerformanceRating'], depends=['_LogIncome'])
+def retention_priority_score(df, values, stats):
+    """Retention Priority Score (higher = more valuable to retain)"""
+    return ((df['JobLevel'] + df['PerformanceRating']) / values['_LogIncome']) * 100
+
+
+@register_feature('CriticalRole', inputs=['JobRole', 'JobLevel'])
+def critical_role(df, values, stats):
+    """Critical Role Flag (based on role and level)"""
+    return ((df['JobRole'].isin(CRITICAL_ROLES)) | (df['JobLevel'] >= 4)).astype(int)
+
+
+@register_feature('EngagementScore', inputs=['JobInvolvement', 'EnvironmentSatisfaction', 'JobSatisfaction'])
+def engagement_score(df, values, stats):
+    """Engagement Score"""
+    return (df['JobInvolvement'] * 0.4 +
+            df['EnvironmentSatisfaction'] * 0.3 +
+            df['JobSatisfaction'] * 0.3)
+
+
+@register_feature('CareerGrowthPotential', inputs=['YearsSinceLastPromotion', 'TrainingTimesLastYear',
+                                                   'PerformanceRating'])
+def career_growth_potential(df, values, stats):
+    """Career Growth Potential"""
+    return ((5 - df['YearsSinceLastPromotion']) * 0.4 +
+            df['TrainingTimesLastYear'] * 0.3 +
+            df['PerformanceRating'] * 0.3)
+
+
+@register_feature('ProductivityCostRatio', inputs=['PerformanceRating', 'JobInvolvement'],
+                  depends=['CTC'], stats=['ctc_median'])
+def productivity_cost_ratio(df, values, stats):
+    """Productivity to Cost Ratio (higher = more value for money)"""
+    return (df['PerformanceRating'] * df['JobInvolvement']) / (values['CTC'] / stats['ctc_median'])
+
+
+# Feature sets of the two pipelines, in the order they are added to the frame
+ATTRITION_FEATURES = ['SalaryToJobLevelRatio', 'PromotionRisk', 'CommuteDifficulty',
+                      'RelativeCompensation', 'WorkLifeImbalance', 'GrowthOpportunityIndex',
+                      'JobEngagement', 'SatisfactionComposite', 'CareerAdvancementRatio',
+                      'OvertimeDistanceRisk']
+RETENTION_FEATURES = ['CTC', 'PerformanceRisk', 'RetentionPriorityScore', 'CriticalRole',
+                      'SatisfactionComposite', 'EngagementScore', 'CareerGrowthPotential',
+                      'ProductivityCostRatio']
+
+
+# Features computed by fused_features rather than one registered function at a time
+FUSED_FEATURES = set(ATTRITION_FEATURES) | set(RETENTION_FEATURES)
+
+
+def _category_lookup(series, table_func):
+    """
+    Evaluate a per-category function once per category and broadcast it to
+    every row through the categorical codes; object columns are evaluated
+    row by row
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Code -1 (missing) indexes the appended False
+        table = np.append(table_func(series.cat.categories.to_numpy()), False)
+        return table[series.cat.codes.to_numpy()]
+    return table_func(series.to_numpy())
+
+
+def fused_features(df, names, stats, block_size=FUSED_BLOCK_SIZE):
+    """
+    Compute any subset of the attrition and retention features in one pass
+
+    Each input column is pulled once as an array and the rows are processed
+    in blocks: every requested feature of a block is computed from float64
+    scratch buffers reused across blocks and written straight into
+    preallocated outputs of its declared dtype, or of float64 for integer
+    features read from columns with blanks. Shared intermediates (the
+    OverTime mask, log1p of MonthlyIncome, the job-level average income) are
+    computed once per block. The results match the registered feature
+    functions, which remain the reference definitions.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    names : list
+        Feature names from FUSED_FEATURES
+    stats : dict
+        Population statistics and feature settings, as in compute_features
+    block_size : int
+        Rows per block
+
+    Returns:
+    --------
+    dict
+        Feature name to array
+    """
+    names = set(names)
+    n = len(df)
+
+    inputs = {col for name in names for feature in resolve_features([name]) for col in feature.inputs}
+    cols = {col: df[col].to_numpy() for col in inputs
+            if col not in ('OverTime', 'JobRole')}
+    float_inputs = {col for col, values in cols.items() if values.dtype.kind == 'f'}
+
+    # Integer features read from float columns (blanks load as NaN) are
+    # written as float64 so NaN survives, as in the registered functions;
+    # compute_features downcasts them again when they hold no blanks
+    out = {}
+    for name in names:
+        dtype = FEATURE_DTYPES[name]
+        if np.issubdtype(np.dtype(dtype), np.integer) and \
+                float_inputs & {col for feature in resolve_features([name]) for col in feature.inputs}:
+            dtype = float
+        out[name] = np.empty(n, dtype=dtype)
+
+    overtime = None
+    if 'OverTime' in inputs:
+        overtime = _category_lookup(df['OverTime'], lambda values: values == 'Yes')
+
+    critical_role = None
+    if 'CriticalRole' in names:
+        critical_role = _category_lookup(df['JobRole'], lambda values: np.isin(values, CRITICAL_ROLES))
+
+    ctc = None
+    if names & {'CTC', 'ProductivityCostRatio'}:
+        ctc = calculate_ctc(df, stats.get('role_multipliers'),
+                            stats.get('default_role_multiplier', DEFAULT_ROLE_MULTIPLIER)).to_numpy()
+        if 'CTC' in names:
+            out['CTC'][:] = ctc
+
+    level_income = None
+    if 'RelativeCompensation' in names:
+        # Average income per job level as a table indexed by the level itself;
+        # levels missing from the statistics fall back to the overall average
+        job_level_income = stats['job_level_income']
+        fallback = job_level_income.mean()
+        levels = job_level_income.index.to_numpy().astype(np.int64)
+        job_levels = cols['JobLevel']
+        if 'JobLevel' in float_inputs:
+            job_levels = job_levels[np.isfinite(job_levels)]
+        size = int(max(levels.max(initial=0), job_levels.max(initial=0))) + 1
+        level_income = np.full(size, fallback)
+        level_income[levels[levels >= 0]] = job_level_income.to_numpy(dtype=float)[levels >= 0]
+
+    # Scratch buffers reused for every block
+    scratch_a = np.empty(block_size)
+    scratch_b = np.empty(block_size)
+    log_income = np.empty(block_size)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            rows = slice(start, stop)
+            a, b, log_inc = scratch_a[:stop - start], scratch_b[:stop - start], log_income[:stop - start]
+
+            def col(name):
+                return cols[name][rows]
+
+            if names & {'CommuteDifficulty', 'RetentionPriorityScore'}:
+                np.log1p(col('MonthlyIncome'), out=log_inc, dtype=float)
+
+            if 'SalaryToJobLevelRatio' in names:
+                np.divide(col('MonthlyIncome'), col('JobLevel'), out=a, dtype=float)
+                out['SalaryToJobLevelRatio'][rows] = a
+
+            if 'PromotionRisk' in names:
+                np.add(col('YearsAtCompany'), 1, out=b, dtype=float)
+                np.divide(col('YearsSinceLastPromotion'), b, out=a)
+                out['PromotionRisk'][rows] = a
+
+            if 'CommuteDifficulty' in names:
+                np.divide(col('DistanceFromHome'), log_inc, out=a)
+                out['CommuteDifficulty'][rows] = a
+
+            if 'RelativeCompensation' in names:
+                level = col('JobLevel')
+                in_table = (level >= 0) & (level < len(level_income))
+                if 'JobLevel' in float_inputs:
+                    # Blank and fractional levels are not in the table
+                    in_table &= np.isfinite(level) & (level == np.floor(level))
+                positions = np.where(in_table, level, 0).astype(np.intp)
+                np.copyto(b, np.where(in_table, level_income[positions], fallback))
+                np.divide(col('MonthlyIncome'), b, out=a)
+                out['RelativeCompensation'][rows] = a
+
+            if 'WorkLifeImbalance' in names:
+                target = out['WorkLifeImbalance'][rows]
+                np.less(col('WorkLifeBalance'), 3, out=target, casting='unsafe')
+                target += overtime[rows]
+
+            if 'GrowthOpportunityIndex' in names:
+                np.add(col('TrainingTimesLastYear'), 1, out=a, dtype=float)
+                np.add(col('YearsSinceLastPromotion'), 1, out=b, dtype=float)
+                np.divide(a, b, out=a)
+                out['GrowthOpportunityIndex'][rows] = a
+
+            if 'JobEngagement' in names:
+                np.multiply(col('JobInvolvement'), col('JobSatisfaction'),
+                            out=out['JobEngagement'][rows], casting='unsafe')
+
+            if 'SatisfactionComposite' in names:
+                satisfaction_cols = ['JobSatisfaction', 'EnvironmentSatisfaction',
+                                     'RelationshipSatisfaction', 'WorkLifeBalance']
+                if float_inputs.isdisjoint(satisfaction_cols):
+                    np.add(col('JobSatisfaction'), col('EnvironmentSatisfaction'), out=a, dtype=float)
+                    a += col('RelationshipSatisfaction')
+                    a += col('WorkLifeBalance')
+                    a /= 4
+                else:
+                    # Mean of the scores present, skipping blanks like DataFrame.mean
+                    a[:] = 0
+                    b[:] = 0
+                    for satisfaction_col in satisfaction_cols:
+                        values = col(satisfaction_col)
+                        present = ~np.isnan(values) if satisfaction_col in float_inputs else True
+                        a += np.where(present, values, 0)
+                        b += present
+                    a /= b
+                out['SatisfactionComposite'][rows] = a
+
+            if 'CareerAdvancementRatio' in names:
+                np.add(col('TotalWorkingYears'), 1, out=b, dtype=float)
+                np.divide(col('JobLevel'), b, out=a)
+                out['CareerAdvancementRatio'][rows] = a
+
+            if 'OvertimeDistanceRisk' in names:
+                np.divide(col('DistanceFromHome'), 10, out=a, dtype=float)
+                a += 1
+                a *= overtime[rows]
+                out['OvertimeDistanceRisk'][rows] = a
+
+            if 'PerformanceRisk' in names:
+                np.subtract(5, col('PerformanceRating'), out=a, dtype=float)
+                a += overtime[rows] * 2
+                np.greater(col('YearsSinceLastPromotion'), 2, out=b)
+                b *= 1.5
+                a += b
+                np.subtract(4, col('WorkLifeBalance'), out=b, dtype=float)
+                b *= 1.5
+                a += b
+                out['PerformanceRisk'][rows] = a
+
+            if 'RetentionPriorityScore' in names:
+                np.add(col('JobLevel'), col('PerformanceRating'), out=a, dtype=float)
+                a /= log_inc
+                a *= 100
+                out['RetentionPriorityScore'][rows] = a
+
+            if 'CriticalRole' in names:
+                target = out['CriticalRole'][rows]
+                np.greater_equal(col('JobLevel'), 4, out=target, casting='unsafe')
+                np.logical_or(target, critical_role[rows], out=target, casting='unsafe')
+
+            if 'EngagementScore' in names:
+                np.multiply(col('JobInvolvement'), 0.4, out=a, dtype=float)
+                np.multiply(col('EnvironmentSatisfaction'), 0.3, out=b, dtype=float)
+                a += b
+                np.multiply(col('JobSatisfaction'), 0.3, out=b, dtype=float)
+                a += b
+                out['EngagementScore'][rows] = a
+
+            if 'CareerGrowthPotential' in names:
+                np.subtract(5, col('YearsSinceLastPromotion'), out=a, dtype=float)
+                a *= 0.4
+                np.multiply(col('TrainingTimesLastYear'), 0.3, out=b, dtype=float)
+                a += b
+                np.multiply(col('PerformanceRating'), 0.3, out=b, dtype=float)
+                a += b
+                out['CareerGrowthPotential'][rows] = a
+
+            if 'ProductivityCostRatio' in names:
+                np.multiply(col('PerformanceRating'), col('JobInvolvement'), out=a, dtype=float)
+                np.divide(ctc[rows], stats['ctc_median'], out=b)
+                a /= b
+                out['ProductivityCostRatio'][rows] = a
+
+    return out
+
+
+def resolve_features(names):
+    """
+    Order the requested features and everything they depend on for computation
+
+    Parameters:
+    -----------
+    names : list
+        Registered feature names
+
+    Returns:
+    --------
+    list
+        Feature objects in dependency order, each appearing once
+    """
+    ordered, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name not in FEATURE_REGISTRY:
+            raise KeyError(f"Unknown engineered feature: {name}")
+        if name in visiting:
+            raise ValueError(f"Circular feature dependency involving {name}")
+        visiting.add(name)
+        for dependency in FEATURE_REGISTRY[name].depends:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        ordered.append(FEATURE_REGISTRY[name])
+
+    for name in names:
+        visit(name)
+    return ordered
+
+
+def required_stats(names):
+    """Population statistics needed to compute the requested features"""
+    return sorted({stat for feature in resolve_features(names) for stat in feature.stats})
+
+
+def required_inputs(names):
+    """Raw HR columns read by the requested features"""
+    return sorted({col for feature in resolve_features(names) for col in feature.inputs})
+
+
+def fit_stats(df, names, settings=None):
+    """
+    Compute the population statistics the requested features need from `df`
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset the statistics are learned from
+    names : list
+        Registered feature names
+    settings : dict, optional
+        Feature settings such as role_multipliers
+
+    Returns:
+    --------
+    dict
+        Statistic name to value
+    """
+    settings = settings or {}
+    return {stat: POPULATION_STATS[stat](df, settings) for stat in required_stats(names)}
+
+
+def _helper_functions(func, found=None):
+    """
+    Functions of this module called by `func`, directly, from nested
+    functions or through other helpers, by name
+    """
+    found = {} if found is None else found
+    codes = [func.__code__]
+    while codes:
+        code = codes.pop()
+        codes.extend(const for const in code.co_consts if inspect.iscode(const))
+        for ref in code.co_names:
+            helper = globals().get(ref)
+            if inspect.isfunction(helper) and helper.__module__ == __name__ and ref not in found:
+                found[ref] = helper
+                _helper_functions(helper, found)
+    return found
+
+
+def feature_fingerprint(name):
+    """
+    Hash of the definition of a feature and of everything it is built from
+
+    The source of each feature function in the dependency chain is hashed,
+    together with the fused kernel for the features it computes and every
+    module-level helper these call (such as calculate_ctc or
+    _category_lookup), so editing any formula changes the fingerprint.
+    """
+    digest = hashlib.sha256()
+    for feature in resolve_features([name]):
+        digest.update(feature.name.encode())
+        roots = [feature.func]
+        if feature.name in FUSED_FEATURES:
+            roots.append(fused_features)
+        helpers = {}
+        for root in roots:
+            _helper_functions(root, helpers)
+        for func in roots + [helpers[ref] for ref in sorted(helpers) if helpers[ref] not in roots]:
+            try:
+                digest.update(inspect.getsource(func).encode())
+            except OSError:
+                digest.update(func.__code__.co_code)
+    return digest.hexdigest()
+
+
+def registry_fingerprint():
+    """Hash of the definitions of every registered feature"""
+    digest = hashlib.sha256()
+    for name in sorted(FEATURE_REGISTRY):
+        digest.update(feature_fingerprint(name).encode())
+    return digest.hexdigest()
+
+
+def column_hash(series):
+    """Hash of the values and dtype of a column, independent of its index"""
+    digest = hashlib.sha256()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Hashing the codes and the categories avoids materializing the strings
+        digest.update(series.cat.codes.to_numpy().tobytes())
+        digest.update(json.dumps([str(c) for c in series.cat.categories]).encode())
+    elif series.dtype.kind in 'biuf':
+        digest.update(series.dtype.str.encode())
+        digest.update(np.ascontiguousarray(series.to_numpy()).tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def feature_cache_key(df, name, stats, column_hashes=None):
+    """
+    Key under which a computed feature column is stored in a FeatureStore
+
+    The key combines the feature fingerprint, the hashes of the input columns
+    the feature reads directly or through its dependencies, and the population
+    statistics and settings it uses.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset the feature is computed from
+    name : str
+        Registered feature name
+    stats : dict
+        Population statistics and feature settings
+    column_hashes : dict, optional
+        Memo of column hashes, shared between the features of one computation
+
+    Returns:
+    --------
+    str
+        Hex digest identifying the feature column
+    """
+    if column_hashes is None:
+        column_hashes = {}
+
+    features = resolve_features([name])
+    inputs = sorted({col for feature in features for col in feature.inputs})
+    for col in inputs:
+        if col not in column_hashes:
+            column_hashes[col] = column_hash(df[col])
+
+    used_stats = {}
+    for key in sorted({key for feature in features for key in feature.stats + feature.settings}):
+        value = stats.get(key)
+        if key == 'role_multipliers' and value is None:
+            value = ROLE_MULTIPLIERS
+        elif key == 'default_role_multiplier' and value is None:
+            value = DEFAULT_ROLE_MULTIPLIER
+        if isinstance(value, pd.Series):
+            value = {str(k): float(v) for k, v in value.items()}
+        used_stats[key] = value
+
+    digest = hashlib.sha256()
+    digest.update(feature_fingerprint(name).encode())
+    for col in inputs:
+        digest.update(f"{col}:{column_hashes[col]}".encode())
+    digest.update(json.dumps(used_stats, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def compute_features(df, names, stats=None, store=None, fused=True):
+    """
+    Compute the requested features and add them to the dataframe
+
+    Only the requested features and their dependencies are computed, in
+    dependency order, and shared intermediates are computed once. Population
+    statistics missing from `stats` are computed from `df` itself. With a
+    FeatureStore, columns cached for the same data, statistics and feature
+    definitions are loaded instead of computed, and new ones are saved.
+    Features in FUSED_FEATURES are computed together by fused_features unless
+    `fused` is False.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    names : list
+        Registered feature names to add
+    stats : dict, optional
+        Population statistics and feature settings
+    store : FeatureStore, optional
+        On-disk cache of computed feature columns
+    fused : bool
+        Whether to use the fused kernel instead of the registered functions
+
+    Returns:
+    --------
+    pd.DataFrame
+        The dataframe with the requested features
+    """
+    features = resolve_features(names)
+
+    missing = sorted({col for feature in features for col in feature.inputs} - set(df.columns))
+    if missing:
+        raise KeyError(f"Columns required by the requested features are missing: {missing}")
+
+    stats = dict(stats or {})
+    for stat in required_stats(names):
+        if stat not in stats:
+            stats[stat] = POPULATION_STATS[stat](df, stats)
+
+    values = {}
+    column_hashes = {}
+    keys = {}
+
+    def load(name):
+        if store is None or FEATURE_REGISTRY[name].intermediate:
+            return False
+        keys[name] = feature_cache_key(df, name, stats, column_hashes)
+        cached = store.get(name, keys[name])
+        if cached is None:
+            return False
+        values[name] = cached
+        return True
+
+    # Dependencies are only resolved for the features missing from the store
+    pending = [name for name in names if not load(name)]
+
+    if fused:
+        fused_names = [name for name in pending if name in FUSED_FEATURES]
+        if fused_names:
+            values.update(fused_features(df, fused_names, stats))
+            for name in fused_names:
+                if name in keys:
+                    store.put(name, keys[name], values[name])
+
+    # Fused outputs are already available to the features that depend on
+    # them, so only the features left over are resolved to their dependencies
+    remaining = [name for name in pending if name not in values]
+    for feature in resolve_features(remaining):
+        if feature.name in values or (feature.name not in pending and load(feature.name)):
+            continue
+        values[feature.name] = feature.func(df, values, stats)
+        if feature.name in keys:
+            store.put(feature.name, keys[feature.name], values[feature.name])
+
+    for name in names:
+        df[name] = values[name]
+
+    # Store the new features in their declared compact dtypes
+    return apply_schema(df)
+
+
+def add_attrition_features(df, job_level_income=None, store=None):
+    """
+    Add the engineered attrition features to the dataframe
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    job_level_income : pd.Series, optional
+        Average income per job level; computed from `df` when not given
+    store : FeatureStore, optional
+        On-disk cache of computed feature columns
+
+    Returns:
+    --------
+    pd.DataFrame
+        The dataframe with engineered features
+    """
+    stats = {} if job_level_income is None else {'job_level_income': job_level_income}
+    return compute_features(df, ATTRITION_FEATURES, stats, store)
+
+
+def add_retention_features(df, role_multipliers=None, default_role_multiplier=DEFAULT_ROLE_MULTIPLIER,
+                           ctc_median=None, store=None):
+    """
+    Add the strategic HR metrics used for retention decisions to the dataframe
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        The HR dataset
+    role_multipliers : dict, optional
+        CTC multiplier per JobRole; ROLE_MULTIPLIERS when not given
+    default_role_multiplier : float
+        CTC multiplier for roles missing from the table
+    ctc_median : float, optional
+        Population median CTC that ProductivityCostRatio is scaled by;
+        computed from `df` when not given
+    store : FeatureStore, optional
+        On-disk cache of computed feature columns
+
+    Returns:
+    --------
+    pd.DataFrame
+        The dataframe with engineered features
+    """
+    stats = {'role_multipliers': role_multipliers, 'default_role_multiplier': default_role_multiplier}
+    if ctc_median is not None:
+        stats['ctc_median'] = ctc_median
+    return compute_features(df, RETENTION_FEATURES, stats, store)
+
+
+class FeatureTransformer(BaseEstimator, TransformerMixin):
+    """
+    Registered features with population statistics frozen at fit time
+
+    `fit` learns only the statistics the selected features need; `transform`
+    adds the selected features using those statistics, so any number of
+    employees, including a single one, is scored consistently with the
+    training data.
+
+    Parameters:
+    -----------
+    features : list, optional
+        Registered feature names to add; `default_features` when not given
+    role_multipliers : dict, optional
+        CTC multiplier per JobRole; ROLE_MULTIPLIERS when not given
+    default_role_multiplier : float
+        CTC multiplier for roles missing from the table
+
+    Attributes:
+    -----------
+    stats_ : dict
+        Population statistics learned during fit
+    """
+
+    default_features = ()
+
+    def __init__(self, features=None, role_multipliers=None, default_role_multiplier=DEFAULT_ROLE_MULTIPLIER):
+        self.features = features
+        self.role_multipliers = role_multipliers
+        self.default_role_multiplier = default_role_multiplier
+
+    def _feature_names(self):
+        return list(self.features) if self.features is not None else list(self.default_features)
+
+    def _settings(self):
+        return {'role_multipliers': self.role_multipliers,
+                'default_role_multiplier': self.default_role_multiplier}
+
+    def fit(self, X, y=None):
+        self.stats_ = fit_stats(X, self._feature_names(), self._settings())
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, 'stats_')
+        return compute_features(X.copy(), self._feature_names(), {**self._settings(), **self.stats_})
+
+
+class AttritionFeatureTransformer(FeatureTransformer):
+    """FeatureTransformer adding the attrition prediction features by default"""
+
+    default_features = ATTRITION_FEATURES
+
+
+class RetentionFeatureTransformer(FeatureTransformer):
+    """FeatureTransformer adding the retention decision features by default"""
+
+    default_features = RETENTION_FEATURES
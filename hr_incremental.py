@@ -0,0 +1,213 @@
+"""
+Talent Analytics: Incremental Scoring Helpers
+---------------------------------------------
+This module provides the building blocks for rescoring only the employees
+whose records changed between two HRIS snapshots. Snapshots are compared by
+EmployeeNumber and a hash of each record, the population statistics behind
+the engineered features are tracked in a small JSON sidecar next to each
+export, and exported CSVs are patched in place.
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+EMPLOYEE_KEY = 'EmployeeNumber'
+
+
+class SnapshotDelta:
+    """
+    Differences between two HRIS snapshots
+
+    Attributes:
+    -----------
+    new_ids : np.ndarray
+        Employees only present in the current snapshot
+    changed_ids : np.ndarray
+        Employees present in both snapshots whose record changed
+    removed_ids : np.ndarray
+        Employees only present in the previous snapshot
+    changed_columns : set
+        Columns that differ for at least one changed employee
+    n_current : int
+        Number of employees in the current snapshot
+    """
+
+    def __init__(self, new_ids, changed_ids, removed_ids, changed_columns, n_current):
+        self.new_ids = new_ids
+        self.changed_ids = changed_ids
+        self.removed_ids = removed_ids
+        self.changed_columns = changed_columns
+        self.n_current = n_current
+
+    @property
+    def rescore_ids(self):
+        """Employees whose features and predictions must be recomputed"""
+        return np.concatenate([self.new_ids, self.changed_ids])
+
+    def touches(self, columns):
+        """Whether the delta can affect population statistics derived from `columns`"""
+        return (len(self.new_ids) > 0 or len(self.removed_ids) > 0 or
+                bool(self.changed_columns & set(columns)))
+
+    def __repr__(self):
+        return (f"SnapshotDelta(new={len(self.new_ids)}, changed={len(self.changed_ids)}, "
+                f"removed={len(self.removed_ids)}, unchanged="
+                f"{self.n_current - len(self.new_ids) - len(self.changed_ids)})")
+
+
+def row_hashes(df, columns, key=EMPLOYEE_KEY):
+    """
+    Hash every employee record over the given columns
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        HR snapshot
+    columns : list
+        Columns included in the hash
+    key : str
+        Column identifying an employee
+
+    Returns:
+    --------
+    pd.Series
+        One uint64 hash per employee, indexed by `key`
+    """
+    hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    return pd.Series(hashes.to_numpy(), index=df[key].to_numpy())
+
+
+def diff_snapshots(previous, current, key=EMPLOYEE_KEY):
+    """
+    Compare two HRIS snapshots by employee key and record hash
+
+    Parameters:
+    -----------
+    previous, current : pd.DataFrame
+        The previous and the new snapshot
+    key : str
+        Column identifying an employee
+
+    Returns:
+    --------
+    SnapshotDelta
+        New, changed and removed employees plus the columns that changed
+    """
+    columns = sorted(set(previous.columns) & set(current.columns) - {key})
+    prev_hash = row_hashes(previous, columns, key)
+    curr_hash = row_hashes(current, columns, key)
+
+    common = curr_hash.index.intersection(prev_hash.index)
+    changed_mask = curr_hash.loc[common].to_numpy() != prev_hash.loc[common].to_numpy()
+    changed_ids = common[changed_mask].to_numpy()
+
+    # Work out which columns changed, looking only at the changed employees
+    changed_columns = set()
+    if len(changed_ids) > 0:
+        prev_rows = previous.set_index(key).loc[changed_ids, columns]
+        curr_rows = current.set_index(key).loc[changed_ids, columns]
+        for col in columns:
+            if (prev_rows[col].astype(object) != curr_rows[col].astype(object)).any():
+                changed_columns.add(col)
+
+    # Columns added or dropped between snapshots change every record
+    if set(previous.columns) != set(current.columns):
+        changed_columns |= set(previous.columns) ^ set(current.columns)
+        changed_ids = common.to_numpy()
+
+    return SnapshotDelta(
+        new_ids=curr_hash.index.difference(prev_hash.index).to_numpy(),
+        changed_ids=changed_ids,
+        removed_ids=prev_hash.index.difference(curr_hash.index).to_numpy(),
+        changed_columns=changed_columns,
+        n_current=len(curr_hash)
+    )
+
+
+def stats_path(export_path):
+    """Location of the population statistics sidecar for an exported CSV"""
+    return os.path.splitext(export_path)[0] + '.stats.json'
+
+
+def save_stats(stats, export_path):
+    """Store the population statistics used to score an export next to it"""
+    with open(stats_path(export_path), 'w') as f:
+        json.dump(stats, f, indent=2)
+
+
+def load_stats(export_path):
+    """Load the population statistics stored with an export, or None if missing"""
+    path = stats_path(export_path)
+    if not os.path.exists(export_path) or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def stats_drifted(old_stats, new_stats, tolerance):
+    """
+    Whether population statistics moved by more than a relative tolerance
+
+    Parameters:
+    -----------
+    old_stats, new_stats : dict
+        Statistics as stored by save_stats; values are numbers or dicts of numbers
+    tolerance : float
+        Largest relative change that still counts as unchanged
+
+    Returns:
+    --------
+    bool
+        True if any statistic was added, removed or changed beyond `tolerance`
+    """
+    def flatten(stats, prefix=''):
+        flat = {}
+        for name, value in stats.items():
+            if isinstance(value, dict):
+                flat.update(flatten(value, f"{prefix}{name}."))
+            else:
+                flat[f"{prefix}{name}"] = float(value)
+        return flat
+
+    old_flat, new_flat = flatten(old_stats), flatten(new_stats)
+    if old_flat.keys() != new_flat.keys():
+        return True
+
+    return any(abs(new_flat[name] - old_value) > tolerance * abs(old_value)
+               for name, old_value in old_flat.items())
+
+
+def patch_export(export_path, rows, removed_ids, order, key=EMPLOYEE_KEY):
+    """
+    Patch rescored employees into an exported CSV
+
+    Parameters:
+    -----------
+    export_path : str
+        CSV previously written by a full scoring run
+    rows : pd.DataFrame
+        Rescored employees, with at least the exported columns
+    removed_ids : array-like
+        Employees to drop from the export
+    order : array-like
+        Employee keys in the order of the current snapshot
+
+    Returns:
+    --------
+    pd.DataFrame
+        The patched export
+    """
+    export = pd.read_csv(export_path)
+    stale = export[key].isin(removed_ids) | export[key].isin(rows[key])
+
+    patched = pd.concat([export[~stale], rows[export.columns]], ignore_index=True)
+    patched = patched.set_index(key).loc[order].reset_index()[export.columns]
+
+    # Write next to the export first so a failed run never leaves a half-written file
+    tmp_path = export_path + '.tmp'
+    patched.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, export_path)
+
+    return patched
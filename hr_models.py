@@ -0,0 +1,457 @@
+"""
+Talent Analytics: Model Selection
+---------------------------------
+This module provides the gradient boosting backends and the hyperparameter
+search shared by the attrition and retention pipelines.
+
+The 'gradient_boosting' backend is GradientBoostingClassifier on scaled and
+one-hot encoded columns. The 'hist_gradient_boosting' backend bins the
+features into histograms, which keeps fit times close to linear in the
+number of employees, splits on the categorical columns natively instead of
+one-hot encoding them, and stops adding boosting iterations once a held-out
+tenth of the training data stops improving. Either backend can take one of
+the bounded-width categorical encoders of hr_encoders instead.
+
+The exhaustive grid search fits every combination on every fold; the
+successive halving search fits every combination on a small budget (a sample
+of the employees, or a few boosting stages or trees), keeps the best third
+and repeats with three times the budget until one round on the full budget
+is left. The warm start search covers the n_estimators axis of the grid with
+one fit per fold and remaining combination: the ensemble is grown to the
+largest n_estimators and scored at every smaller value on the way, through
+the staged predictions of a boosting model or by adding trees to a random
+forest with warm_start. Given the shared folds of hr_cv.FoldManager, every
+search runs on the same splits, and the grid and warm start searches
+checkpoint each fold result and only fit the settings not already evaluated
+on them.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.stats import rankdata
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import GridSearchCV, ParameterGrid, check_cv
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+from hr_cv import as_completed
+from hr_encoders import categorical_encoder
+
+BOOSTING_BACKENDS = ('gradient_boosting', 'hist_gradient_boosting')
+
+# Most boosting iterations of the histogram backend; early stopping usually
+# ends training well before
+MAX_HIST_ITERATIONS = 500
+
+SEARCH_MODES = ('grid', 'halving', 'warm_start')
+
+# Output of the one-hot encoding preprocessors: 'auto' leaves the choice to
+# ColumnTransformer (sparse when under 30% of the entries are non-zero),
+# 'sparse' always keeps CSR matrices and 'dense' always densifies
+MATRIX_FORMATS = ('auto', 'sparse', 'dense')
+SPARSE_THRESHOLDS = {'auto': 0.3, 'sparse': 1.0, 'dense': 0.0}
+
+# Budgets successive halving can grow: training rows, or the number of trees
+# or boosting stages of the classifier step
+HALVING_RESOURCES = ('n_samples', 'n_estimators')
+
+
+def sparse_threshold(matrix_format='auto'):
+    """ColumnTransformer sparse_threshold giving the requested matrix format"""
+    if matrix_format not in MATRIX_FORMATS:
+        raise ValueError(f"Unknown matrix format {matrix_format!r}; expected one of {MATRIX_FORMATS}")
+    return SPARSE_THRESHOLDS[matrix_format]
+
+
+def boosting_steps(num_cols, cat_cols, backend='gradient_boosting', random_state=42, matrix_format='auto',
+                   encoder='onehot'):
+    """
+    Preprocessor and classifier steps of a gradient boosting model pipeline
+
+    Parameters:
+    -----------
+    num_cols, cat_cols : list
+        Numerical and categorical input columns
+    backend : str
+        'gradient_boosting' or 'hist_gradient_boosting'
+    random_state : int
+        Seed of the classifier
+    matrix_format : str
+        Output of the one-hot encoding preprocessor (see MATRIX_FORMATS);
+        the histogram backend needs dense input and encodes each category as
+        one integer column, so it always outputs a dense matrix
+    encoder : str or transformer
+        Encoder of the categorical columns (see hr_encoders.categorical_encoder);
+        with 'onehot' the histogram backend splits on the categories natively
+        instead
+
+    Returns:
+    --------
+    tuple
+        The ColumnTransformer and the unfitted classifier
+    """
+    if backend not in BOOSTING_BACKENDS:
+        raise ValueError(f"Unknown boosting backend {backend!r}; expected one of {BOOSTING_BACKENDS}")
+
+    if backend == 'gradient_boosting':
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ('num', StandardScaler(), num_cols),
+                ('cat', categorical_encoder(encoder, random_state=random_state), cat_cols)
+            ],
+            remainder='drop',
+            sparse_threshold=sparse_threshold(matrix_format)
+        )
+        return preprocessor, GradientBoostingClassifier(random_state=random_state)
+
+    # Histograms need no scaling. Instead of one-hot columns, categories are
+    # passed as integer codes and flagged as categorical, and categories
+    # unseen in training are treated as missing; the bounded-width encodings
+    # are plain numeric columns
+    if encoder == 'onehot' or isinstance(encoder, OneHotEncoder):
+        cat_encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan)
+        categorical_features = np.arange(len(num_cols), len(num_cols) + len(cat_cols))
+    else:
+        cat_encoder = categorical_encoder(encoder, random_state=random_state)
+        categorical_features = None
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', 'passthrough', num_cols),
+            ('cat', cat_encoder, cat_cols)
+        ],
+        remainder='drop',
+        sparse_threshold=0.0
+    )
+    # Trees are as deep as GradientBoostingClassifier's by default, so the
+    # backends differ in how they split rather than in model capacity
+    classifier = HistGradientBoostingClassifier(
+        max_iter=MAX_HIST_ITERATIONS, max_depth=3, early_stopping=True,
+        categorical_features=categorical_features, random_state=random_state)
+    return preprocessor, classifier
+
+
+def boosting_param_grid(param_grid, backend='gradient_boosting'):
+    """
+    Adapt a GradientBoostingClassifier grid to a backend
+
+    The histogram backend picks its number of iterations by early stopping,
+    so the n_estimators values are dropped for it.
+    """
+    if backend == 'hist_gradient_boosting':
+        return {key: values for key, values in param_grid.items() if key != 'classifier__n_estimators'}
+    return param_grid
+
+
+def feature_importances(model, X, y, n_repeats=5, random_state=42):
+    """
+    Importance of each preprocessed column to a fitted model pipeline
+
+    The classifier's impurity-based importances when it has them; the
+    histogram backend has none, so its columns are ranked by the mean drop in
+    ROC AUC on (X, y) when each is permuted. Constant columns, such as the
+    empty buckets of the hashing encoder, are not permuted and score 0.
+
+    Parameters:
+    -----------
+    model : Pipeline
+        Fitted model pipeline whose last step is named 'classifier'
+    X, y : pd.DataFrame, pd.Series
+        Data the permutation importances are measured on
+    n_repeats : int
+        Permutations per column
+    random_state : int
+        Seed of the permutations
+
+    Returns:
+    --------
+    np.ndarray
+        Importance per column of the preprocessed matrix
+    """
+    classifier = model.named_steps['classifier']
+    if hasattr(classifier, 'feature_importances_'):
+        return classifier.feature_importances_
+
+    X_transformed = model[:-1].transform(X)
+    X_transformed = X_transformed.toarray() if sparse.issparse(X_transformed) else np.array(X_transformed)
+    rng = np.random.default_rng(random_state)
+    baseline = roc_auc_score(y, classifier.predict_proba(X_transformed)[:, 1])
+
+    importances = np.zeros(X_transformed.shape[1])
+    for col in np.flatnonzero((X_transformed != X_transformed[0]).any(axis=0)):
+        original = X_transformed[:, col].copy()
+        drops = []
+        for _ in range(n_repeats):
+            X_transformed[:, col] = rng.permutation(original)
+            drops.append(baseline - roc_auc_score(y, classifier.predict_proba(X_transformed)[:, 1]))
+        X_transformed[:, col] = original
+        importances[col] = np.mean(drops)
+    return importances
+
+
+def fit_checkpoints(pipeline, params, X, y, train, test, checkpoints=None):
+    """
+    Fit a pipeline on one cross-validation fold and predict its test rows at
+    every checkpoint
+
+    Parameters:
+    -----------
+    pipeline : Pipeline
+        Unfitted model pipeline whose last step is named 'classifier'
+    params : dict
+        Pipeline parameters other than classifier__n_estimators
+    X, y : pd.DataFrame, pd.Series
+        Training data
+    train, test : np.ndarray
+        Row positions of the fold
+    checkpoints : list, optional
+        Ascending n_estimators values to predict with; None fits and predicts
+        with the pipeline once as it is
+
+    Returns:
+    --------
+    list
+        Predicted probabilities of the test rows per checkpoint
+    """
+    model = clone(pipeline).set_params(**params)
+    X_train, y_train = X.iloc[train], y.iloc[train]
+    X_test = X.iloc[test]
+
+    if checkpoints is None:
+        model.fit(X_train, y_train)
+        return [model.predict_proba(X_test)[:, 1]]
+
+    # The preprocessing steps are fitted once; only the ensemble grows
+    preprocessing = model[:-1]
+    Xt_train = preprocessing.fit_transform(X_train, y_train)
+    Xt_test = preprocessing.transform(X_test)
+    classifier = model.named_steps['classifier']
+
+    predictions = []
+    if hasattr(classifier, 'staged_predict_proba'):
+        classifier.set_params(n_estimators=checkpoints[-1]).fit(Xt_train, y_train)
+        for n_stages, proba in enumerate(classifier.staged_predict_proba(Xt_test), 1):
+            if n_stages in checkpoints:
+                predictions.append(proba[:, 1])
+    else:
+        classifier.set_params(warm_start=True)
+        for n_estimators in checkpoints:
+            classifier.set_params(n_estimators=n_estimators).fit(Xt_train, y_train)
+            predictions.append(classifier.predict_proba(Xt_test)[:, 1])
+    return predictions
+
+
+def check_folds(folds, X):
+    """Raise a ValueError unless `folds` were defined on the rows of X"""
+    if len(X) != len(folds.y):
+        raise ValueError(f"The folds were defined on {len(folds.y)} rows, not {len(X)}")
+
+
+class WarmStartSearchCV:
+    """
+    Grid search growing each ensemble along the n_estimators axis of the grid
+
+    Gives the same cross-validated scores and selection as GridSearchCV over
+    the same folds, with one fit per fold for every combination of the other
+    parameters instead of one per n_estimators value.
+
+    Parameters:
+    -----------
+    pipeline : Pipeline
+        Model pipeline whose last step is named 'classifier'
+    param_grid : dict
+        Grid of pipeline parameters; without classifier__n_estimators every
+        combination is fitted as by GridSearchCV
+    cv : int or cross-validation splitter
+        Cross-validation folds
+    n_jobs : int
+        Cores the fold fits run on; -1 uses every core
+    folds : FoldManager, optional
+        Shared folds used instead of `cv`; the predictions at every
+        checkpoint are stored in and reused from them
+
+    Attributes:
+    -----------
+    best_params_, best_score_, best_estimator_, cv_results_, n_splits_
+        As for GridSearchCV (cv_results_ holds the params and the mean,
+        standard deviation and rank of the test scores)
+    """
+
+    def __init__(self, pipeline, param_grid, cv=5, n_jobs=-1, folds=None):
+        self.pipeline = pipeline
+        self.param_grid = param_grid
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.folds = folds
+
+    def fit(self, X, y):
+        """Cross-validate every combination and refit the best on all of X"""
+        folds = self.folds
+        if folds is not None:
+            check_folds(folds, X)
+
+        param_grid = dict(self.param_grid)
+        n_estimators = param_grid.pop('classifier__n_estimators', None)
+        checkpoints = sorted(n_estimators) if n_estimators else None
+
+        if folds is not None:
+            splits = folds.splits
+        else:
+            splits = list(check_cv(self.cv, y, classifier=True).split(X, y))
+        self.n_splits_ = len(splits)
+        combinations = list(ParameterGrid(param_grid))
+
+        # One candidate per combination and checkpoint, in GridSearchCV order
+        groups = [[dict(params, **({'classifier__n_estimators': n} if checkpoints else {}))
+                   for n in (checkpoints or [None])] for params in combinations]
+        keys = [[folds.key(self.pipeline, candidate) if folds is not None else None
+                 for candidate in group] for group in groups]
+        # Shape (combination, checkpoint, fold)
+        predictions = [[[folds.get(key, fold) if folds is not None else None
+                         for fold in range(self.n_splits_)] for key in group] for group in keys]
+
+        tasks = [((i, fold), (self.pipeline, params, X, y, *splits[fold], checkpoints))
+                 for i, params in enumerate(combinations) for fold in range(self.n_splits_)
+                 if any(stored[fold] is None for stored in predictions[i])]
+        for (i, fold), probas in as_completed(fit_checkpoints, tasks, self.n_jobs):
+            for j, proba in enumerate(probas):
+                predictions[i][j][fold] = proba
+                if folds is not None:
+                    folds.put(keys[i][j], fold, proba)
+            if folds is not None:
+                folds.fits += 1
+
+        candidates = [candidate for group in groups for candidate in group]
+        fold_scores = np.array([[roc_auc_score(y.iloc[test], proba) for (_, test), proba in zip(splits, stored)]
+                                for group in predictions for stored in group])
+        return set_search_results(self, candidates, fold_scores, X, y)
+
+
+class FoldSearchCV:
+    """
+    Grid search over the folds of an hr_cv.FoldManager
+
+    Scores every combination as GridSearchCV over the same splits, but fits
+    only the (combination, fold) pairs the fold manager has not evaluated
+    yet; the others, such as the untuned model already cross-validated or
+    the fits completed by an interrupted run, reuse the stored out-of-fold
+    predictions.
+
+    Parameters:
+    -----------
+    pipeline : Pipeline
+        Model pipeline
+    param_grid : dict
+        Grid of pipeline parameters
+    folds : FoldManager
+        Folds of the training data the search is fitted on
+    n_jobs : int
+        Cores the fold fits run on; -1 uses every core
+
+    Attributes:
+    -----------
+    best_params_, best_score_, best_estimator_, cv_results_, n_splits_
+        As for WarmStartSearchCV
+    """
+
+    def __init__(self, pipeline, param_grid, folds, n_jobs=-1):
+        self.pipeline = pipeline
+        self.param_grid = param_grid
+        self.folds = folds
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        """Cross-validate every combination and refit the best on all of X"""
+        check_folds(self.folds, X)
+        candidates = list(ParameterGrid(self.param_grid))
+        self.n_splits_ = self.folds.n_splits
+        fold_scores = self.folds.fold_scores(self.pipeline, candidates, self.n_jobs)
+        return set_search_results(self, candidates, fold_scores, X, y)
+
+
+def set_search_results(search, candidates, fold_scores, X, y):
+    """Set the GridSearchCV-style results of a search and refit its best candidate"""
+    mean_scores = fold_scores.mean(axis=1)
+    search.cv_results_ = {
+        'params': candidates,
+        'mean_test_score': mean_scores,
+        'std_test_score': fold_scores.std(axis=1),
+        'rank_test_score': rankdata(-mean_scores, method='min').astype(np.int32)
+    }
+    best = int(np.argmax(mean_scores))
+    search.best_params_ = candidates[best]
+    search.best_score_ = float(mean_scores[best])
+    search.best_estimator_ = clone(search.pipeline).set_params(**search.best_params_).fit(X, y)
+    return search
+
+
+def hyperparameter_search(pipeline, param_grid, search='grid', resource='n_samples', cv=5,
+                          n_jobs=-1, factor=3, random_state=42, folds=None):
+    """
+    Hyperparameter search over a model pipeline, scored by ROC AUC
+
+    Parameters:
+    -----------
+    pipeline : Pipeline
+        Model pipeline whose last step is named 'classifier'
+    param_grid : dict
+        Grid of pipeline parameters
+    search : str
+        'grid' for an exhaustive GridSearchCV (a FoldSearchCV given
+        `folds`), 'halving' for a HalvingGridSearchCV, 'warm_start' for a
+        WarmStartSearchCV
+    resource : str
+        Budget grown by the halving search: 'n_samples', or 'n_estimators'
+        for ensemble classifiers (max_iter for the histogram backend), in
+        which case the n_estimators values of the grid are dropped and the
+        largest one is the full budget
+    cv : int
+        Cross-validation folds
+    n_jobs : int
+        Cores the candidate fits run on; -1 uses every core
+    factor : int
+        Share of candidates kept, and growth of the budget, per halving round
+    random_state : int
+        Seed of the row samples drawn by the halving search
+    folds : FoldManager, optional
+        Shared folds of the training data (see hr_cv), used instead of `cv`;
+        the grid and warm start searches then store every fold result as it
+        finishes and reuse those already stored, so an interrupted search
+        resumes where it stopped. Halving rounds fit on row or stage samples
+        and are not stored
+
+    Returns:
+    --------
+    GridSearchCV, FoldSearchCV, HalvingGridSearchCV or WarmStartSearchCV
+        The unfitted search
+    """
+    if search not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {search!r}; expected one of {SEARCH_MODES}")
+    if folds is not None:
+        if search == 'grid':
+            return FoldSearchCV(pipeline, param_grid, folds, n_jobs=n_jobs)
+        if search == 'warm_start':
+            return WarmStartSearchCV(pipeline, param_grid, n_jobs=n_jobs, folds=folds)
+        cv = folds.splits
+    if search == 'grid':
+        return GridSearchCV(pipeline, param_grid, cv=cv, scoring='roc_auc', n_jobs=n_jobs)
+    if search == 'warm_start':
+        return WarmStartSearchCV(pipeline, param_grid, cv=cv, n_jobs=n_jobs)
+
+    if resource not in HALVING_RESOURCES:
+        raise ValueError(f"Unknown halving resource {resource!r}; expected one of {HALVING_RESOURCES}")
+
+    # Importing the experimental flag registers HalvingGridSearchCV
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV
+
+    budget = {}
+    if resource == 'n_estimators':
+        param_grid = dict(param_grid)
+        n_estimators = param_grid.pop('classifier__n_estimators', None)
+        params = pipeline.get_params()
+        resource = 'classifier__n_estimators' if 'classifier__n_estimators' in params else 'classifier__max_iter'
+        budget['max_resources'] = max(n_estimators) if n_estimators else params[resource]
+
+    return HalvingGridSearchCV(pipeline, param_grid, cv=cv, scoring='roc_auc', n_jobs=n_jobs,
+                               factor=factor, resource=resource, random_state=random_state, **budget)
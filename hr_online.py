@@ -0,0 +1,190 @@
+"""
+Talent Analytics: Online Attrition Model
+----------------------------------------
+This module provides an attrition model that learns from mini-batches of
+employee records instead of being retrained on the full history: a logistic
+regression fitted by averaged stochastic gradient descent over the same
+engineered features and input columns as the batch pipeline's
+ColumnTransformer. Averaging the weights over the steps keeps the estimate
+stable from one noisy mini-batch to the next.
+
+The population statistics behind the engineered features and the category
+vocabulary are fixed by the first batch (or given up front); categories seen
+later are ignored, as by the batch pipeline's encoder. The scaler of the
+numerical columns is updated with every batch passed to partial_fit or
+update; fit scales by the whole training set once. A daily batch of HRIS
+changes therefore updates the model in time proportional to the batch, not
+to the workforce.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from hr_features import AttritionFeatureTransformer
+
+# Employees per mini-batch when training on a whole dataset
+DEFAULT_BATCH_SIZE = 1_000
+
+# Passes over the training data made by OnlineAttritionModel.fit
+DEFAULT_EPOCHS = 5
+
+
+class OnlineAttritionModel:
+    """
+    Attrition model updated one mini-batch of employees at a time
+
+    Parameters:
+    -----------
+    num_cols, cat_cols : list
+        Numerical and categorical input columns, as in the batch pipeline's
+        ColumnTransformer
+    categories : dict, optional
+        Category vocabulary per categorical column; taken from the first
+        batch when not given
+    alpha : float
+        L2 regularization strength of the logistic regression
+    random_state : int
+        Seed of the stochastic gradient descent
+
+    Attributes:
+    -----------
+    features_ : AttritionFeatureTransformer
+        Engineered features, with statistics frozen at the first batch
+    scaler_ : StandardScaler
+        Running scaler of the numerical columns
+    encoder_ : OneHotEncoder
+        One-hot encoder over the fixed category vocabulary
+    classifier_ : SGDClassifier
+        The logistic regression
+    n_batches_, n_employees_ : int
+        Batches and employee records learned from so far, counting every
+        pass of fit
+    """
+
+    def __init__(self, num_cols, cat_cols, categories=None, alpha=1e-3, random_state=42):
+        self.num_cols = list(num_cols)
+        self.cat_cols = list(cat_cols)
+        self.categories = categories
+        self.alpha = alpha
+        self.random_state = random_state
+
+    @property
+    def classes_(self):
+        return self.classifier_.classes_
+
+    def _start(self, X):
+        """Fix the feature statistics and category vocabulary from the first batch"""
+        self.features_ = AttritionFeatureTransformer().fit(X)
+        categories = self.categories or {}
+        vocabulary = [list(categories[col]) if col in categories else
+                      sorted(pd.Series(X[col]).dropna().astype(str).unique())
+                      for col in self.cat_cols]
+        self.encoder_ = OneHotEncoder(categories=vocabulary, handle_unknown='ignore')
+        self.encoder_.fit(self._categorical(X))
+        self.scaler_ = StandardScaler()
+        self.classifier_ = SGDClassifier(loss='log_loss', alpha=self.alpha, average=True,
+                                         random_state=self.random_state)
+        self.n_batches_ = 0
+        self.n_employees_ = 0
+
+    def _categorical(self, X):
+        return X[self.cat_cols].astype(str).astype(object)
+
+    def _matrix(self, X):
+        """Sparse model matrix of scaled numerical and one-hot categorical columns"""
+        numeric = self.scaler_.transform(X[self.num_cols].to_numpy(dtype=float))
+        categorical = self.encoder_.transform(self._categorical(X))
+        return sparse.hstack([sparse.csr_matrix(numeric), categorical], format='csr')
+
+    def partial_fit(self, X, y):
+        """
+        Learn from one mini-batch of employees
+
+        Parameters:
+        -----------
+        X : pd.DataFrame
+            Employee records with the input columns
+        y : array-like
+            Attrition labels (1 for leavers)
+
+        Returns:
+        --------
+        OnlineAttritionModel
+            self
+        """
+        if not hasattr(self, 'classifier_'):
+            self._start(X)
+        X = self.features_.transform(X)
+        self.scaler_.partial_fit(X[self.num_cols].to_numpy(dtype=float))
+        return self._step(X, y)
+
+    def _step(self, X, y):
+        """One gradient step on a batch with engineered features, at the current scaling"""
+        self.classifier_.partial_fit(self._matrix(X), np.asarray(y), classes=[0, 1])
+        self.n_batches_ += 1
+        self.n_employees_ += len(X)
+        return self
+
+    def update(self, batch):
+        """
+        Learn from a batch of HRIS records carrying their Attrition outcome
+
+        Parameters:
+        -----------
+        batch : pd.DataFrame
+            Employee records with an AttritionBinary or Attrition column
+
+        Returns:
+        --------
+        OnlineAttritionModel
+            self
+        """
+        if 'AttritionBinary' in batch:
+            y = batch['AttritionBinary']
+        else:
+            y = (batch['Attrition'] == 'Yes').astype('int8')
+        return self.partial_fit(batch, y)
+
+    def fit(self, X, y, batch_size=DEFAULT_BATCH_SIZE, epochs=DEFAULT_EPOCHS):
+        """
+        Train from scratch over shuffled mini-batches of a whole dataset
+
+        Parameters:
+        -----------
+        X, y : pd.DataFrame, pd.Series
+            Training data
+        batch_size : int
+            Employees per mini-batch
+        epochs : int
+            Passes over the data
+
+        Returns:
+        --------
+        OnlineAttritionModel
+            self
+        """
+        # The feature statistics, vocabulary and scaler see every employee
+        # once, before the first step; the epochs leave the scaler as it is,
+        # so later updates weigh against the N employees of the dataset
+        self._start(X)
+        X = self.features_.transform(X)
+        self.scaler_.partial_fit(X[self.num_cols].to_numpy(dtype=float))
+
+        rng = np.random.default_rng(self.random_state)
+        y = np.asarray(y)
+        for _ in range(epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), batch_size):
+                rows = order[start:start + batch_size]
+                self._step(X.iloc[rows], y[rows])
+        return self
+
+    def predict_proba(self, X):
+        """Probabilities of staying and of leaving per employee"""
+        return self.classifier_.predict_proba(self._matrix(self.features_.transform(X)))
+
+    def predict(self, X):
+        """Predicted attrition label per employee"""
+        return self.classifier_.predict(self._matrix(self.features_.transform(X)))
@@ -0,0 +1,388 @@
+"""
+Talent Analytics: Figure Rendering
+----------------------------------
+This module separates the figures of the attrition prediction and retention
+decision pipelines from the computations behind them. The pipelines reduce
+the data each figure needs to small aggregates (bar heights, histogram
+counts, box plot statistics, ROC curves) and hand them to a FigureBook,
+which renders them, saves them for a later render step, or drops them.
+matplotlib, seaborn and shap are only imported when a figure is actually
+rendered, always on the non-interactive Agg backend, and batches of figures
+are rendered in a pool of worker processes.
+
+Deferred plot data is rendered with:
+
+    python hr_plots.py attrition_plot_data.pkl [--jobs N]
+"""
+
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+PLOT_MODES = ('render', 'defer', 'off')
+
+# Most points drawn by a scatter plot; larger datasets are sampled
+MAX_SCATTER_POINTS = 10_000
+
+# Most columns shown by an annotated correlation heatmap; wider datasets keep
+# the columns most correlated with the target
+MAX_HEATMAP_FEATURES = 30
+
+
+class FigureBook:
+    """
+    Collects the figures of a pipeline run
+
+    Parameters:
+    -----------
+    mode : str
+        'render' to draw the figures, 'defer' to keep the plot data for
+        save(), or 'off' to skip figures altogether
+    n_jobs : int
+        Worker processes rendering the figures in 'render' mode; with 1 each
+        figure is drawn as soon as it is added, otherwise figures are queued
+        and rendered together by close(). -1 uses every core.
+
+    Attributes:
+    -----------
+    figures : list
+        Queued figure specs: dicts with the renderer `kind`, the output
+        `path` and the plot `data`
+    timings : list
+        Render time of every figure drawn so far
+    """
+
+    def __init__(self, mode='render', n_jobs=1):
+        if mode not in PLOT_MODES:
+            raise ValueError(f"Unknown plot mode {mode!r}; expected one of {PLOT_MODES}")
+        self.mode = mode
+        self.n_jobs = n_jobs
+        self.figures = []
+        self.timings = []
+
+    @property
+    def enabled(self):
+        """Whether figures are wanted, so their plot data is worth computing"""
+        return self.mode != 'off'
+
+    def add(self, kind, path, **data):
+        """Add a figure drawn by RENDERERS[kind] from `data` and saved to `path`"""
+        if self.mode == 'off':
+            return
+        spec = {'kind': kind, 'path': path, 'data': data}
+        if self.mode == 'render' and self.n_jobs == 1:
+            self.timings.append(_timed_render(spec))
+        else:
+            self.figures.append(spec)
+
+    def close(self):
+        """Render the queued figures and print the render time of each figure"""
+        if self.mode != 'render':
+            return
+        if self.figures:
+            self.timings.extend(render_figures(self.figures, self.n_jobs, report=False))
+            self.figures = []
+        if self.timings:
+            print_render_report(self.timings)
+
+    def save(self, path):
+        """Save the deferred plot data for render_figures"""
+        with open(path, 'wb') as f:
+            pickle.dump(self.figures, f)
+        print(f"Plot data for {len(self.figures)} figures saved to {path}")
+
+
+def load_figures(path):
+    """Load plot data saved by FigureBook.save"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+# Aggregates computed by the pipelines, without touching matplotlib
+
+def histogram_by_group(values, groups, bins):
+    """
+    Histogram counts of `values` for each group on shared bin edges
+
+    Returns:
+    --------
+    dict
+        'edges' of the bins and 'counts' per group label
+    """
+    values = np.asarray(values, dtype=float)
+    groups = pd.Series(groups).reset_index(drop=True)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    labels = groups.cat.categories if isinstance(groups.dtype, pd.CategoricalDtype) else sorted(groups.unique())
+    counts = {str(label): np.histogram(values[(groups == label).to_numpy()], bins=edges)[0]
+              for label in labels}
+    return {'edges': edges, 'counts': counts}
+
+
+def box_stats(values, groups):
+    """
+    Box plot statistics of `values` for each group, as drawn by Axes.bxp
+
+    Whiskers reach the most extreme values within 1.5 IQR of the quartiles;
+    values beyond them are kept as fliers, deduplicated.
+    """
+    values = pd.Series(np.asarray(values, dtype=float))
+    groups = pd.Series(groups).reset_index(drop=True)
+    labels = groups.cat.categories if isinstance(groups.dtype, pd.CategoricalDtype) else sorted(groups.unique())
+
+    stats = []
+    for label in labels:
+        group = values[(groups == label).to_numpy()].to_numpy()
+        if len(group) == 0:
+            continue
+        q1, med, q3 = np.percentile(group, [25, 50, 75])
+        iqr = q3 - q1
+        inside = group[(group >= q1 - 1.5 * iqr) & (group <= q3 + 1.5 * iqr)]
+        stats.append({
+            'label': str(label),
+            'med': med, 'q1': q1, 'q3': q3,
+            'whislo': inside.min(), 'whishi': inside.max(),
+            'fliers': np.unique(group[(group < inside.min()) | (group > inside.max())])
+        })
+    return stats
+
+
+def scatter_sample(df, columns, max_points=MAX_SCATTER_POINTS, random_state=42):
+    """The columns of a scatter plot, sampled down to `max_points` rows"""
+    points = df[columns]
+    if len(points) > max_points:
+        points = points.sample(max_points, random_state=random_state)
+    return points.reset_index(drop=True)
+
+
+# Renderers, one per kind of figure
+
+def _pyplot():
+    """Import pyplot on the non-interactive backend with the pipelines' styling"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use('seaborn-v0_8-whitegrid')
+    sns.set_palette('viridis')
+    return plt, sns
+
+
+def _finish(plt, path, title=None, xlabel=None, ylabel=None, rotation=None, tight=False):
+    if title is not None:
+        plt.title(title)
+    if xlabel is not None:
+        plt.xlabel(xlabel)
+    if ylabel is not None:
+        plt.ylabel(ylabel)
+    if rotation is not None:
+        plt.xticks(rotation=rotation)
+    if tight:
+        plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def render_histogram(path, edges, counts, hue, figsize=(10, 6), **labels):
+    """Dodged histogram per group from histogram_by_group counts"""
+    plt, sns = _pyplot()
+    centers = (edges[:-1] + edges[1:]) / 2
+    data = pd.DataFrame([{'value': center, hue: label, 'count': count}
+                         for label, group_counts in counts.items()
+                         for center, count in zip(centers, group_counts)])
+    plt.figure(figsize=figsize)
+    sns.histplot(data=data, x='value', weights='count', hue=hue, hue_order=list(counts),
+                 bins=list(edges), multiple='dodge')
+    _finish(plt, path, **labels)
+
+
+def render_bar(path, x, y, figsize=(8, 5), **labels):
+    """Bar chart of precomputed heights"""
+    plt, sns = _pyplot()
+    plt.figure(figsize=figsize)
+    sns.barplot(x=list(x), y=list(y))
+    _finish(plt, path, **labels)
+
+
+def render_series_bar(path, series, color, figsize=(8, 5), **labels):
+    """Bar chart of a Series in a single colour"""
+    plt, _ = _pyplot()
+    plt.figure(figsize=figsize)
+    series.plot(kind='bar', color=color)
+    _finish(plt, path, **labels)
+
+
+def render_stacked_bar(path, table, figsize=(12, 6), **labels):
+    """Stacked bar chart of a table of counts"""
+    plt, _ = _pyplot()
+    plt.figure(figsize=figsize)
+    table.plot(kind='bar', stacked=True, colormap='viridis')
+    _finish(plt, path, **labels)
+
+
+def render_boxplot(path, stats, figsize=(10, 6), **labels):
+    """Box plot from box_stats statistics"""
+    plt, _ = _pyplot()
+    plt.figure(figsize=figsize)
+    plt.gca().bxp(stats)
+    _finish(plt, path, **labels)
+
+
+def render_heatmap(path, matrix, figsize=(16, 14), **labels):
+    """Lower-triangle heatmap of a correlation matrix"""
+    plt, sns = _pyplot()
+    plt.figure(figsize=figsize)
+    mask = np.triu(np.ones_like(matrix, dtype=bool))
+    sns.heatmap(matrix, mask=mask, annot=True, fmt=".2f", cmap='coolwarm',
+                linewidths=0.5, cbar_kws={"shrink": .8})
+    _finish(plt, path, **labels)
+
+
+def render_curves(path, curves, figsize=(10, 6), legend_loc='best', marker=None, diagonal=True, **labels):
+    """
+    Line plot of (label, x, y) curves, such as ROC or calibration curves,
+    against the diagonal
+    """
+    plt, _ = _pyplot()
+    plt.figure(figsize=figsize)
+    for label, x, y in curves:
+        if marker:
+            plt.plot(x, y, marker=marker, linewidth=1, label=label)
+        else:
+            plt.plot(x, y, label=label)
+    if diagonal:
+        plt.plot([0, 1], [0, 1], 'k--')
+    if any(label for label, _, _ in curves):
+        plt.legend(loc=legend_loc)
+    _finish(plt, path, **labels)
+
+
+def render_importances(path, names, importances, figsize=(12, 8), **labels):
+    """Horizontal bar chart of the most important features, most important on top of the list"""
+    plt, _ = _pyplot()
+    plt.figure(figsize=figsize)
+    plt.barh(range(len(importances)), importances, align='center')
+    plt.yticks(range(len(names)), names)
+    _finish(plt, path, tight=True, **labels)
+
+
+def render_scatter(path, points, x, y, hue, size, sizes=(50, 200), alpha=0.7, figsize=(12, 8), **labels):
+    """Scatter plot coloured by `hue` and sized by `size`"""
+    plt, sns = _pyplot()
+    plt.figure(figsize=figsize)
+    sns.scatterplot(data=points, x=x, y=y, hue=hue, size=size, sizes=sizes, alpha=alpha)
+    _finish(plt, path, **labels)
+
+
+def render_shap_summary(path, shap_values, features, feature_names=None, figsize=(12, 8)):
+    """SHAP summary plot of precomputed SHAP values"""
+    plt, _ = _pyplot()
+    import shap
+    plt.figure(figsize=figsize)
+    shap.summary_plot(shap_values, features, feature_names=feature_names, show=False)
+    _finish(plt, path, tight=True)
+
+
+def render_shap_dependence(path, index, shap_values, features, feature_names=None, figsize=(10, 6), **labels):
+    """SHAP dependence plot of one feature"""
+    plt, _ = _pyplot()
+    import shap
+    plt.figure(figsize=figsize)
+    shap.dependence_plot(index, shap_values, features, feature_names=feature_names, show=False)
+    _finish(plt, path, tight=True, **labels)
+
+
+def render_shap_force(path, expected_value, shap_values, features, feature_names=None, figsize=(16, 6), **labels):
+    """SHAP force plot explaining a single prediction"""
+    plt, _ = _pyplot()
+    import shap
+    plt.figure(figsize=figsize)
+    shap.force_plot(expected_value, shap_values, features, feature_names=feature_names,
+                    matplotlib=True, show=False)
+    _finish(plt, path, tight=True, **labels)
+
+
+RENDERERS = {
+    'histogram': render_histogram,
+    'bar': render_bar,
+    'series_bar': render_series_bar,
+    'stacked_bar': render_stacked_bar,
+    'boxplot': render_boxplot,
+    'heatmap': render_heatmap,
+    'curves': render_curves,
+    'importances': render_importances,
+    'scatter': render_scatter,
+    'shap_summary': render_shap_summary,
+    'shap_dependence': render_shap_dependence,
+    'shap_force': render_shap_force
+}
+
+
+def render_figure(spec):
+    """Render a single figure spec to its PNG file"""
+    RENDERERS[spec['kind']](spec['path'], **spec['data'])
+
+
+def _timed_render(spec):
+    """Render a figure spec and return its path and render time"""
+    start = time.perf_counter()
+    render_figure(spec)
+    return {'Figure': spec['path'], 'Render (s)': time.perf_counter() - start}
+
+
+def print_render_report(timings):
+    """Print the render time per figure, slowest first"""
+    report = pd.DataFrame(timings).sort_values('Render (s)', ascending=False)
+    print("\nFigure Render Times:")
+    print(report.to_string(index=False, float_format='{:.2f}'.format))
+    print(f"Total render time: {report['Render (s)'].sum():.2f} s")
+
+
+def render_figures(figures, n_jobs=-1, report=True):
+    """
+    Render figure specs, in a pool of worker processes when n_jobs allows
+
+    Parameters:
+    -----------
+    figures : list
+        Figure specs as collected by a FigureBook
+    n_jobs : int
+        Worker processes; -1 uses every core, 1 renders in this process
+    report : bool
+        Whether to print the render time of each figure
+
+    Returns:
+    --------
+    list
+        Path and render time of each figure
+    """
+    if n_jobs is None or n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(figures))
+
+    start = time.perf_counter()
+    if n_jobs <= 1:
+        timings = [_timed_render(spec) for spec in figures]
+    else:
+        # Workers import pyplot up front so the timings cover rendering only
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_pyplot) as pool:
+            timings = list(pool.map(_timed_render, figures))
+    elapsed = time.perf_counter() - start
+
+    print(f"Rendered {len(figures)} figures with {max(n_jobs, 1)} worker(s) in {elapsed:.2f} s")
+    if report and timings:
+        print_render_report(timings)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render figures from deferred plot data")
+    parser.add_argument('plot_data', help="plot data file saved by a pipeline run with --plots defer")
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="worker processes rendering the figures; -1 uses every core")
+    args = parser.parse_args()
+
+    render_figures(load_figures(args.plot_data), args.jobs)
@@ -0,0 +1,368 @@
+"""
+Talent Analytics: Workforce Statistics
+--------------------------------------
+This module provides mergeable accumulators for the workforce statistics
+reported by the pipelines. They are updated one chunk at a time, so the same
+code summarizes an in-memory dataframe or an HRIS export streamed from disk,
+and accumulators built on separate chunks can be merged.
+
+GroupedStats computes counts and means for several grouping columns in a
+single scan: each grouping column is reduced to integer codes (the
+categorical codes, or the values themselves for small integer columns) and
+every statistic is accumulated with np.bincount. CorrelationStats keeps the
+running counts, means and co-moments of every pair of numeric columns over
+the rows where both are present, and combines them with the pairwise update
+of Chan et al., giving the same correlation matrix as DataFrame.corr,
+missing values included, without holding the data in memory.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Integer columns spanning at most this many values are binned on the values
+# themselves instead of being factorized
+MAX_DIRECT_INT_RANGE = 1 << 16
+
+# Rows converted to float64 at a time when accumulating an in-memory frame
+DEFAULT_BLOCK_SIZE = 100_000
+
+
+class GroupedStats:
+    """
+    Employee counts and value means per group, for several grouping columns
+
+    Parameters:
+    -----------
+    by : list
+        Grouping columns
+    values : list or dict
+        Value columns to average per group, or a dict mapping a value name to
+        a column name or to a function of a chunk returning the values (for
+        example lambda chunk: chunk['OverTime'] == 'Yes')
+
+    Attributes:
+    -----------
+    n_rows : int
+        Employees seen so far
+    """
+
+    def __init__(self, by, values=()):
+        self.by = list(by)
+        self.values = dict(values) if isinstance(values, dict) else {value: value for value in values}
+        self.n_rows = 0
+
+        self._categorical = {col: False for col in self.by}
+        self._positions = {col: {} for col in self.by}
+        self._counts = {col: np.zeros(0, dtype=np.int64) for col in self.by}
+        self._sums = {col: {name: np.zeros(0) for name in self.values} for col in self.by}
+        self._value_counts = {col: {name: np.zeros(0, dtype=np.int64) for name in self.values}
+                              for col in self.by}
+        self._totals = {name: 0.0 for name in self.values}
+        self._total_counts = {name: 0 for name in self.values}
+
+    def _value_arrays(self, chunk):
+        arrays = {}
+        for name, source in self.values.items():
+            values = source(chunk) if callable(source) else chunk[source]
+            arrays[name] = np.asarray(values, dtype=float)
+        return arrays
+
+    def _codes(self, col, series):
+        """Integer codes of a grouping column in the accumulated label space, -1 for missing"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            self._categorical[col] = True
+            codes, labels = series.cat.codes.to_numpy(), series.cat.categories
+        elif series.dtype.kind in 'iu' and len(series) > 0 and \
+                int(series.max()) - int(series.min()) < MAX_DIRECT_INT_RANGE:
+            low = int(series.min())
+            codes = series.to_numpy().astype(np.int64) - low
+            labels = range(low, int(series.max()) + 1)
+        else:
+            codes, labels = pd.factorize(series, sort=True)
+
+        # Map the chunk's labels onto the labels seen so far; the extra last
+        # entry keeps missing values (code -1) at -1
+        positions = self._positions[col]
+        mapping = np.empty(len(labels) + 1, dtype=np.int64)
+        mapping[-1] = -1
+        for i, label in enumerate(labels):
+            mapping[i] = positions.setdefault(label, len(positions))
+        return mapping[codes]
+
+    def _grow(self, col):
+        size = len(self._positions[col])
+        grow = size - len(self._counts[col])
+        if grow > 0:
+            self._counts[col] = np.concatenate([self._counts[col], np.zeros(grow, dtype=np.int64)])
+            for name in self.values:
+                self._sums[col][name] = np.concatenate([self._sums[col][name], np.zeros(grow)])
+                self._value_counts[col][name] = np.concatenate(
+                    [self._value_counts[col][name], np.zeros(grow, dtype=np.int64)])
+        return size
+
+    def update(self, chunk):
+        """Add one chunk of employees to the statistics"""
+        values = self._value_arrays(chunk)
+        present = {name: ~np.isnan(array) for name, array in values.items()}
+        self.n_rows += len(chunk)
+
+        for name, array in values.items():
+            self._totals[name] += array[present[name]].sum()
+            self._total_counts[name] += int(present[name].sum())
+
+        for col in self.by:
+            codes = self._codes(col, chunk[col])
+            size = self._grow(col)
+
+            grouped = codes >= 0
+            self._counts[col] += np.bincount(codes[grouped], minlength=size)
+            for name, array in values.items():
+                keep = grouped & present[name]
+                self._sums[col][name] += np.bincount(codes[keep], weights=array[keep], minlength=size)
+                self._value_counts[col][name] += np.bincount(codes[keep], minlength=size)
+        return self
+
+    def merge(self, other):
+        """Add the statistics accumulated by another GroupedStats over the same columns"""
+        self.n_rows += other.n_rows
+        for name in self.values:
+            self._totals[name] += other._totals[name]
+            self._total_counts[name] += other._total_counts[name]
+
+        for col in self.by:
+            self._categorical[col] |= other._categorical[col]
+            positions = self._positions[col]
+            mapping = np.array([positions.setdefault(label, len(positions))
+                                for label in other._positions[col]], dtype=np.int64)
+            self._grow(col)
+
+            np.add.at(self._counts[col], mapping, other._counts[col])
+            for name in self.values:
+                np.add.at(self._sums[col][name], mapping, other._sums[col][name])
+                np.add.at(self._value_counts[col][name], mapping, other._value_counts[col][name])
+        return self
+
+    def _order(self, col):
+        """Label positions in report order: category order, or sorted labels"""
+        labels = list(self._positions[col])
+        order = np.arange(len(labels))
+        if not self._categorical[col]:
+            # Labels only seen as placeholders of an integer range are dropped
+            order = order[self._counts[col] > 0]
+            order = np.array(sorted(order, key=lambda i: labels[i]), dtype=np.int64)
+        return [labels[i] for i in order], order
+
+    def count(self, col):
+        """Employees per group of `col`"""
+        labels, order = self._order(col)
+        return pd.Series(self._counts[col][order], index=pd.Index(labels, name=col))
+
+    def mean(self, col, value):
+        """Mean of `value` per group of `col`; NaN for empty groups"""
+        labels, order = self._order(col)
+        sums = self._sums[col][value][order]
+        counts = self._value_counts[col][value][order]
+        means = np.divide(sums, counts, out=np.full(len(order), np.nan), where=counts > 0)
+        return pd.Series(means, index=pd.Index(labels, name=col), name=value)
+
+    def overall(self, value):
+        """Mean of `value` over every employee"""
+        count = self._total_counts[value]
+        return self._totals[value] / count if count else np.nan
+
+    def table(self):
+        """
+        Tidy table of the statistics
+
+        Returns:
+        --------
+        pd.DataFrame
+            One row per grouping column and group, plus an 'All' row, with
+            the employee Count and the mean of every value
+        """
+        frames = [pd.DataFrame({'Group': ['All'], 'Value': ['All'], 'Count': [self.n_rows],
+                                **{name: [self.overall(name)] for name in self.values}})]
+        for col in self.by:
+            count = self.count(col)
+            frames.append(pd.DataFrame({'Group': col, 'Value': count.index.astype(object),
+                                        'Count': count.to_numpy(),
+                                        **{name: self.mean(col, name).to_numpy() for name in self.values}}))
+        return pd.concat(frames, ignore_index=True)
+
+
+def grouped_stats(chunks, by, values=()):
+    """
+    Accumulate GroupedStats over a dataframe or an iterable of chunks
+
+    Parameters:
+    -----------
+    chunks : pd.DataFrame or iterable of pd.DataFrame
+        The HR data, whole or streamed (for example from hr_data.iter_hr_chunks)
+    by, values
+        As for GroupedStats
+
+    Returns:
+    --------
+    GroupedStats
+        The accumulated statistics
+    """
+    stats = GroupedStats(by, values)
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def group_table(table, col):
+    """
+    Rows of a GroupedStats.table for one grouping column
+
+    Parameters:
+    -----------
+    table : pd.DataFrame
+        Table returned by GroupedStats.table
+    col : str
+        Grouping column, or 'All' for the overall row
+
+    Returns:
+    --------
+    pd.DataFrame
+        The Count and value means of each group, indexed by group
+    """
+    rows = table[table['Group'] == col]
+    return rows.drop(columns=['Group', 'Value']).set_axis(pd.Index(rows['Value'].tolist(), name=col))
+
+
+class CorrelationStats:
+    """
+    Streaming, mergeable covariance and correlation of numeric columns
+
+    Each chunk contributes, for every pair of columns, the number of rows
+    where both values are present, the means and squared deviations of the
+    two columns over those rows and their co-moment (the sum of cross
+    products of the centered values). These are combined with the running
+    totals without loss of precision, so missing values are dropped pair by
+    pair, as by DataFrame.corr.
+
+    Parameters:
+    -----------
+    columns : list
+        Numeric columns to correlate
+
+    Attributes:
+    -----------
+    n_rows : int
+        Rows seen so far, complete or not
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.n_rows = 0
+        shape = (len(self.columns), len(self.columns))
+        # Entry [i, j] is taken over the rows where columns i and j are both
+        # present; _mean and _m2 are those of column i
+        self._count = np.zeros(shape)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._comoment = np.zeros(shape)
+
+    def _combine(self, n_rows, count, mean, m2, comoment):
+        total = self._count + count
+        weight = np.divide(count, total, out=np.zeros_like(total), where=total > 0)
+        delta = mean - self._mean
+        factor = self._count * weight
+        self._comoment += comoment + delta * delta.T * factor
+        self._m2 += m2 + delta ** 2 * factor
+        self._mean += delta * weight
+        self._count = total
+        self.n_rows += n_rows
+        return self
+
+    def update(self, chunk):
+        """Add one chunk of employees to the statistics"""
+        values = chunk[self.columns].to_numpy(dtype=float)
+        if len(values) == 0:
+            return self
+        n_columns = len(self.columns)
+        present = ~np.isnan(values)
+
+        if present.all():
+            mean = values.mean(axis=0)
+            centered = values - mean
+            count = np.full((n_columns, n_columns), float(len(values)))
+            means = np.repeat(mean[:, None], n_columns, axis=1)
+            m2 = np.repeat((centered ** 2).sum(axis=0)[:, None], n_columns, axis=1)
+            return self._combine(len(values), count, means, m2, centered.T @ centered)
+
+        # Shift each column by its mean over the chunk for precision, zero
+        # the missing values and sum over the rows where both are present
+        column_counts = present.sum(axis=0)
+        shift = np.where(present, values, 0.0).sum(axis=0) / np.maximum(column_counts, 1)
+        shifted = np.where(present, values - shift, 0.0)
+        mask = present.astype(float)
+
+        count = mask.T @ mask
+        sums = shifted.T @ mask
+        mean = np.divide(sums, count, out=np.zeros_like(sums), where=count > 0)
+        m2 = (shifted ** 2).T @ mask - sums * mean
+        comoment = shifted.T @ shifted - sums * mean.T
+        return self._combine(len(values), count, mean + shift[:, None], m2, comoment)
+
+    def merge(self, other):
+        """Add the statistics accumulated by another CorrelationStats over the same columns"""
+        return self._combine(other.n_rows, other._count, other._mean, other._m2, other._comoment)
+
+    def covariance(self):
+        """Sample covariance matrix; NaN for pairs with fewer than two complete rows"""
+        cov = np.divide(self._comoment, self._count - 1, out=np.full_like(self._comoment, np.nan),
+                        where=self._count > 1)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix; NaN where a column is constant over a pair's rows, as DataFrame.corr"""
+        scale = np.sqrt(self._m2 * self._m2.T)
+        corr = np.divide(self._comoment, scale, out=np.full_like(scale, np.nan), where=scale > 0)
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.diag(self._m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def top_correlated(self, target, k=10):
+        """
+        The `k` columns most strongly correlated with `target`
+
+        Returns:
+        --------
+        pd.Series
+            Signed correlations with `target`, strongest in absolute value first
+        """
+        corr = self.correlation()[target].drop(target).dropna()
+        return corr.loc[corr.abs().sort_values(ascending=False).index[:k]]
+
+
+def correlation_stats(chunks, columns, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Accumulate CorrelationStats over a dataframe or an iterable of chunks
+
+    Parameters:
+    -----------
+    chunks : pd.DataFrame or iterable of pd.DataFrame
+        The HR data, whole or streamed; a whole dataframe is processed in
+        blocks of `block_size` rows to bound the float64 working copy
+    columns : list
+        Numeric columns to correlate
+    block_size : int
+        Rows per block for a whole dataframe
+
+    Returns:
+    --------
+    CorrelationStats
+        The accumulated statistics
+    """
+    stats = CorrelationStats(columns)
+    if isinstance(chunks, pd.DataFrame):
+        df = chunks
+        chunks = (df.iloc[start:start + block_size] for start in range(0, len(df), block_size))
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
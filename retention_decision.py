@@ -1,440 +1,557 @@
-"""
-Workforce Optimization: Retention Decision Model
--------------------------------------------------
-This module creates a machine learning model that recommends which employees to retain
-or let go during downsizing operations, based on performance, cost, and attrition risk.
-"""
-
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
-from sklearn.calibration import calibration_curve
-import shap
-import pickle
-import warnings
-warnings.filterwarnings('ignore')
-
-# Set aesthetics for plots
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette('viridis')
-
-def load_data(file_path='PROJECT AND DATASET IN HERE/WA_Fn-UseC_-HR-Employee-Attrition.csv'):
-    """Load and perform initial preprocessing of the HR dataset"""
-    df = pd.read_csv(file_path)
-    
-    print(f"Dataset loaded: {df.shape[0]} employees with {df.shape[1]} attributes")
-    print(f"Attrition rate: {df['Attrition'].value_counts(normalize=True)['Yes']:.2%}")
-    
-    # Convert Attrition to binary
-    df['AttritionBinary'] = df['Attrition'].map({'Yes': 1, 'No': 0})
-    
-    return df
-
-def engineer_features(df):
-    """Create advanced HR analytics features for decision-making"""
-    print("Engineering strategic HR metrics...")
-    
-    # 1. Cost-to-Company (CTC) Estimation
-    def calculate_ctc(row):
-        """Calculate annual cost to company including benefits"""
-        base_annual = row['MonthlyIncome'] * 12
-        
-        # Add benefits percentage based on job level
-        benefits_multiplier = 1.0 + (row['JobLevel'] * 0.05)
-        
-        # Role-specific multipliers
-        role_multipliers = {
-            'Manager': 1.2,
-            'Research Director': 1.3,
-            'Healthcare Representative': 1.15,
-            'Manufacturing Director': 1.25,
-            'Sales Executive': 1.18,
-            'Research Scientist': 1.15,
-            'Laboratory Technician': 1.12,
-            'Human Resources': 1.1,
-            'Sales Representative': 1.15
-        }
-        
-        role_multiplier = role_multipliers.get(row['JobRole'], 1.1)
-        
-        return base_annual * benefits_multiplier * role_multiplier
-
-    # Apply CTC calculation
-    df['CTC'] = df.apply(calculate_ctc, axis=1)
-    
-    # 2. Performance Risk Score (higher = more risky)
-    df['PerformanceRisk'] = (5 - df['PerformanceRating']) + \
-                          (df['OverTime'] == 'Yes') * 2 + \
-                          (df['YearsSinceLastPromotion'] > 2) * 1.5 + \
-                          (4 - df['WorkLifeBalance']) * 1.5
-
-    # 3. Retention Priority Score (higher = more valuable to retain)
-    df['RetentionPriorityScore'] = ((df['JobLevel'] + df['PerformanceRating']) / 
-                                  (np.log1p(df['MonthlyIncome']))) * 100
-    
-    # 4. Critical Role Flag (based on role and level)
-    critical_roles = ['Research Director', 'Manager', 'Manufacturing Director', 'Healthcare Representative']
-    df['CriticalRole'] = ((df['JobRole'].isin(critical_roles)) | 
-                        (df['JobLevel'] >= 4)).astype(int)
-    
-    # 5. Satisfaction Composite Score
-    satisfaction_cols = ['JobSatisfaction', 'EnvironmentSatisfaction', 
-                        'RelationshipSatisfaction', 'WorkLifeBalance']
-    df['SatisfactionComposite'] = df[satisfaction_cols].mean(axis=1)
-    
-    # 6. Engagement Score
-    df['EngagementScore'] = (df['JobInvolvement'] * 0.4 + 
-                          df['EnvironmentSatisfaction'] * 0.3 +
-                          df['JobSatisfaction'] * 0.3)
-    
-    # 7. Career Growth Potential
-    df['CareerGrowthPotential'] = ((5 - df['YearsSinceLastPromotion']) * 0.4 + 
-                                df['TrainingTimesLastYear'] * 0.3 +
-                                df['PerformanceRating'] * 0.3)
-    
-    # 8. Productivity to Cost Ratio (higher = more value for money)
-    df['ProductivityCostRatio'] = (df['PerformanceRating'] * df['JobInvolvement']) / \
-                                (df['CTC'] / df['CTC'].median())
-                                
-    print("Feature engineering complete.")
-    print(f"Sample engineered features for first employee:\n{df[['CTC', 'PerformanceRisk', 'RetentionPriorityScore', 'CriticalRole', 'ProductivityCostRatio']].iloc[0]}")
-    
-    return df
-
-def create_decision_labels(df):
-    """Create target variable for the Keep or Let Go decision model"""
-    print("Creating decision labels for training...")
-    
-    # Define the decision logic for training
-    def decision_logic(row):
-        """Decision logic for whether to Keep (0) or Let Go (1) an employee"""
-        
-        # Always keep critical roles
-        if row['CriticalRole'] == 1:
-            return 0  # Keep
-        
-        # Let go high attrition risk, low performers with high cost
-        if ((row['AttritionBinary'] == 1 or row['PerformanceRisk'] > 5) and
-            row['PerformanceRating'] <= 3 and
-            row['CTC'] > df['CTC'].median() and
-            row['ProductivityCostRatio'] < df['ProductivityCostRatio'].median()):
-            return 1  # Let Go
-        
-        # Keep high performers, highly engaged, and satisfied employees
-        if ((row['PerformanceRating'] >= 4) or
-            (row['EngagementScore'] >= 4 and row['SatisfactionComposite'] >= 3.5)):
-            return 0  # Keep
-        
-        # For borderline cases, use the retention priority score
-        return 1 if row['RetentionPriorityScore'] < df['RetentionPriorityScore'].median() else 0
-    
-    # Apply the decision logic
-    df['RetentionDecision'] = df.apply(decision_logic, axis=1)
-    
-    # Label explanation (0 = Keep, 1 = Let Go)
-    print(f"Decision distribution: Keep: {df['RetentionDecision'].value_counts()[0]} employees, "
-          f"Let Go: {df['RetentionDecision'].value_counts()[1]} employees")
-    print(f"Percentage recommended for letting go: {df['RetentionDecision'].mean():.2%}")
-    
-    # Calculate potential cost savings
-    potential_savings = df[df['RetentionDecision'] == 1]['CTC'].sum()
-    print(f"Potential annual cost savings: ${potential_savings:,.2f}")
-    
-    return df
-
-def build_retention_model(df):
-    """Build and evaluate the retention decision model"""
-    print("\nBuilding retention decision model...")
-    
-    # Prepare data
-    # Remove unnecessary columns
-    cols_to_drop = ['Attrition', 'AttritionBinary', 'RetentionDecision', 
-                   'EmployeeCount', 'EmployeeNumber', 'StandardHours', 'Over18']
-    
-    X = df.drop(cols_to_drop, axis=1)
-    y = df['RetentionDecision']
-    
-    # Identify categorical and numerical columns
-    cat_cols = X.select_dtypes(include=['object']).columns.tolist()
-    num_cols = X.select_dtypes(include=['int64', 'float64']).columns.tolist()
-    
-    # Create preprocessing pipeline
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), num_cols),
-            ('cat', OneHotEncoder(drop='first', handle_unknown='ignore'), cat_cols)
-        ],
-        remainder='drop'
-    )
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.25, random_state=42, stratify=y)
-    
-    # Create model pipeline
-    model_pipeline = Pipeline([
-        ('preprocessor', preprocessor),
-        ('classifier', GradientBoostingClassifier(random_state=42))
-    ])
-    
-    # Grid search for hyperparameter tuning
-    param_grid = {
-        'classifier__n_estimators': [100, 200],
-        'classifier__learning_rate': [0.05, 0.1],
-        'classifier__max_depth': [3, 4, 5]
-    }
-    
-    print("Performing grid search for optimal hyperparameters...")
-    grid_search = GridSearchCV(
-        model_pipeline, param_grid, cv=5, scoring='roc_auc', n_jobs=-1)
-    grid_search.fit(X_train, y_train)
-    
-    best_model = grid_search.best_estimator_
-    print(f"Best parameters: {grid_search.best_params_}")
-    
-    # Evaluate model performance
-    y_pred = best_model.predict(X_test)
-    y_pred_proba = best_model.predict_proba(X_test)[:, 1]
-    
-    print("\nModel Performance:")
-    print(classification_report(y_test, y_pred))
-    print(f"ROC AUC Score: {roc_auc_score(y_test, y_pred_proba):.4f}")
-    
-    # Plot ROC curve
-    plt.figure(figsize=(10, 6))
-    fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
-    plt.plot(fpr, tpr, label=f'ROC Curve (AUC = {roc_auc_score(y_test, y_pred_proba):.4f})')
-    plt.plot([0, 1], [0, 1], 'k--')
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title('ROC Curve for Retention Decision Model')
-    plt.legend()
-    plt.savefig('retention_decision_roc.png')
-    plt.close()
-    
-    # Calibration plot - checks if probabilities are accurate
-    plt.figure(figsize=(10, 6))
-    prob_true, prob_pred = calibration_curve(y_test, y_pred_proba, n_bins=10)
-    plt.plot(prob_pred, prob_true, marker='o', linewidth=1)
-    plt.plot([0, 1], [0, 1], 'k--')
-    plt.xlabel('Predicted Probability')
-    plt.ylabel('True Probability')
-    plt.title('Calibration Plot for Retention Decision Model')
-    plt.savefig('retention_decision_calibration.png')
-    plt.close()
-    
-    # Generate feature importance plot instead of SHAP
-    print("\nGenerating feature importance plot...")
-    try:
-        # Get feature names
-        feature_names = num_cols + [f"{col}_{cat}" for col in cat_cols 
-                                  for cat in best_model.named_steps['preprocessor']
-                                  .named_transformers_['cat'].get_feature_names_out([col])]
-        
-        # Get feature importances
-        importances = best_model.named_steps['classifier'].feature_importances_
-        indices = np.argsort(importances)[::-1]
-        
-        # Plot feature importances
-        plt.figure(figsize=(12, 8))
-        plt.title('Feature Importances for Retention Decisions')
-        plt.barh(range(min(20, len(indices))), 
-                importances[indices[:20]],
-                align='center')
-        plt.yticks(range(min(20, len(indices))), 
-                  [feature_names[i] for i in indices[:20]])
-        plt.xlabel('Relative Importance')
-        plt.tight_layout()
-        plt.savefig('retention_feature_importance.png')
-        plt.close()
-        
-        print("\nTop 10 most important features:")
-        for i in range(min(10, len(indices))):
-            print(f"{i+1}. {feature_names[indices[i]]}: {importances[indices[i]]:.4f}")
-            
-    except Exception as e:
-        print(f"\nWarning: Could not generate feature importance plot: {str(e)}")
-        print("Continuing with model saving...")
-    
-    # Save the model
-    print("\nSaving model to 'retention_decision_model.pkl'")
-    with open('retention_decision_model.pkl', 'wb') as f:
-        pickle.dump(best_model, f)
-    
-    return best_model
-
-def analyze_results(df, model):
-    """Analyze and visualize the model results"""
-    print("\nAnalyzing retention decisions...")
-    
-    # Generate predictions for all employees
-    X = df.drop(['Attrition', 'AttritionBinary', 'RetentionDecision', 
-                'EmployeeCount', 'EmployeeNumber', 'StandardHours', 'Over18'], axis=1)
-    
-    df['RetentionProbability'] = model.predict_proba(X)[:, 1]
-    df['RetentionRecommendation'] = model.predict(X)
-    
-    # Create risk categories for visualization
-    def categorize_risk(prob):
-        if prob < 0.3:
-            return 'Low Risk (Keep)'
-        elif prob < 0.7:
-            return 'Medium Risk'
-        else:
-            return 'High Risk (Let Go)'
-    
-    df['RetentionRiskCategory'] = df['RetentionProbability'].apply(categorize_risk)
-    
-    # Department analysis
-    dept_analysis = df.groupby('Department')['RetentionRecommendation'].agg(
-        ['count', 'mean']).reset_index()
-    dept_analysis.columns = ['Department', 'EmployeeCount', 'LetGoPercentage']
-    dept_analysis['LetGoPercentage'] = dept_analysis['LetGoPercentage'] * 100
-    
-    print("\nDepartment Analysis:")
-    print(dept_analysis.sort_values('LetGoPercentage', ascending=False))
-    
-    # Job Level analysis
-    level_analysis = df.groupby('JobLevel')['RetentionRecommendation'].agg(
-        ['count', 'mean']).reset_index()
-    level_analysis.columns = ['JobLevel', 'EmployeeCount', 'LetGoPercentage']
-    level_analysis['LetGoPercentage'] = level_analysis['LetGoPercentage'] * 100
-    
-    print("\nJob Level Analysis:")
-    print(level_analysis.sort_values('JobLevel'))
-    
-    # Cost analysis
-    current_cost = df['CTC'].sum()
-    retained_cost = df[df['RetentionRecommendation'] == 0]['CTC'].sum()
-    savings = current_cost - retained_cost
-    
-    print(f"\nCost Analysis:")
-    print(f"Current Annual Cost: ${current_cost:,.2f}")
-    print(f"Cost After Optimization: ${retained_cost:,.2f}")
-    print(f"Annual Savings: ${savings:,.2f} ({savings/current_cost:.2%})")
-    
-    # Export for visualization
-    print("\nExporting data for visualization...")
-    tableau_export = df[['EmployeeNumber', 'Age', 'Department', 'JobRole', 'Gender',
-                     'MonthlyIncome', 'CTC', 'PerformanceRating', 'JobLevel',
-                     'PerformanceRisk', 'RetentionPriorityScore', 'CriticalRole',
-                     'SatisfactionComposite', 'OverTime', 'YearsAtCompany',
-                     'EngagementScore', 'CareerGrowthPotential', 'ProductivityCostRatio',
-                     'RetentionProbability', 'RetentionRiskCategory', 'RetentionRecommendation']]
-    
-    tableau_export.to_csv('retention_dashboard_data.csv', index=False)
-    
-    # Create a few key visualizations
-    # 1. Department recommendations
-    plt.figure(figsize=(12, 6))
-    dept_keep = df[df['RetentionRecommendation'] == 0].groupby('Department').size()
-    dept_let_go = df[df['RetentionRecommendation'] == 1].groupby('Department').size()
-    
-    dept_df = pd.DataFrame({'Keep': dept_keep, 'Let Go': dept_let_go}).fillna(0)
-    dept_df.plot(kind='bar', stacked=True, colormap='viridis')
-    plt.title('Retention Recommendations by Department')
-    plt.xlabel('Department')
-    plt.ylabel('Number of Employees')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig('retention_by_department.png')
-    plt.close()
-    
-    # 2. Performance vs Cost with Recommendations
-    plt.figure(figsize=(12, 8))
-    sns.scatterplot(
-        data=df,
-        x='PerformanceRating',
-        y='CTC',
-        hue='RetentionRiskCategory',
-        size='JobLevel',
-        sizes=(50, 200),
-        alpha=0.7
-    )
-    plt.title('Performance vs. Cost with Retention Recommendations')
-    plt.xlabel('Performance Rating')
-    plt.ylabel('Annual Cost (CTC)')
-    plt.tight_layout()
-    plt.savefig('performance_vs_cost.png')
-    plt.close()
-    
-    return df
-
-def main():
-    """Main function to run the retention decision model"""
-    print("=" * 80)
-    print("WORKFORCE OPTIMIZATION: RETENTION DECISION MODEL")
-    print("=" * 80)
-    
-    # Load the data
-    df = load_data()
-    
-    # Feature engineering
-    df = engineer_features(df)
-    
-    # Create decision labels
-    df = create_decision_labels(df)
-    
-    # Build the model
-    model = build_retention_model(df)
-    
-    # Analyze results
-    df = analyze_results(df, model)
-    
-    print("\nModel development complete. Results saved to files:")
-    print("- retention_decision_model.pkl (Model file)")
-    print("- retention_dashboard_data.csv (Data for visualization)")
-    print("- retention_feature_importance.png (Feature importance)")
-    print("- retention_by_department.png (Department recommendations)")
-    print("- performance_vs_cost.png (Performance vs. Cost visualization)")
-    
-    # Sample API code for deployment
-    print("\nSample code for using the model in an API:")
-    print("""
-    # Flask API code
-    from flask import Flask, request, jsonify
-    import pickle
-    import pandas as pd
-    
-    app = Flask(__name__)
-    
-    # Load the model
-    with open('retention_decision_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    
-    @app.route('/predict', methods=['POST'])
-    def predict():
-        # Get data from request
-        data = request.json
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data['employees'])
-        
-        # Make predictions
-        probabilities = model.predict_proba(df)[:, 1]
-        decisions = model.predict(df)
-        
-        # Create response
-        results = []
-        for i, employee_id in enumerate(df['EmployeeNumber'] if 'EmployeeNumber' in df.columns else range(len(df))):
-            results.append({
-                'employee_id': employee_id,
-                'retention_decision': 'Let Go' if decisions[i] == 1 else 'Keep',
-                'confidence': float(probabilities[i] if decisions[i] == 1 else 1 - probabilities[i])
-            })
-        
-        return jsonify({"predictions": results})
-    
-    if __name__ == '__main__':
-        app.run(debug=True)
-    """)
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+"""
+Workforce Optimization: Retention Decision Model
+-------------------------------------------------
+This module creates a machine learning model that recommends which employees to retain
+or let go during downsizing operations, based on performance, cost, and attrition risk.
+"""
+
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
+from sklearn.calibration import calibration_curve
+import pickle
+import json
+import argparse
+import time
+from hr_data import (DEFAULT_DATA_PATH, DEFAULT_CHUNK_SIZE, MODEL_COLUMNS, load_hr_data,
+                     apply_schema, memory_report)
+from hr_features import (DEFAULT_ROLE_MULTIPLIER, RetentionFeatureTransformer,
+                         add_retention_features, calculate_ctc)
+from hr_feature_store import FeatureStore, preprocessing_memory
+from hr_cv import FoldManager
+from hr_models import (SEARCH_MODES, HALVING_RESOURCES, BOOSTING_BACKENDS, MATRIX_FORMATS, boosting_steps,
+                       boosting_param_grid, hyperparameter_search, feature_importances)
+from hr_encoders import CATEGORICAL_ENCODERS
+from hr_plots import FigureBook, PLOT_MODES, scatter_sample
+from hr_incremental import (EMPLOYEE_KEY, diff_snapshots, load_stats, save_stats,
+                            stats_drifted, patch_export)
+import warnings
+warnings.filterwarnings('ignore')
+
+# Columns exported for the retention dashboard
+DASHBOARD_COLUMNS = ['EmployeeNumber', 'Age', 'Department', 'JobRole', 'Gender',
+                     'MonthlyIncome', 'CTC', 'PerformanceRating', 'JobLevel',
+                     'PerformanceRisk', 'RetentionPriorityScore', 'CriticalRole',
+                     'SatisfactionComposite', 'OverTime', 'YearsAtCompany',
+                     'EngagementScore', 'CareerGrowthPotential', 'ProductivityCostRatio',
+                     'RetentionProbability', 'RetentionRiskCategory', 'RetentionRecommendation']
+
+# Labels and identifiers left out of the model inputs
+NON_FEATURE_COLUMNS = ['Attrition', 'AttritionBinary', 'RetentionDecision',
+                       'EmployeeCount', 'EmployeeNumber', 'StandardHours', 'Over18']
+
+# Hyperparameters tuned for the retention decision model
+PARAM_GRID = {
+    'classifier__n_estimators': [100, 200],
+    'classifier__learning_rate': [0.05, 0.1],
+    'classifier__max_depth': [3, 4, 5]
+}
+
+def load_data(file_path=DEFAULT_DATA_PATH, chunksize=DEFAULT_CHUNK_SIZE, use_cache=True):
+    """Load (from the Parquet cache or streaming the CSV) and preprocess the HR dataset"""
+    df, summary = load_hr_data(file_path, chunksize=chunksize, columns=MODEL_COLUMNS,
+                               use_cache=use_cache)
+    
+    print(f"Dataset loaded: {df.shape[0]} employees with {df.shape[1]} attributes")
+    print(f"Attrition rate: {summary.attrition_pct['Yes'] / 100:.2%}")
+    
+    # Convert Attrition to binary
+    df['AttritionBinary'] = (df['Attrition'] == 'Yes').astype('int8')
+    
+    return apply_schema(df)
+
+def load_role_multipliers(file_path):
+    """Load the role-specific CTC multiplier table from a JSON file
+    
+    The file maps each JobRole to its multiplier, e.g. {"Manager": 1.2}.
+    Roles missing from the table fall back to DEFAULT_ROLE_MULTIPLIER.
+    """
+    with open(file_path) as f:
+        role_multipliers = json.load(f)
+    
+    print(f"Loaded CTC multipliers for {len(role_multipliers)} job roles from {file_path}")
+    return {role: float(multiplier) for role, multiplier in role_multipliers.items()}
+
+def engineer_features(df, role_multipliers=None, default_role_multiplier=DEFAULT_ROLE_MULTIPLIER, store=None):
+    """Create advanced HR analytics features for decision-making, reusing cached columns from `store`"""
+    print("Engineering strategic HR metrics...")
+    
+    df = add_retention_features(df, role_multipliers, default_role_multiplier, store=store)
+    if store is not None:
+        print(f"Feature store: {store.hits} cached, {store.misses} computed")
+    
+    print("Feature engineering complete.")
+    print(f"Sample engineered features for first employee:\n{df[['CTC', 'PerformanceRisk', 'RetentionPriorityScore', 'CriticalRole', 'ProductivityCostRatio']].iloc[0]}")
+    
+    return df
+
+def create_decision_labels(df):
+    """Create target variable for the Keep or Let Go decision model"""
+    print("Creating decision labels for training...")
+    
+    # Population thresholds are computed once instead of once per employee
+    ctc_median = df['CTC'].median()
+    productivity_median = df['ProductivityCostRatio'].median()
+    priority_median = df['RetentionPriorityScore'].median()
+    
+    # Decision rules as (mask, decision) pairs for Keep (0) or Let Go (1),
+    # evaluated in priority order so the first matching rule wins
+    decision_rules = [
+        # Always keep critical roles
+        (df['CriticalRole'] == 1, 0),
+        
+        # Let go high attrition risk, low performers with high cost
+        (((df['AttritionBinary'] == 1) | (df['PerformanceRisk'] > 5)) &
+         (df['PerformanceRating'] <= 3) &
+         (df['CTC'] > ctc_median) &
+         (df['ProductivityCostRatio'] < productivity_median), 1),
+        
+        # Keep high performers, highly engaged, and satisfied employees
+        ((df['PerformanceRating'] >= 4) |
+         ((df['EngagementScore'] >= 4) & (df['SatisfactionComposite'] >= 3.5)), 0)
+    ]
+    
+    # For borderline cases, use the retention priority score
+    borderline_decision = (df['RetentionPriorityScore'] < priority_median).astype(int)
+    
+    # Apply the decision rules column-wise
+    df['RetentionDecision'] = np.select([mask for mask, _ in decision_rules],
+                                        [decision for _, decision in decision_rules],
+                                        default=borderline_decision)
+    df = apply_schema(df)
+    
+    # Label explanation (0 = Keep, 1 = Let Go)
+    print(f"Decision distribution: Keep: {df['RetentionDecision'].value_counts()[0]} employees, "
+          f"Let Go: {df['RetentionDecision'].value_counts()[1]} employees")
+    print(f"Percentage recommended for letting go: {df['RetentionDecision'].mean():.2%}")
+    
+    # Calculate potential cost savings
+    potential_savings = df[df['RetentionDecision'] == 1]['CTC'].sum()
+    print(f"Potential annual cost savings: ${potential_savings:,.2f}")
+    
+    return df
+
+def retention_pipeline(X, role_multipliers=None, memory=None, backend='gradient_boosting', matrix_format='auto',
+                       encoder='onehot'):
+    """
+    Unfitted retention decision pipeline for the columns of `X`
+    
+    The feature step recomputes the engineered features with the CTC median
+    of the training data, so the saved model can score single employees. The
+    preprocessor and classifier depend on the gradient boosting `backend`,
+    and the one-hot encoded matrix is kept sparse or densified as
+    `matrix_format` says; `encoder` replaces the one-hot encoding with a
+    bounded-width one (see hr_models.boosting_steps and hr_encoders).
+    """
+    # Identify categorical and numerical columns
+    cat_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
+    num_cols = X.select_dtypes(include='number').columns.tolist()
+    
+    # Create preprocessing and classifier steps
+    preprocessor, classifier = boosting_steps(num_cols, cat_cols, backend, matrix_format=matrix_format,
+                                              encoder=encoder)
+    
+    return Pipeline([
+        ('features', RetentionFeatureTransformer(role_multipliers=role_multipliers)),
+        ('preprocessor', preprocessor),
+        ('classifier', classifier)
+    ], memory=memory)
+
+def build_retention_model(df, role_multipliers=None, figures=None, memory=None, search='grid',
+                          search_resource='n_samples', backend='gradient_boosting', cv_cache=True,
+                          matrix_format='auto', encoder='onehot'):
+    """
+    Build and evaluate the retention decision model, adding its figures to `figures` (rendered right away when not given)
+    
+    With a joblib.Memory, the feature and preprocessor steps are fitted once
+    per cross-validation fold and reused by every grid search setting. The
+    hyperparameters are tuned by an exhaustive grid search or by successive
+    halving over `search_resource` (see hr_models.hyperparameter_search),
+    for the gradient boosting `backend`. With `cv_cache`, the out-of-fold
+    predictions of the grid search are kept on disk and later runs on the
+    same data only fit the settings they have not seen (see hr_cv.FoldManager).
+    `matrix_format` keeps the one-hot encoded matrix sparse or densifies it,
+    and `encoder` picks the categorical encoding (see retention_pipeline).
+    """
+    print("\nBuilding retention decision model...")
+    
+    if figures is None:
+        figures = FigureBook()
+    
+    # Prepare data
+    # Remove unnecessary columns
+    X = df.drop(NON_FEATURE_COLUMNS, axis=1, errors='ignore')
+    y = df['RetentionDecision']
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.25, random_state=42, stratify=y)
+    
+    # Create model pipeline
+    model_pipeline = retention_pipeline(X, role_multipliers, memory, backend, matrix_format, encoder)
+    
+    # Grid search for hyperparameter tuning
+    print(f"Performing {search.replace('_', ' ')} search for optimal hyperparameters...")
+    start = time.perf_counter()
+    folds = FoldManager(X_train, y_train, store=None if cv_cache else False)
+    grid_search = hyperparameter_search(model_pipeline, boosting_param_grid(PARAM_GRID, backend),
+                                        search, search_resource, folds=folds)
+    grid_search.fit(X_train, y_train)
+    
+    best_model = grid_search.best_estimator_.set_params(memory=None)
+    print(f"Best parameters: {grid_search.best_params_}")
+    print(f"{search.replace('_', ' ').capitalize()} search took {time.perf_counter() - start:.2f}s "
+          f"({'cached' if memory is not None else 'uncached'} preprocessing)")
+    print(f"Cross-validation folds: {folds.fits} fitted, {folds.reused} reused from the fold cache")
+    
+    # Evaluate model performance
+    y_pred = best_model.predict(X_test)
+    y_pred_proba = best_model.predict_proba(X_test)[:, 1]
+    
+    print("\nModel Performance:")
+    print(classification_report(y_test, y_pred))
+    print(f"ROC AUC Score: {roc_auc_score(y_test, y_pred_proba):.4f}")
+    
+    # Plot ROC curve
+    if figures.enabled:
+        fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
+        figures.add('curves', 'retention_decision_roc.png',
+                    curves=[(f'ROC Curve (AUC = {roc_auc_score(y_test, y_pred_proba):.4f})', fpr, tpr)],
+                    xlabel='False Positive Rate', ylabel='True Positive Rate',
+                    title='ROC Curve for Retention Decision Model')
+    
+    # Calibration plot - checks if probabilities are accurate
+    if figures.enabled:
+        prob_true, prob_pred = calibration_curve(y_test, y_pred_proba, n_bins=10)
+        figures.add('curves', 'retention_decision_calibration.png', curves=[(None, prob_pred, prob_true)],
+                    marker='o', xlabel='Predicted Probability', ylabel='True Probability',
+                    title='Calibration Plot for Retention Decision Model')
+    
+    # Generate feature importance plot instead of SHAP
+    print("\nGenerating feature importance plot...")
+    try:
+        # Get feature names from the fitted preprocessor, without the num__
+        # and cat__ prefixes; each categorical encoder names its own columns
+        feature_names = [name.split('__', 1)[-1] for name in
+                         best_model.named_steps['preprocessor'].get_feature_names_out()]
+        
+        # Get feature importances, measured on the test set when the
+        # classifier has no built-in ones
+        importances = feature_importances(best_model, X_test, y_test)
+        indices = np.argsort(importances)[::-1]
+        
+        # Plot feature importances
+        figures.add('importances', 'retention_feature_importance.png',
+                    names=[feature_names[i] for i in indices[:20]], importances=importances[indices[:20]],
+                    title='Feature Importances for Retention Decisions', xlabel='Relative Importance')
+        
+        print("\nTop 10 most important features:")
+        for i in range(min(10, len(indices))):
+            print(f"{i+1}. {feature_names[indices[i]]}: {importances[indices[i]]:.4f}")
+            
+    except Exception as e:
+        print(f"\nWarning: Could not generate feature importance plot: {str(e)}")
+        print("Continuing with model saving...")
+    
+    # Save the model
+    print("\nSaving model to 'retention_decision_model.pkl'")
+    with open('retention_decision_model.pkl', 'wb') as f:
+        pickle.dump(best_model, f)
+    
+    return best_model
+
+def score_retention_decisions(df, model):
+    """Add retention probabilities, recommendations and risk categories for employees"""
+    # Generate predictions for all employees
+    X = df.drop(NON_FEATURE_COLUMNS, axis=1, errors='ignore')
+    
+    df['RetentionProbability'] = model.predict_proba(X)[:, 1]
+    df['RetentionRecommendation'] = model.predict(X)
+    
+    # Create risk categories for visualization
+    def categorize_risk(prob):
+        if prob < 0.3:
+            return 'Low Risk (Keep)'
+        elif prob < 0.7:
+            return 'Medium Risk'
+        else:
+            return 'High Risk (Let Go)'
+    
+    df['RetentionRiskCategory'] = df['RetentionProbability'].apply(categorize_risk)
+    
+    return df
+
+def analyze_results(df, model, export_path='retention_dashboard_data.csv', figures=None):
+    """Analyze and visualize the model results, adding the figures to `figures` (rendered right away when not given)"""
+    print("\nAnalyzing retention decisions...")
+    
+    # Generate predictions for all employees
+    df = score_retention_decisions(df, model)
+    
+    # Department analysis
+    dept_analysis = df.groupby('Department')['RetentionRecommendation'].agg(
+        ['count', 'mean']).reset_index()
+    dept_analysis.columns = ['Department', 'EmployeeCount', 'LetGoPercentage']
+    dept_analysis['LetGoPercentage'] = dept_analysis['LetGoPercentage'] * 100
+    
+    print("\nDepartment Analysis:")
+    print(dept_analysis.sort_values('LetGoPercentage', ascending=False))
+    
+    # Job Level analysis
+    level_analysis = df.groupby('JobLevel')['RetentionRecommendation'].agg(
+        ['count', 'mean']).reset_index()
+    level_analysis.columns = ['JobLevel', 'EmployeeCount', 'LetGoPercentage']
+    level_analysis['LetGoPercentage'] = level_analysis['LetGoPercentage'] * 100
+    
+    print("\nJob Level Analysis:")
+    print(level_analysis.sort_values('JobLevel'))
+    
+    # Cost analysis
+    current_cost = df['CTC'].sum()
+    retained_cost = df[df['RetentionRecommendation'] == 0]['CTC'].sum()
+    savings = current_cost - retained_cost
+    
+    print(f"\nCost Analysis:")
+    print(f"Current Annual Cost: ${current_cost:,.2f}")
+    print(f"Cost After Optimization: ${retained_cost:,.2f}")
+    print(f"Annual Savings: ${savings:,.2f} ({savings/current_cost:.2%})")
+    
+    # Export for visualization, with the statistics used to score it so that
+    # later snapshots can be scored incrementally
+    print("\nExporting data for visualization...")
+    tableau_export = df[DASHBOARD_COLUMNS]
+    
+    tableau_export.to_csv(export_path, index=False)
+    save_stats({'ctc_median': float(df['CTC'].median())}, export_path)
+    
+    # Create a few key visualizations
+    if figures is None:
+        figures = FigureBook()
+    
+    # 1. Department recommendations
+    if figures.enabled:
+        dept_keep = df[df['RetentionRecommendation'] == 0].groupby('Department').size()
+        dept_let_go = df[df['RetentionRecommendation'] == 1].groupby('Department').size()
+        
+        dept_df = pd.DataFrame({'Keep': dept_keep, 'Let Go': dept_let_go}).fillna(0)
+        figures.add('stacked_bar', 'retention_by_department.png', table=dept_df,
+                    title='Retention Recommendations by Department', xlabel='Department',
+                    ylabel='Number of Employees', rotation=45, tight=True)
+    
+    # 2. Performance vs Cost with Recommendations
+    if figures.enabled:
+        figures.add('scatter', 'performance_vs_cost.png',
+                    points=scatter_sample(df, ['PerformanceRating', 'CTC', 'RetentionRiskCategory', 'JobLevel']),
+                    x='PerformanceRating', y='CTC', hue='RetentionRiskCategory', size='JobLevel',
+                    title='Performance vs. Cost with Retention Recommendations',
+                    xlabel='Performance Rating', ylabel='Annual Cost (CTC)', tight=True)
+    
+    return df
+
+def update_retention_decisions(file_path, previous_path, model, role_multipliers=None,
+                               export_path='retention_dashboard_data.csv', tolerance=0.01):
+    """Incrementally rescore a new HRIS snapshot against the previous one
+    
+    Employees are matched by EmployeeNumber and a hash of their record; only
+    new and changed employees are re-engineered and rescored, and the dashboard
+    export is patched in place. The CTC median behind ProductivityCostRatio is
+    recomputed only when the delta can move it, and everyone is rescored if it
+    drifts by more than `tolerance`.
+    """
+    print("\nUpdating retention decisions incrementally...")
+    
+    current, _ = load_hr_data(file_path, columns=MODEL_COLUMNS)
+    previous, _ = load_hr_data(previous_path, columns=MODEL_COLUMNS)
+    delta = diff_snapshots(previous, current)
+    print(f"Snapshot delta: {delta}")
+    
+    current['AttritionBinary'] = (current['Attrition'] == 'Yes').astype('int8')
+    current = apply_schema(current)
+    
+    # Reuse the CTC median the export was scored with unless the delta moves it
+    stats = load_stats(export_path)
+    full_rescore = stats is None
+    if full_rescore or delta.touches(['MonthlyIncome', 'JobLevel', 'JobRole']):
+        new_stats = {'ctc_median': float(calculate_ctc(current, role_multipliers).median())}
+        if full_rescore:
+            print("No previous export to patch, scoring every employee")
+            stats = new_stats
+        elif stats_drifted(stats, new_stats, tolerance):
+            print("CTC median drifted, rescoring every employee")
+            stats, full_rescore = new_stats, True
+    
+    if full_rescore:
+        to_score = current
+    else:
+        to_score = current[current[EMPLOYEE_KEY].isin(delta.rescore_ids)]
+    
+    scored = add_retention_features(to_score.copy(), role_multipliers, ctc_median=stats['ctc_median'])
+    scored = score_retention_decisions(scored, model)
+    
+    if full_rescore:
+        scored[DASHBOARD_COLUMNS].to_csv(export_path, index=False)
+        save_stats(stats, export_path)
+    else:
+        patch_export(export_path, scored[DASHBOARD_COLUMNS], delta.removed_ids, current[EMPLOYEE_KEY])
+    
+    print(f"Rescored {len(scored)} of {len(current)} employees; "
+          f"dashboard data updated in '{export_path}'")
+    
+    return scored
+
+def main(file_path=DEFAULT_DATA_PATH, role_multipliers_file=None, previous_path=None,
+         model_path='retention_decision_model.pkl', use_feature_store=True, plots='render',
+         plot_data_path='retention_plot_data.pkl', plot_jobs=-1, use_preprocessing_cache=True,
+         search='grid', search_resource='n_samples', boosting_backend='gradient_boosting',
+         use_cv_cache=True, matrix_format='auto', encoder='onehot'):
+    """Main function to run the retention decision model"""
+    print("=" * 80)
+    print("WORKFORCE OPTIMIZATION: RETENTION DECISION MODEL")
+    print("=" * 80)
+    
+    role_multipliers = load_role_multipliers(role_multipliers_file) if role_multipliers_file else None
+    
+    # Incremental mode: rescore only what changed since the previous snapshot
+    if previous_path:
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        update_retention_decisions(file_path, previous_path, model, role_multipliers)
+        return
+    
+    # Track the memory footprint of the employee dataframe per stage
+    memory_log = []
+    
+    # Figures are rendered at the end of the run in plot_jobs worker processes,
+    # deferred to plot_data_path or skipped
+    figures = FigureBook(plots, n_jobs=plot_jobs)
+    
+    # Load the data
+    df = load_data(file_path)
+    memory_report(df, 'load', memory_log)
+    
+    # Feature engineering
+    df = engineer_features(df, role_multipliers, store=FeatureStore() if use_feature_store else None)
+    memory_report(df, 'engineer_features', memory_log)
+    
+    # Create decision labels
+    df = create_decision_labels(df)
+    memory_report(df, 'create_decision_labels', memory_log)
+    
+    # Build the model
+    memory = preprocessing_memory() if use_preprocessing_cache else None
+    model = build_retention_model(df, role_multipliers, figures, memory, search, search_resource,
+                                  boosting_backend, use_cv_cache, matrix_format, encoder)
+    
+    # Analyze results
+    df = analyze_results(df, model, figures=figures)
+    memory_report(df, 'analyze_results', memory_log)
+    
+    print("\nMemory Report:")
+    print(pd.DataFrame(memory_log).to_string(index=False, float_format='{:.2f}'.format))
+    
+    if plots == 'defer':
+        figures.save(plot_data_path)
+    else:
+        figures.close()
+    
+    print("\nModel development complete. Results saved to files:")
+    print("- retention_decision_model.pkl (Model file)")
+    print("- retention_dashboard_data.csv (Data for visualization)")
+    if plots == 'render':
+        print("- retention_feature_importance.png (Feature importance)")
+        print("- retention_by_department.png (Department recommendations)")
+        print("- performance_vs_cost.png (Performance vs. Cost visualization)")
+    elif plots == 'defer':
+        print(f"- {plot_data_path} (Plot data; render with: python hr_plots.py {plot_data_path})")
+    
+    # Sample API code for deployment
+    print("\nSample code for using the model in an API:")
+    print("""
+    # Flask API code
+    from flask import Flask, request, jsonify
+    import pickle
+    import pandas as pd
+    
+    app = Flask(__name__)
+    
+    # Load the model
+    with open('retention_decision_model.pkl', 'rb') as f:
+        model = pickle.load(f)
+    
+    @app.route('/predict', methods=['POST'])
+    def predict():
+        # Get data from request
+        data = request.json
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(data['employees'])
+        
+        # Make predictions
+        probabilities = model.predict_proba(df)[:, 1]
+        decisions = model.predict(df)
+        
+        # Create response
+        results = []
+        for i, employee_id in enumerate(df['EmployeeNumber'] if 'EmployeeNumber' in df.columns else range(len(df))):
+            results.append({
+                'employee_id': employee_id,
+                'retention_decision': 'Let Go' if decisions[i] == 1 else 'Keep',
+                'confidence': float(probabilities[i] if decisions[i] == 1 else 1 - probabilities[i])
+            })
+        
+        return jsonify({"predictions": results})
+    
+    if __name__ == '__main__':
+        app.run(debug=True)
+    """)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retention decision pipeline")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH,
+                        help="HR attrition CSV export to train on or score")
+    parser.add_argument('--role-multipliers',
+                        help="JSON file mapping JobRole to its CTC multiplier")
+    parser.add_argument('--previous',
+                        help="previous snapshot; rescore only new and changed employees "
+                             "with the saved model and patch the dashboard export")
+    parser.add_argument('--model', default='retention_decision_model.pkl',
+                        help="saved model used in incremental mode")
+    parser.add_argument('--no-feature-store', action='store_true',
+                        help="recompute every engineered feature instead of reusing cached columns")
+    parser.add_argument('--plots', choices=PLOT_MODES, default='render',
+                        help="render figures as they are produced, defer them to --plot-data "
+                             "for a later 'python hr_plots.py' run, or skip them")
+    parser.add_argument('--plot-data', default='retention_plot_data.pkl',
+                        help="plot data file written with --plots defer")
+    parser.add_argument('--plot-jobs', type=int, default=-1,
+                        help="worker processes rendering the figures; -1 uses every core")
+    parser.add_argument('--no-preprocessing-cache', action='store_true',
+                        help="refit the feature and preprocessor steps for every fold and "
+                             "hyperparameter setting")
+    parser.add_argument('--search', choices=SEARCH_MODES, default='grid',
+                        help="tune the model with an exhaustive grid search, successive halving, or a grid "
+                             "search growing each ensemble with warm start")
+    parser.add_argument('--search-resource', choices=HALVING_RESOURCES, default='n_samples',
+                        help="budget grown by successive halving: training rows or boosting stages")
+    parser.add_argument('--boosting-backend', choices=BOOSTING_BACKENDS, default='gradient_boosting',
+                        help="GradientBoostingClassifier on one-hot columns, or HistGradientBoostingClassifier "
+                             "with native categoricals and early stopping")
+    parser.add_argument('--no-cv-cache', action='store_true',
+                        help="refit every cross-validation fold instead of reusing the out-of-fold "
+                             "predictions stored by earlier runs")
+    parser.add_argument('--matrix-format', choices=MATRIX_FORMATS, default='auto',
+                        help="keep the one-hot encoded matrix sparse through training ('sparse'), densify "
+                             "it ('dense'), or let the preprocessor decide by density ('auto')")
+    parser.add_argument('--encoder', choices=CATEGORICAL_ENCODERS, default='onehot',
+                        help="encoding of the categorical columns: one column per category, or a fixed "
+                             "width with feature hashing, cross-fitted target encoding or frequency encoding")
+    args = parser.parse_args()
+    
+    main(args.data, role_multipliers_file=args.role_multipliers,
+         previous_path=args.previous, model_path=args.model,
+         use_feature_store=not args.no_feature_store, plots=args.plots, plot_data_path=args.plot_data,
+         plot_jobs=args.plot_jobs, use_preprocessing_cache=not args.no_preprocessing_cache,
+         search=args.search, search_resource=args.search_resource, boosting_backend=args.boosting_backend,
+         use_cv_cache=not args.no_cv_cache, matrix_format=args.matrix_format, encoder=args.encoder)
\ No newline at end of file
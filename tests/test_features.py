@@ -0,0 +1,57 @@
+"""
+Equivalence of the fused feature kernel with the registered feature
+functions, on clean data and on an export with blank cells
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from hr_data import DEFAULT_DATA_PATH, load_hr_data  # noqa: E402
+from hr_features import FUSED_FEATURES, compute_features  # noqa: E402
+
+# Cells blanked in the export, as (row, column)
+BLANK_CELLS = [(1, 'JobLevel'), (1, 'WorkLifeBalance'), (1, 'JobInvolvement'),
+               (2, 'WorkLifeBalance'), (3, 'JobSatisfaction'), (3, 'EnvironmentSatisfaction'),
+               (4, 'JobSatisfaction'), (4, 'EnvironmentSatisfaction'),
+               (4, 'RelationshipSatisfaction'), (4, 'WorkLifeBalance'),
+               (5, 'MonthlyIncome'), (6, 'YearsSinceLastPromotion'), (7, 'PerformanceRating')]
+
+
+def load_export(tmp_path, blank_cells=()):
+    """Load the IBM export through the CSV loader, with some cells blanked"""
+    raw = pd.read_csv(DEFAULT_DATA_PATH)
+    for row, col in blank_cells:
+        raw[col] = raw[col].astype(float)
+        raw.loc[row, col] = np.nan
+    path = tmp_path / 'export.csv'
+    raw.to_csv(path, index=False)
+    df, _ = load_hr_data(str(path), use_cache=False)
+    return df
+
+
+@pytest.mark.parametrize('blank_cells', [[], BLANK_CELLS], ids=['clean', 'blanks'])
+def test_fused_features_match_registered_functions(tmp_path, blank_cells):
+    df = load_export(tmp_path, blank_cells)
+    names = sorted(FUSED_FEATURES)
+
+    fused = compute_features(df.copy(), names, fused=True)[names]
+    reference = compute_features(df.copy(), names, fused=False)[names]
+
+    # The registered functions compute in float32 when blanks load a column
+    # as float32, the kernel always in float64
+    pd.testing.assert_frame_equal(fused, reference, check_exact=False, rtol=1e-5, atol=1e-5)
+
+
+def test_blank_satisfaction_scores_are_skipped(tmp_path):
+    df = compute_features(load_export(tmp_path, BLANK_CELLS), ['SatisfactionComposite'])
+    raw = pd.read_csv(DEFAULT_DATA_PATH)
+    scores = raw.loc[2, ['JobSatisfaction', 'EnvironmentSatisfaction', 'RelationshipSatisfaction']]
+
+    assert df.loc[2, 'SatisfactionComposite'] == pytest.approx(scores.mean())
+    assert np.isnan(df.loc[4, 'SatisfactionComposite'])
@@ -0,0 +1,70 @@
+"""
+Equivalence of the vectorized retention decision rules with the original
+row-wise decision logic
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from retention_decision import load_data, engineer_features, create_decision_labels  # noqa: E402
+
+
+def reference_decision_labels(df):
+    """Keep (0) or Let Go (1) per employee, as computed before vectorization"""
+    def decision_logic(row):
+        """Decision logic for whether to Keep (0) or Let Go (1) an employee"""
+
+        # Always keep critical roles
+        if row['CriticalRole'] == 1:
+            return 0  # Keep
+
+        # Let go high attrition risk, low performers with high cost
+        if ((row['AttritionBinary'] == 1 or row['PerformanceRisk'] > 5) and
+            row['PerformanceRating'] <= 3 and
+            row['CTC'] > df['CTC'].median() and
+            row['ProductivityCostRatio'] < df['ProductivityCostRatio'].median()):
+            return 1  # Let Go
+
+        # Keep high performers, highly engaged, and satisfied employees
+        if ((row['PerformanceRating'] >= 4) or
+            (row['EngagementScore'] >= 4 and row['SatisfactionComposite'] >= 3.5)):
+            return 0  # Keep
+
+        # For borderline cases, use the retention priority score
+        return 1 if row['RetentionPriorityScore'] < df['RetentionPriorityScore'].median() else 0
+
+    return df.apply(decision_logic, axis=1)
+
+
+@pytest.fixture(scope='module')
+def employees():
+    return load_data(use_cache=False)
+
+
+def perturbed_resample(df, n_rows=5_000, random_state=0):
+    """Resample employees with replacement and jitter their pay, ratings and survey scores"""
+    rng = np.random.default_rng(random_state)
+    sample = df.sample(n_rows, replace=True, random_state=random_state).reset_index(drop=True)
+    income = sample['MonthlyIncome'] * rng.uniform(0.8, 1.2, n_rows)
+    sample['MonthlyIncome'] = income.round().astype(sample['MonthlyIncome'].dtype)
+    for col in ['PerformanceRating', 'JobSatisfaction', 'EnvironmentSatisfaction', 'JobInvolvement']:
+        sample[col] = rng.integers(1, 5, n_rows).astype(sample[col].dtype)
+    sample['AttritionBinary'] = rng.integers(0, 2, n_rows).astype(sample['AttritionBinary'].dtype)
+    return sample
+
+
+@pytest.mark.parametrize('perturbed', [False, True], ids=['ibm', 'perturbed-resample'])
+def test_decision_labels_match_row_wise_logic(employees, perturbed):
+    df = perturbed_resample(employees) if perturbed else employees.copy()
+    df = engineer_features(df)
+
+    expected = reference_decision_labels(df)
+    labels = create_decision_labels(df.copy())['RetentionDecision']
+
+    np.testing.assert_array_equal(labels.to_numpy(), expected.to_numpy())
+    assert 0 < labels.sum() < len(labels)
@@ -0,0 +1,46 @@
+"""
+Smoke test of the retention decision model with every boosting backend and
+categorical encoder
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import retention_decision  # noqa: E402
+from hr_encoders import CATEGORICAL_ENCODERS  # noqa: E402
+from hr_models import BOOSTING_BACKENDS  # noqa: E402
+from hr_plots import FigureBook  # noqa: E402
+from retention_decision import (load_data, engineer_features, create_decision_labels,  # noqa: E402
+                                build_retention_model)
+
+# A single small setting keeps the search to one fit per fold
+SMOKE_PARAM_GRID = {
+    'classifier__n_estimators': [20],
+    'classifier__learning_rate': [0.1],
+    'classifier__max_depth': [3]
+}
+
+
+@pytest.fixture(scope='module')
+def labeled_employees():
+    return create_decision_labels(engineer_features(load_data(use_cache=False)))
+
+
+@pytest.mark.parametrize('encoder', CATEGORICAL_ENCODERS)
+@pytest.mark.parametrize('backend', BOOSTING_BACKENDS)
+def test_build_retention_model(labeled_employees, backend, encoder, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(retention_decision, 'PARAM_GRID', SMOKE_PARAM_GRID)
+    monkeypatch.chdir(tmp_path)
+
+    model = build_retention_model(labeled_employees.copy(), figures=FigureBook('off'), cv_cache=False,
+                                  backend=backend, encoder=encoder)
+
+    output = capsys.readouterr().out
+    assert 'Could not generate feature importance plot' not in output
+    assert 'Top 10 most important features' in output
+    assert model.predict_proba(labeled_employees.head())[:, 1].shape == (5,)
+    assert (tmp_path / 'retention_decision_model.pkl').exists()
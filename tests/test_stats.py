@@ -0,0 +1,31 @@
+"""
+Streaming correlations against DataFrame.corr on data with missing values
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from hr_data import load_hr_data  # noqa: E402
+from hr_stats import correlation_stats  # noqa: E402
+
+
+def test_correlation_drops_missing_values_pairwise():
+    df, _ = load_hr_data(use_cache=False)
+    columns = ['Age', 'MonthlyIncome', 'DistanceFromHome', 'TotalWorkingYears', 'YearsAtCompany']
+    values = df[columns].astype(float)
+    rng = np.random.default_rng(0)
+    values.loc[rng.choice(len(values), 200, replace=False), 'Age'] = np.nan
+    values.loc[rng.choice(len(values), 300, replace=False), 'MonthlyIncome'] = np.nan
+    values.loc[:120, 'DistanceFromHome'] = np.nan
+
+    streamed = correlation_stats(values, columns, block_size=100)
+    merged = correlation_stats(values.iloc[:700], columns).merge(correlation_stats(values.iloc[700:], columns))
+
+    pd.testing.assert_frame_equal(streamed.correlation(), values.corr(), rtol=1e-10)
+    pd.testing.assert_frame_equal(merged.correlation(), values.corr(), rtol=1e-10)
+    pd.testing.assert_frame_equal(streamed.covariance(), values.cov(), rtol=1e-10)